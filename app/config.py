@@ -1,15 +1,29 @@
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from dotenv import load_dotenv
 
 
-load_dotenv()
+REQUIRED_ENV_VARS = ("BOT_TOKEN", "REDMINE_URL")
 
 
-@dataclass
+def _optional_int(name: str) -> int | None:
+    value = os.getenv(name, "").strip()
+    return int(value) if value else None
+
+
+@dataclass(frozen=True, slots=True)
 class Settings:
-    bot_token: str = os.getenv("BOT_TOKEN", "")
-    redmine_url: str = os.getenv("REDMINE_URL", "")
+    bot_token: str = field(default_factory=lambda: os.getenv("BOT_TOKEN", ""))
+    redmine_url: str = field(default_factory=lambda: os.getenv("REDMINE_URL", ""))
+    # Activity used for daily time entries; resolved from Redmine when unset
+    redmine_default_activity_id: int | None = field(
+        default_factory=lambda: _optional_int("REDMINE_DEFAULT_ACTIVITY_ID")
+    )
+    # Optional local telegram-bot-api server, e.g. http://localhost:8081
+    telegram_api_url: str = field(
+        default_factory=lambda: os.getenv("TELEGRAM_API_URL", "").rstrip("/")
+    )
 
     def validate(self):
         if not self.bot_token:
@@ -18,4 +32,23 @@ class Settings:
             raise RuntimeError("⚠️ REDMINE_URL not found in .env")
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Returns the application settings, loading them once per process.
+
+    The .env file is only parsed when the required variables are not already
+    present in the environment. Settings are validated on creation, so a
+    misconfiguration fails on the first call instead of on first use.
+
+    Returns:
+        Settings: Application settings
+
+    Raises:
+        RuntimeError: If a required variable is missing
+    """
+    if any(name not in os.environ for name in REQUIRED_ENV_VARS):
+        load_dotenv()
+    settings = Settings()
+    settings.validate()
+    return settings
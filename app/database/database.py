@@ -1,8 +1,12 @@
+import asyncio
 import os
-from sqlalchemy import create_engine, MetaData
+from contextlib import contextmanager
+import threading
+import time
+from sqlalchemy import create_engine, event, MetaData, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
 import logging
 
 # Configurar logging
@@ -18,28 +22,80 @@ DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
 # Configuración del motor de SQLAlchemy para SQLite3
 engine = create_engine(
     DATABASE_URL,
-    poolclass=StaticPool,
+    poolclass=QueuePool,
+    pool_size=5,  # Conexiones persistentes para handlers concurrentes
+    max_overflow=10,  # Conexiones extra bajo picos de carga
+    pool_recycle=3600,
+    pool_pre_ping=True,
+    query_cache_size=1200,  # Caché de sentencias compiladas (por defecto 500)
     connect_args={
         "check_same_thread": False,  # Permite usar SQLite en múltiples threads
     },
     echo=False,  # Cambiar a True para ver las consultas SQL en desarrollo
 )
 
+# Consulta de comprobación reutilizada, compilada una sola vez
+_PING = text("SELECT 1")
+
+# Segundos durante los que se reutiliza el último resultado correcto del ping
+HEALTH_CHECK_TTL = 30.0
+_last_healthy_at: float | None = None
+
+# PRAGMAs aplicados a cada nueva conexión SQLite
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;"  # Lectores concurrentes, sin fsync del journal por commit
+    "PRAGMA synchronous=NORMAL;"  # Seguro con WAL, mucho más rápido que FULL
+    "PRAGMA temp_store=MEMORY;"
+    "PRAGMA mmap_size=268435456;"  # 256 MB
+    "PRAGMA cache_size=-64000;"  # ~64 MB de caché de páginas
+)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Configura cada conexión SQLite nueva con WAL y PRAGMAs de rendimiento.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.executescript(SQLITE_PRAGMAS)
+    cursor.close()
+
+
 # Configuración de metadatos y base declarativa
 metadata = MetaData()
 Base = declarative_base(metadata=metadata)
 
-# Configuración de sesiones
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _session_scope():
+    """
+    Clave de ámbito para las sesiones: la tarea asyncio en curso o, fuera del
+    event loop (p. ej. en asyncio.to_thread), el hilo actual.
+    """
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return task if task is not None else threading.get_ident()
+
+
+# Configuración de sesiones (una sesión reutilizada por tarea/hilo).
+# expire_on_commit=False: tras el commit los objetos conservan los valores ya
+# escritos en lugar de recargarse con un SELECT al siguiente acceso.
+SessionLocal = scoped_session(
+    sessionmaker(
+        autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+    ),
+    scopefunc=_session_scope,
+)
 
 
 def get_database_session():
     """
-    Obtiene una nueva sesión de base de datos.
-    Recuerda cerrar la sesión después de usarla.
+    Obtiene la sesión de base de datos de la tarea o hilo actual.
+    Recuerda liberarla con SessionLocal.remove() después de usarla.
 
     Returns:
-        Session: Nueva sesión de SQLAlchemy
+        Session: Sesión de SQLAlchemy del ámbito actual
     """
     return SessionLocal()
 
@@ -50,8 +106,10 @@ def init_database():
     Debe llamarse después de definir todos los modelos.
     """
     try:
-        # Crear el directorio si no existe
-        os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
+        # Crear el directorio solo si falta (normalmente es la raíz del proyecto)
+        database_dir = os.path.dirname(DATABASE_PATH)
+        if not os.path.isdir(database_dir):
+            os.makedirs(database_dir)
 
         # Crear todas las tablas definidas en los modelos
         Base.metadata.create_all(bind=engine)
@@ -67,21 +125,83 @@ def check_database_connection():
     """
     Verifica que la conexión a la base de datos funcione correctamente.
 
+    El ping usa una conexión del pool y un éxito se reutiliza durante
+    HEALTH_CHECK_TTL segundos, así las comprobaciones frecuentes se reducen a
+    comparar una marca de tiempo. Los fallos nunca se cachean.
+
     Returns:
         bool: True si la conexión es exitosa, False en caso contrario
     """
+    global _last_healthy_at
+
+    now = time.monotonic()
+    if _last_healthy_at is not None and now - _last_healthy_at < HEALTH_CHECK_TTL:
+        return True
+
     try:
         with engine.connect() as connection:
-            from sqlalchemy import text
-
-            result = connection.execute(text("SELECT 1"))
+            connection.execute(_PING)
+            _last_healthy_at = now
             logger.info("✅ Conexión a la base de datos SQLite3 exitosa")
             return True
     except Exception as e:
+        _last_healthy_at = None
         logger.error(f"❌ Error de conexión a la base de datos: {e}")
         return False
 
 
+def bulk_insert(model, rows: list[dict]) -> int:
+    """
+    Inserta muchas filas de un modelo en una sola transacción usando executemany.
+
+    Evita el unit-of-work del ORM (construcción de instancias, identity map,
+    instrumentación de atributos). Usar solo para cargas por lotes; el CRUD
+    de una fila debe seguir pasando por los servicios.
+
+    Args:
+        model: Clase del modelo declarativo (p. ej. Daily)
+        rows (list[dict]): Filas a insertar, como diccionarios columna -> valor
+
+    Returns:
+        int: Número de filas insertadas
+    """
+    if not rows:
+        return 0
+
+    with engine.begin() as connection:
+        connection.execute(model.__table__.insert(), rows)
+
+    return len(rows)
+
+
+@contextmanager
+def count_queries():
+    """
+    Registra las sentencias SQL ejecutadas dentro del bloque.
+
+    Pensado para desarrollo: permite detectar cargas perezosas o consultas
+    N+1 comprobando cuántas sentencias emite una operación.
+
+    Uso:
+        with count_queries() as queries:
+            UserService.get_by_telegram_id(db, telegram_id)
+        assert len(queries) == 1
+
+    Yields:
+        list[str]: Sentencias SQL ejecutadas, en orden
+    """
+    queries = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield queries
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
 def close_database_connection():
     """
     Cierra todas las conexiones de la base de datos.
@@ -102,6 +222,9 @@ class DatabaseSession:
             # Operaciones con la base de datos
             result = session.query(Model).all()
             # La sesión se cierra automáticamente
+
+    La sesión es la del ámbito actual (tarea asyncio o hilo), por lo que los
+    bloques DatabaseSession no deben anidarse dentro de una misma tarea.
     """
 
     def __enter__(self):
@@ -109,16 +232,16 @@ class DatabaseSession:
         return self.session
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        # Un fallo en el commit se propaga al llamador; remove() cierra la
+        # sesión y descarta la transacción pendiente en cualquier caso
         try:
             if exc_type:
                 self.session.rollback()
                 logger.error(f"❌ Error en transacción, rollback ejecutado: {exc_val}")
             else:
                 self.session.commit()
-        except Exception as e:
-            logger.error(f"❌ Error durante commit/rollback: {e}")
         finally:
-            self.session.close()
+            SessionLocal.remove()
 
 
 # Función auxiliar para obtener la ruta de la base de datos
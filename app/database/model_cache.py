@@ -0,0 +1,107 @@
+"""
+Process-wide caches of ORM rows that are read far more often than written.
+
+ViewCache stores immutable values derived from a model's rows (such as
+UserView). ModelCache stores rows as plain column dicts, never as ORM
+instances, so nothing is bound to the session that loaded them; a hit is
+turned back into an instance of the caller's session with merge(load=False),
+which issues no SQL.
+
+Any write to the model through the session invalidates the whole cache: unit
+of work flushes via mapper events, and ORM-enabled INSERT/UPDATE/DELETE
+statements (upserts, bulk updates) via do_orm_execute. The cache is cleared
+again after the writing transaction commits, so a concurrent reader cannot
+re-populate it with the pre-commit row.
+"""
+
+from typing import Any, Hashable
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from app.utils.cache import TTLCache
+
+
+class ViewCache:
+    """
+    TTL cache for immutable values built from one model, keyed by a
+    caller-chosen value.
+    """
+
+    def __init__(self, model, ttl: float, maxsize: int = 1024):
+        self.model = model
+        self._mapper = model.__mapper__
+        self._cache = TTLCache(ttl=ttl, maxsize=maxsize)
+        # Per-instance key: several caches may watch the same model
+        self._dirty_key = f"model_cache_dirty:{model.__tablename__}:{id(self)}"
+
+        for name in ("after_insert", "after_update", "after_delete"):
+            event.listen(model, name, self._on_flush)
+        event.listen(Session, "do_orm_execute", self._on_execute)
+        event.listen(Session, "after_commit", self._on_commit)
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Returns the cached value for key, or None on a miss.
+        """
+        return self._cache.get(key)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Stores value under key. The value must not be mutated afterwards.
+        """
+        self._cache.set(key, value)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _invalidate(self, session: Session) -> None:
+        self._cache.clear()
+        session.info[self._dirty_key] = True
+
+    def _on_flush(self, mapper, connection, target) -> None:
+        session = Session.object_session(target)
+        if session is not None:
+            self._invalidate(session)
+        else:
+            self._cache.clear()
+
+    def _on_execute(self, orm_execute_state) -> None:
+        if orm_execute_state.is_select:
+            return
+        if self._mapper in orm_execute_state.all_mappers:
+            self._invalidate(orm_execute_state.session)
+
+    def _on_commit(self, session: Session) -> None:
+        if session.info.pop(self._dirty_key, False):
+            self._cache.clear()
+
+
+class ModelCache(ViewCache):
+    """
+    TTL cache for instances of one model, keyed by a caller-chosen value.
+    """
+
+    def get(self, db: Session, key: Hashable) -> Any | None:
+        """
+        Returns the cached instance for key, attached to db, or None on a miss.
+        """
+        values = self._cache.get(key)
+        if values is None:
+            return None
+        instance = self._mapper.class_manager.new_instance()
+        for name, value in values.items():
+            set_committed_value(instance, name, value)
+        make_transient_to_detached(instance)
+        return db.merge(instance, load=False)
+
+    def set(self, key: Hashable, instance) -> None:
+        """
+        Stores the loaded column values of instance under key.
+        """
+        self._cache.set(
+            key,
+            {
+                attr.key: getattr(instance, attr.key)
+                for attr in self._mapper.column_attrs
+            },
+        )
@@ -7,19 +7,99 @@ from sqlalchemy import (
     Integer,
     String,
     DateTime,
-    Text,
     BigInteger,
     Boolean,
-    JSON,
+    Computed,
+    LargeBinary,
+    Index,
+    case,
+    text,
 )
+from sqlalchemy.ext.hybrid import hybrid_method, hybrid_property
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
 from app.database.database import Base
-from app.utils.crypto import CryptoManager
+from app.utils.crypto import get_crypto_manager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import json
 import logging
+import struct
 
 logger = logging.getLogger(__name__)
 
 
+def _utcnow() -> datetime:
+    """
+    Client-side timestamp for the audit columns.
+
+    Matches CURRENT_TIMESTAMP (UTC) so rows look the same whichever side set
+    them, and the value is known before the INSERT/UPDATE is sent, so it never
+    has to be fetched back.
+
+    Returns:
+        datetime: Current UTC time
+    """
+    return datetime.now(timezone.utc)
+
+
+# Plain-text tokens keyed by ciphertext. Insertion-ordered and bounded, so the
+# oldest entry is evicted first; unlike an lru_cache it can be pre-filled.
+TOKEN_CACHE_SIZE = 512
+_token_cache: dict[bytes, str] = {}
+
+
+def _cache_token(encrypted_token: bytes, token: str) -> None:
+    if len(_token_cache) >= TOKEN_CACHE_SIZE:
+        _token_cache.pop(next(iter(_token_cache)))
+    _token_cache[encrypted_token] = token
+
+
+def _decrypt_token(encrypted_token: bytes) -> str:
+    """
+    Decrypts a stored Redmine token, memoized by ciphertext.
+
+    A new token always produces a new ciphertext, so stale entries are never
+    served and simply age out of the cache.
+
+    Args:
+        encrypted_token (bytes): Encrypted token as stored in the database
+
+    Returns:
+        str: Redmine token in plain text
+    """
+    token = _token_cache.get(encrypted_token)
+    if token is None:
+        token = get_crypto_manager().decrypt(encrypted_token)
+        _cache_token(encrypted_token, token)
+    return token
+
+
+class Int64Array(TypeDecorator):
+    """
+    List of integers stored as a packed little-endian int64 BLOB.
+
+    Eight bytes per ID and a single struct call to encode/decode, instead of
+    serializing the list to JSON text. Rows still holding the old JSON text
+    (databases not yet migrated) are decoded as JSON.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return struct.pack(f"<{len(value)}q", *value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return json.loads(value) or []
+        return list(struct.unpack(f"<{len(value) // 8}q", value))
+
+
 class User(Base):
     """
     Model for bot users.
@@ -27,19 +107,36 @@ class User(Base):
     """
 
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Covers the active-user lookup by telegram_id, including the token check
+        Index(
+            "ix_users_tg_cover", "telegram_id", "is_active", "encrypted_redmine_token"
+        ),
+        # Partial index over active users only, for the username lookup
+        Index(
+            "ix_users_username_active", "username", sqlite_where=text("is_active = 1")
+        ),
+    )
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id = Column(Integer, primary_key=True)
     telegram_id = Column(BigInteger, unique=True, nullable=False, index=True)
     username = Column(String(255), nullable=True, index=True)
-    encrypted_redmine_token = Column(Text, nullable=True)
+    encrypted_redmine_token = Column(LargeBinary, nullable=True)
+    # Keyed hash of the plain-text token, to detect unchanged resubmissions
+    token_fingerprint = Column(LargeBinary(16), nullable=True)
 
     created_at = Column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True),
+        default=_utcnow,
+        server_default=func.now(),
+        nullable=False,
     )
     updated_at = Column(
         DateTime(timezone=True),
+        default=_utcnow,
         server_default=func.now(),
-        onupdate=func.now(),
+        onupdate=_utcnow,
         nullable=False,
     )
     is_active = Column(Boolean, default=True, nullable=False)
@@ -56,6 +153,32 @@ class User(Base):
         if redmine_token:
             self.set_redmine_token(redmine_token)
 
+    @staticmethod
+    def encrypt_token(token: str) -> bytes:
+        """
+        Encrypts a Redmine token without touching any instance.
+
+        Args:
+            token (str): Redmine token in plain text
+
+        Returns:
+            bytes: Encrypted token as stored in the database
+        """
+        return get_crypto_manager().encrypt(token)
+
+    @staticmethod
+    def fingerprint_token(token: str) -> bytes:
+        """
+        Computes the keyed fingerprint stored next to an encrypted token.
+
+        Args:
+            token (str): Redmine token in plain text
+
+        Returns:
+            bytes: 16-byte fingerprint of the token
+        """
+        return get_crypto_manager().fingerprint(token)
+
     def set_redmine_token(self, token: str) -> bool:
         """
         Encrypts and saves the Redmine token.
@@ -67,8 +190,8 @@ class User(Base):
             bool: True if saved correctly, False on error
         """
         try:
-            crypto = CryptoManager()
-            self.encrypted_redmine_token = crypto.encrypt(token).decode("utf-8")
+            self.encrypted_redmine_token = User.encrypt_token(token)
+            self.token_fingerprint = User.fingerprint_token(token)
             logger.info(f"Token encrypted for user {self.telegram_id}")
             return True
         except Exception as e:
@@ -84,26 +207,88 @@ class User(Base):
         """
 
         try:
-            crypto = CryptoManager()
-            token = crypto.decrypt(self.encrypted_redmine_token.encode("utf-8"))
-            return token
+            return _decrypt_token(self.encrypted_redmine_token)
         except Exception as e:
             logger.error(f"Error decrypting token for user {self.telegram_id}: {e}")
             return None
 
+    @hybrid_method
     def has_redmine_token(self) -> bool:
         """
         Checks if the user has a configured Redmine token.
 
+        Loaded instances are answered from __dict__ without going through the
+        instrumented attribute; expired ones fall back to a normal load. On the
+        class, User.has_redmine_token() is an IS NOT NULL filter expression.
+
         Returns:
             bool: True if has token, False otherwise
         """
+        state = self.__dict__
+        if "encrypted_redmine_token" in state:
+            return state["encrypted_redmine_token"] is not None
         return self.encrypted_redmine_token is not None
 
+    @has_redmine_token.expression
+    def has_redmine_token(cls):
+        return cls.encrypted_redmine_token.isnot(None)
+
+    @staticmethod
+    def load_token_cache(encrypted_tokens: list[bytes]) -> int:
+        """
+        Decrypts a batch of stored tokens in one pass and caches them.
+
+        Args:
+            encrypted_tokens (list[bytes]): Encrypted tokens as stored in the database
+
+        Returns:
+            int: Number of tokens cached
+        """
+        encrypted_tokens = encrypted_tokens[:TOKEN_CACHE_SIZE]
+        tokens = get_crypto_manager().decrypt_many(encrypted_tokens)
+        for encrypted_token, token in zip(encrypted_tokens, tokens):
+            _cache_token(encrypted_token, token)
+        return len(tokens)
+
     def __repr__(self):
         return f"<User(id={self.id}, telegram_id={self.telegram_id}, username={self.username}, has_token={self.has_redmine_token()})>"
 
 
+@dataclass(frozen=True, slots=True)
+class UserView:
+    """
+    Read-only projection of a user, for handlers that only check the token.
+    Built straight from a row, without ORM instance state.
+    """
+
+    id: int
+    telegram_id: int
+    username: str | None
+    encrypted_redmine_token: bytes | None
+
+    def has_redmine_token(self) -> bool:
+        """
+        Checks if the user has a configured Redmine token.
+
+        Returns:
+            bool: True if has token, False otherwise
+        """
+        return self.encrypted_redmine_token is not None
+
+    def get_redmine_token(self) -> str | None:
+        """
+        Decrypts and returns the Redmine token.
+
+        Returns:
+            str | None: Redmine token in plain text or None if error
+        """
+        try:
+            return _decrypt_token(self.encrypted_redmine_token)
+        except Exception as e:
+            logger.error(f"Error decrypting token for user {self.telegram_id}: {e}")
+            return None
+
+
 class Team(Base):
     """
     Model for bot teams.
@@ -111,8 +296,29 @@ class Team(Base):
     """
 
     __tablename__ = "teams"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Covers the active-team lookup by group, including the project ID
+        Index(
+            "ix_teams_group_cover",
+            "telegram_group_id",
+            "is_active",
+            "redmine_project_id",
+        ),
+        # Partial indexes over active teams only
+        Index(
+            "ix_teams_project_code_active",
+            "redmine_project_code",
+            sqlite_where=text("is_active = 1"),
+        ),
+        Index(
+            "ix_teams_creator_active",
+            "created_by_user_id",
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id = Column(Integer, primary_key=True)
     telegram_group_id = Column(BigInteger, unique=True, nullable=False, index=True)
     redmine_project_code = Column(String(100), nullable=False, index=True)
     redmine_project_id = Column(Integer, nullable=False, index=True)
@@ -123,12 +329,16 @@ class Team(Base):
 
     # Audit fields
     created_at = Column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True),
+        default=_utcnow,
+        server_default=func.now(),
+        nullable=False,
     )
     updated_at = Column(
         DateTime(timezone=True),
+        default=_utcnow,
         server_default=func.now(),
-        onupdate=func.now(),
+        onupdate=_utcnow,
         nullable=False,
     )
     is_active = Column(Boolean, default=True, nullable=False)
@@ -158,8 +368,28 @@ class Daily(Base):
     """
 
     __tablename__ = "dailys"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # At most one open daily per group
+        Index(
+            "ix_dailys_group_open",
+            "telegram_group_id",
+            sqlite_where=text("end_time IS NULL"),
+        ),
+        # Latest finished daily still pending registration in Redmine; the
+        # predicate matches get_latest_unregistered_daily_by_group exactly
+        Index(
+            "ix_dailys_pending_redmine",
+            "telegram_group_id",
+            "end_time",
+            sqlite_where=text("registered_in_redmine = 0 AND end_time IS NOT NULL"),
+        ),
+        # Newest-first listings and "last 7 days" counts in the viewers;
+        # SQLite walks it backwards for ORDER BY start_time DESC
+        Index("ix_dailys_start_time", "start_time"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id = Column(Integer, primary_key=True)
     team_id = Column(Integer, nullable=False, index=True)  # Foreign key to teams table
     telegram_group_id = Column(
         BigInteger, nullable=False, index=True
@@ -171,16 +401,33 @@ class Daily(Base):
     registered_in_redmine = Column(
         Boolean, default=False, nullable=False
     )  # Registered in Redmine
-    participants_ids = Column(JSON, nullable=True)  # JSON array of Telegram user IDs
+    participants_ids = Column(
+        Int64Array, nullable=True
+    )  # Packed int64 array of Telegram user IDs
+    # Whole seconds between start and end, computed by SQLite when read (NULL
+    # while the daily is open); rounded to milliseconds first so float error
+    # in julianday never drops a second
+    duration_seconds = Column(
+        Integer,
+        Computed(
+            "CAST(ROUND((julianday(end_time) - julianday(start_time)) * 86400000)"
+            " / 1000 AS INTEGER)",
+            persisted=False,
+        ),
+    )
 
     # Audit fields
     created_at = Column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True),
+        default=_utcnow,
+        server_default=func.now(),
+        nullable=False,
     )
     updated_at = Column(
         DateTime(timezone=True),
+        default=_utcnow,
         server_default=func.now(),
-        onupdate=func.now(),
+        onupdate=_utcnow,
         nullable=False,
     )
 
@@ -212,9 +459,33 @@ class Daily(Base):
         Returns:
             list[int]: List of Telegram user IDs
         """
-        # Type: ignore is needed due to SQLAlchemy JSON column typing
+        # Type: ignore is needed due to SQLAlchemy custom column typing
         return self.participants_ids or []  # type: ignore
 
+    @hybrid_property
+    def participants_count(self) -> int:
+        """
+        Number of participants.
+
+        On the class, Daily.participants_count is a SQL expression that counts
+        the stored IDs without decoding them: eight bytes per ID in the packed
+        BLOB, or the array length for rows still holding JSON text.
+
+        Returns:
+            int: Number of Telegram user IDs in the daily
+        """
+        return len(self.get_participants())
+
+    @participants_count.expression
+    def participants_count(cls):
+        return case(
+            (
+                func.typeof(cls.participants_ids) == "blob",
+                func.length(cls.participants_ids) // 8,
+            ),
+            else_=func.coalesce(func.json_array_length(cls.participants_ids), 0),
+        )
+
     def finish_daily(self, end_datetime=None) -> None:
         """
         Marks the daily as finished.
@@ -222,8 +493,6 @@ class Daily(Base):
         Args:
             end_datetime (datetime, optional): End time. If None, uses current time.
         """
-        from datetime import datetime
-
         self.end_time = end_datetime or datetime.now()
 
     def mark_registered_in_redmine(self) -> None:
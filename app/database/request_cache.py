@@ -0,0 +1,55 @@
+"""
+Per-request memoization for service lookups.
+
+A DatabaseSession block lives for a single Telegram update, so results are
+stored in the session's ``info`` dict: repeated lookups inside the same update
+skip the database, and nothing outlives the session. Any commit or rollback
+drops the cache, so a read after a write always sees the new state.
+"""
+
+import functools
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_CACHE_KEY = "request_cache"
+
+
+def request_memoize(namespace: str):
+    """
+    Memoizes a service lookup whose first argument is the session.
+
+    Args:
+        namespace (str): Prefix that keeps keys of different lookups apart
+
+    Returns:
+        Callable: Decorator for the lookup function
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(db: Session, *args, **kwargs):
+            cache = db.info.setdefault(_CACHE_KEY, {})
+            key = (namespace, args, tuple(sorted(kwargs.items())))
+            if key not in cache:
+                cache[key] = func(db, *args, **kwargs)
+            return cache[key]
+
+        return wrapper
+
+    return decorator
+
+
+def clear_request_cache(db: Session) -> None:
+    """
+    Drops every memoized lookup stored on the session.
+
+    Args:
+        db (Session): Database session
+    """
+    db.info.pop(_CACHE_KEY, None)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_on_transaction_end(session: Session) -> None:
+    clear_request_cache(session)
@@ -2,14 +2,109 @@
 CRUD services for database operations.
 """
 
-from typing import List, Optional
+from typing import Iterator, List, Optional
+from sqlalchemy import Row, and_, bindparam, case, delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
-from app.database.models import User, Team, Daily
-from datetime import datetime
+from sqlalchemy.orm.util import identity_key
+from app.database.models import User, UserView, Team, Daily
+from app.database.model_cache import ModelCache, ViewCache
+from app.database.request_cache import request_memoize
+from datetime import datetime, timezone
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Lookups built once at import; the engine's compiled cache then reuses the
+# SQL for every call. Booleans are compared with == so SQLite sees the literal
+# "is_active = 1" that the partial indexes are defined on.
+# Read-only user lookups project just the columns handlers use into a UserView
+_USER_VIEW_COLUMNS = (
+    User.id,
+    User.telegram_id,
+    User.username,
+    User.encrypted_redmine_token,
+)
+_SELECT_USER_BY_TELEGRAM_ID = select(*_USER_VIEW_COLUMNS).where(
+    User.telegram_id == bindparam("telegram_id"), User.is_active == True
+)
+_SELECT_TEAM_BY_GROUP_ID = select(Team).where(
+    Team.telegram_group_id == bindparam("telegram_group_id"), Team.is_active == True
+)
+_SELECT_ACTIVE_DAILY_BY_GROUP = (
+    select(Daily)
+    .where(
+        Daily.telegram_group_id == bindparam("telegram_group_id"),
+        Daily.end_time.is_(None),
+    )
+    .limit(1)
+)
+# Outer join, so a daily whose team was removed still comes back (with None)
+_SELECT_ACTIVE_DAILY_WITH_TEAM_BY_GROUP = (
+    select(Daily, Team)
+    .outerjoin(Team, and_(Team.id == Daily.team_id, Team.is_active == True))
+    .where(
+        Daily.telegram_group_id == bindparam("telegram_group_id"),
+        Daily.end_time.is_(None),
+    )
+    .limit(1)
+)
+_SELECT_USER_BY_TOKEN_FINGERPRINT = select(User).where(
+    User.telegram_id == bindparam("telegram_id"),
+    User.is_active == True,
+    User.token_fingerprint == bindparam("token_fingerprint"),
+)
+_SELECT_USER_BY_ID = select(User).where(
+    User.id == bindparam("user_id"), User.is_active == True
+)
+_SELECT_USER_BY_USERNAME = (
+    select(*_USER_VIEW_COLUMNS)
+    .where(User.username == bindparam("username"), User.is_active == True)
+    .limit(1)
+)
+_SELECT_USERS_BY_USERNAMES = select(*_USER_VIEW_COLUMNS).where(
+    User.username.in_(bindparam("usernames", expanding=True)), User.is_active == True
+)
+_SELECT_TEAM_BY_ID = select(Team).where(
+    Team.id == bindparam("team_id"), Team.is_active == True
+)
+_SELECT_TEAMS_BY_PROJECT_CODE = select(Team).where(
+    Team.redmine_project_code == bindparam("redmine_project_code"),
+    Team.is_active == True,
+)
+_SELECT_TEAMS_BY_CREATOR = select(Team).where(
+    Team.created_by_user_id == bindparam("created_by_user_id"),
+    Team.is_active == True,
+)
+_SELECT_TEAM_SUMMARIES_BY_CREATOR = select(
+    Team.team_name,
+    Team.redmine_project_id,
+    Team.redmine_project_code,
+    Team.created_at,
+).where(
+    Team.created_by_user_id == bindparam("created_by_user_id"),
+    Team.is_active == True,
+)
+_SELECT_LATEST_UNREGISTERED_DAILY_BY_GROUP = (
+    select(Daily)
+    .where(
+        Daily.telegram_group_id == bindparam("telegram_group_id"),
+        Daily.registered_in_redmine == False,
+        Daily.end_time != None,  # Only finished dailies
+    )
+    .order_by(Daily.end_time.desc())
+    .limit(1)
+)
+
+# Teams are read on every group update but change rarely
+_team_by_group_cache = ModelCache(Team, ttl=3600)
+# Groups known to have no team (video chats in unconfigured groups); any team
+# write clears it, so a new /team association is seen immediately
+_group_without_team_cache = ViewCache(Team, ttl=3600)
+# Users are looked up at the start of nearly every command; only /token writes
+_user_by_telegram_id_cache = ViewCache(User, ttl=600)
+_user_by_username_cache = ViewCache(User, ttl=600)
+
 
 class UserService:
     """
@@ -41,17 +136,17 @@ class UserService:
             )
             db.add(user)
             db.commit()
-            db.refresh(user)
             logger.info(
-                f"User created with telegram_id: {telegram_id}, username: {username}"
+                "User created with telegram_id: %s, username: %s", telegram_id, username
             )
             return user
-        except Exception as e:
+        except Exception:
             db.rollback()
-            logger.error(f"Error creating user with telegram_id {telegram_id}: {e}")
+            logger.exception("Error creating user with telegram_id %s", telegram_id)
             raise
 
     @staticmethod
+    @request_memoize("user_id")
     def get_by_id(db: Session, user_id: int) -> Optional[User]:
         """
         Get user by ID.
@@ -63,65 +158,134 @@ class UserService:
         Returns:
             Optional[User]: User instance or None
         """
-        return db.query(User).filter(User.id == user_id, User.is_active == True).first()
+        return db.execute(_SELECT_USER_BY_ID, {"user_id": user_id}).scalar_one_or_none()
 
     @staticmethod
-    def get_by_telegram_id(db: Session, telegram_id: int) -> Optional[User]:
+    @request_memoize("user_telegram_id")
+    def get_by_telegram_id(db: Session, telegram_id: int) -> Optional[UserView]:
         """
         Get user by Telegram ID.
 
+        Returns a read-only view; use get_by_id for an instance to modify.
+
         Args:
             db (Session): Database session
             telegram_id (int): Telegram user ID
 
         Returns:
-            Optional[User]: User instance or None
+            Optional[UserView]: User view or None
         """
-        return (
-            db.query(User)
-            .filter(User.telegram_id == telegram_id, User.is_active == True)
-            .first()
-        )
+        user = _user_by_telegram_id_cache.get(telegram_id)
+        if user is not None:
+            return user
+        row = db.execute(
+            _SELECT_USER_BY_TELEGRAM_ID, {"telegram_id": telegram_id}
+        ).first()
+        if row is None:
+            return None
+        user = UserView(*row)
+        _user_by_telegram_id_cache.set(telegram_id, user)
+        return user
 
     @staticmethod
-    def get_by_username(db: Session, username: str) -> Optional[User]:
+    def get_by_username(db: Session, username: str) -> Optional[UserView]:
         """
         Get user by username.
 
+        Returns a read-only view; use get_by_id for an instance to modify.
+
         Args:
             db (Session): Database session
             username (str): Telegram username (without @)
 
         Returns:
-            Optional[User]: User instance or None
+            Optional[UserView]: User view or None
         """
-        return (
-            db.query(User)
-            .filter(User.username == username, User.is_active == True)
-            .first()
-        )
+        user = _user_by_username_cache.get(username)
+        if user is not None:
+            return user
+        row = db.execute(_SELECT_USER_BY_USERNAME, {"username": username}).first()
+        if row is None:
+            return None
+        user = UserView(*row)
+        _user_by_username_cache.set(username, user)
+        return user
 
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
+    def get_by_usernames(db: Session, usernames: List[str]) -> dict[str, UserView]:
         """
-        Get all active users.
+        Get several users by username with a single IN query.
+
+        Usernames already in the process cache are not queried.
 
         Args:
             db (Session): Database session
-            skip (int): Number of records to skip
+            usernames (List[str]): Telegram usernames (without @)
+
+        Returns:
+            dict[str, UserView]: User views keyed by username; missing users
+            are left out
+        """
+        users = {}
+        missing = []
+        for username in usernames:
+            user = _user_by_username_cache.get(username)
+            if user is not None:
+                users[username] = user
+            else:
+                missing.append(username)
+        if not missing:
+            return users
+        for row in db.execute(_SELECT_USERS_BY_USERNAMES, {"usernames": missing}):
+            if row.username not in users:
+                users[row.username] = UserView(*row)
+                _user_by_username_cache.set(row.username, users[row.username])
+        return users
+
+    @staticmethod
+    def get_all(db: Session, after_id: int = 0, limit: int = 100) -> List[User]:
+        """
+        Get a page of active users, ordered by ID.
+
+        Uses keyset pagination: pass the last ID of the previous page as
+        after_id, so each page is an index range scan instead of an OFFSET.
+
+        Args:
+            db (Session): Database session
+            after_id (int): Return only users with an ID greater than this
             limit (int): Maximum number of records to return
 
         Returns:
             List[User]: List of user instances
         """
-        return (
-            db.query(User)
-            .filter(User.is_active == True)
-            .offset(skip)
-            .limit(limit)
-            .all()
+        return list(
+            db.execute(
+                select(User)
+                .where(User.is_active == True, User.id > after_id)
+                .order_by(User.id)
+                .limit(limit)
+            ).scalars()
         )
 
+    @staticmethod
+    def iter_all(db: Session, batch_size: int = 500) -> Iterator[User]:
+        """
+        Iterate over all active users without loading them all at once.
+
+        Args:
+            db (Session): Database session
+            batch_size (int): Number of rows fetched per batch
+
+        Yields:
+            User: User instances, ordered by ID
+        """
+        yield from db.execute(
+            select(User)
+            .where(User.is_active == True)
+            .order_by(User.id)
+            .execution_options(yield_per=batch_size)
+        ).scalars()
+
     @staticmethod
     def update_redmine_token(
         db: Session, telegram_id: int, redmine_token: str, username: str | None = None
@@ -138,26 +302,126 @@ class UserService:
         Returns:
             Optional[User]: Updated user instance or None
         """
+        # Encrypt before starting the transaction so the write lock is only
+        # held for the UPDATE itself
         try:
-            user = UserService.get_by_telegram_id(db, telegram_id)
-            if user:
-                if user.set_redmine_token(redmine_token):
-                    # Update username if provided
-                    if username is not None:
-                        user.username = username
-                    db.commit()
-                    db.refresh(user)
-                    logger.info(
-                        f"Token updated for user {telegram_id}, username: {username}"
-                    )
-                    return user
-                else:
-                    db.rollback()
-                    logger.error(f"Failed to encrypt token for user {telegram_id}")
+            encrypted_token = User.encrypt_token(redmine_token)
+            fingerprint = User.fingerprint_token(redmine_token)
+        except Exception:
+            logger.exception("Failed to encrypt token for user %s", telegram_id)
             return None
-        except Exception as e:
+
+        values = {
+            User.encrypted_redmine_token: encrypted_token,
+            User.token_fingerprint: fingerprint,
+        }
+        # Update username if provided
+        if username is not None:
+            values[User.username] = username
+
+        try:
+            user = db.execute(
+                update(User)
+                .where(User.telegram_id == telegram_id, User.is_active == True)
+                .values(values)
+                .returning(User)
+                .execution_options(populate_existing=True)
+            ).scalar_one_or_none()
+            db.commit()
+            if user:
+                logger.info(
+                    "Token updated for user %s, username: %s", telegram_id, username
+                )
+            return user
+        except Exception:
             db.rollback()
-            logger.error(f"Error updating token for user {telegram_id}: {e}")
+            logger.exception("Error updating token for user %s", telegram_id)
+            raise
+
+    @staticmethod
+    def upsert_token(
+        db: Session, telegram_id: int, redmine_token: str, username: str | None = None
+    ) -> tuple[Optional[User], bool]:
+        """
+        Save a user's Redmine token, creating the user if needed.
+
+        Runs as a single INSERT ... ON CONFLICT DO UPDATE ... RETURNING instead
+        of a lookup followed by an update or insert. A soft-deleted user is
+        reactivated. Both audit columns get the same timestamp on insert, so
+        "created_at = updated_at" in the returned row tells the cases apart.
+
+        Resubmitting the stored token is recognized by its fingerprint and
+        returns the user without encrypting or writing anything.
+
+        Args:
+            db (Session): Database session
+            telegram_id (int): Telegram user ID
+            redmine_token (str): Redmine API token
+            username (str, optional): Telegram username; kept if None
+
+        Returns:
+            tuple[Optional[User], bool]: Saved user instance (None if the token
+            could not be encrypted) and whether the user was created
+        """
+        try:
+            fingerprint = User.fingerprint_token(redmine_token)
+        except Exception:
+            logger.exception("Failed to fingerprint token for user %s", telegram_id)
+            return None, False
+
+        user = db.execute(
+            _SELECT_USER_BY_TOKEN_FINGERPRINT,
+            {"telegram_id": telegram_id, "token_fingerprint": fingerprint},
+        ).scalar_one_or_none()
+        if user is not None and username in (None, user.username):
+            logger.info("Token unchanged for user %s", telegram_id)
+            return user, False
+
+        # Encrypt before starting the write so the lock is only held for the
+        # statement itself
+        try:
+            encrypted_token = User.encrypt_token(redmine_token)
+        except Exception:
+            logger.exception("Failed to encrypt token for user %s", telegram_id)
+            return None, False
+
+        now = datetime.now(timezone.utc)
+        try:
+            stmt = insert(User).values(
+                telegram_id=telegram_id,
+                username=username,
+                encrypted_redmine_token=encrypted_token,
+                token_fingerprint=fingerprint,
+                is_active=True,
+                created_at=now,
+                updated_at=now,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[User.telegram_id],
+                set_={
+                    "username": func.coalesce(stmt.excluded.username, User.username),
+                    "encrypted_redmine_token": stmt.excluded.encrypted_redmine_token,
+                    "token_fingerprint": stmt.excluded.token_fingerprint,
+                    "is_active": True,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+            user, created = db.execute(
+                stmt.returning(
+                    User, (User.created_at == User.updated_at).label("created")
+                ).execution_options(populate_existing=True)
+            ).one()
+            db.commit()
+            logger.info(
+                "Token %s for user %s, username: %s",
+                "saved" if created else "updated",
+                telegram_id,
+                username,
+            )
+            return user, bool(created)
+        except Exception:
+            db.rollback()
+            logger.exception("Error saving token for user %s", telegram_id)
             raise
 
     @staticmethod
@@ -173,16 +437,18 @@ class UserService:
             bool: True if deleted successfully, False otherwise
         """
         try:
-            user = UserService.get_by_id(db, user_id)
-            if user:
-                user.is_active = False
-                db.commit()
-                logger.info(f"User {user_id} soft deleted")
-                return True
-            return False
-        except Exception as e:
+            rows = (
+                db.query(User)
+                .filter(User.id == user_id, User.is_active == True)
+                .update({User.is_active: False})
+            )
+            db.commit()
+            if rows:
+                logger.info("User %s soft deleted", user_id)
+            return rows > 0
+        except Exception:
             db.rollback()
-            logger.error(f"Error deleting user {user_id}: {e}")
+            logger.exception("Error deleting user %s", user_id)
             raise
 
     @staticmethod
@@ -195,6 +461,10 @@ class UserService:
         """
         Get existing user or create new one.
 
+        Runs as a single INSERT ... ON CONFLICT DO UPDATE ... RETURNING, so
+        concurrent updates for the same user cannot race into a duplicate.
+        An existing user keeps its token; a soft-deleted one is reactivated.
+
         Args:
             db (Session): Database session
             telegram_id (int): Telegram user ID
@@ -204,10 +474,58 @@ class UserService:
         Returns:
             User: User instance
         """
-        user = UserService.get_by_telegram_id(db, telegram_id)
-        if not user:
-            user = UserService.create(db, telegram_id, username, redmine_token)
-        return user
+        try:
+            stmt = insert(User).values(
+                telegram_id=telegram_id,
+                username=username,
+                encrypted_redmine_token=(
+                    User.encrypt_token(redmine_token) if redmine_token else None
+                ),
+                token_fingerprint=(
+                    User.fingerprint_token(redmine_token) if redmine_token else None
+                ),
+                is_active=True,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[User.telegram_id],
+                set_={
+                    "username": func.coalesce(stmt.excluded.username, User.username),
+                    "is_active": True,
+                },
+            )
+            user = db.execute(
+                stmt.returning(User).execution_options(populate_existing=True)
+            ).scalar_one()
+            db.commit()
+            return user
+        except Exception:
+            db.rollback()
+            logger.exception("Error in get_or_create for user %s", telegram_id)
+            raise
+
+    @staticmethod
+    def warm_token_cache(db: Session) -> int:
+        """
+        Decrypt the tokens of all active users into the in-memory token cache.
+
+        Args:
+            db (Session): Database session
+
+        Returns:
+            int: Number of tokens cached
+        """
+        try:
+            rows = (
+                db.query(User.encrypted_redmine_token)
+                .filter(User.is_active == True, User.has_redmine_token())
+                .all()
+            )
+            count = User.load_token_cache([row[0] for row in rows])
+            logger.info("Token cache warmed with %s tokens", count)
+            return count
+        except Exception:
+            logger.exception("Error warming token cache")
+            return 0
 
 
 class TeamService:
@@ -239,38 +557,105 @@ class TeamService:
             Team: Created team instance
         """
         try:
-            # First, check if there's an existing team (active or inactive) for this group
-            existing_team = (
-                db.query(Team)
-                .filter(Team.telegram_group_id == telegram_group_id)
-                .first()
+            # Replace any existing team (active or inactive) for this group in
+            # one statement instead of DELETE + INSERT
+            stmt = insert(Team).values(
+                telegram_group_id=telegram_group_id,
+                redmine_project_code=redmine_project_code,
+                redmine_project_id=redmine_project_id,
+                team_name=team_name,
+                created_by_user_id=created_by_user_id,
+                is_active=True,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Team.telegram_group_id],
+                set_={
+                    "redmine_project_code": stmt.excluded.redmine_project_code,
+                    "redmine_project_id": stmt.excluded.redmine_project_id,
+                    "team_name": stmt.excluded.team_name,
+                    "created_by_user_id": stmt.excluded.created_by_user_id,
+                    "is_active": True,
+                    "updated_at": func.now(),
+                },
             )
+            team = db.execute(
+                stmt.returning(Team).execution_options(populate_existing=True)
+            ).scalar_one()
+            db.commit()
+            logger.info("Team created: %s (group_id: %s)", team_name, telegram_group_id)
+            return team
+        except Exception:
+            db.rollback()
+            logger.exception("Error creating team %s", team_name)
+            raise
 
-            if existing_team:
-                # Delete the existing team completely to avoid unique constraint issues
-                db.delete(existing_team)
-                db.commit()
-                logger.info(f"Removed existing team for group {telegram_group_id}")
+    @staticmethod
+    def create_if_absent(
+        db: Session,
+        telegram_group_id: int,
+        redmine_project_code: str,
+        redmine_project_id: int,
+        team_name: str,
+        created_by_user_id: int,
+    ) -> Optional[Team]:
+        """
+        Create a team unless the group already has an active one.
 
-            # Now create the new team
-            team = Team(
+        Runs as a single INSERT ... ON CONFLICT DO UPDATE ... WHERE ...
+        RETURNING, so two concurrent calls for the same group cannot both
+        create a team. A soft-deleted team is overwritten and reactivated.
+
+        Args:
+            db (Session): Database session
+            telegram_group_id (int): Telegram group ID
+            redmine_project_code (str): Redmine project identifier
+            redmine_project_id (int): Redmine project ID
+            team_name (str): Team name
+            created_by_user_id (int): Telegram user ID of creator
+
+        Returns:
+            Optional[Team]: Created team instance, or None if the group already
+            has an active team
+        """
+        try:
+            stmt = insert(Team).values(
                 telegram_group_id=telegram_group_id,
                 redmine_project_code=redmine_project_code,
                 redmine_project_id=redmine_project_id,
                 team_name=team_name,
                 created_by_user_id=created_by_user_id,
+                is_active=True,
             )
-            db.add(team)
+            # Only an inactive row may be taken over; an active one makes the
+            # statement a no-op that returns nothing
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Team.telegram_group_id],
+                set_={
+                    "redmine_project_code": stmt.excluded.redmine_project_code,
+                    "redmine_project_id": stmt.excluded.redmine_project_id,
+                    "team_name": stmt.excluded.team_name,
+                    "created_by_user_id": stmt.excluded.created_by_user_id,
+                    "is_active": True,
+                    "updated_at": func.now(),
+                },
+                where=Team.is_active == False,
+            )
+            team = db.execute(
+                stmt.returning(Team).execution_options(populate_existing=True)
+            ).scalar_one_or_none()
             db.commit()
-            db.refresh(team)
-            logger.info(f"Team created: {team_name} (group_id: {telegram_group_id})")
+            if team:
+                logger.info(
+                    "Team created: %s (group_id: %s)", team_name, telegram_group_id
+                )
             return team
-        except Exception as e:
+        except Exception:
             db.rollback()
-            logger.error(f"Error creating team {team_name}: {e}")
+            logger.exception("Error creating team %s", team_name)
             raise
 
     @staticmethod
+    @request_memoize("team_id")
     def get_by_id(db: Session, team_id: int) -> Optional[Team]:
         """
         Get team by ID.
@@ -282,9 +667,10 @@ class TeamService:
         Returns:
             Optional[Team]: Team instance or None
         """
-        return db.query(Team).filter(Team.id == team_id, Team.is_active == True).first()
+        return db.execute(_SELECT_TEAM_BY_ID, {"team_id": team_id}).scalar_one_or_none()
 
     @staticmethod
+    @request_memoize("team_group_id")
     def get_by_telegram_group_id(db: Session, telegram_group_id: int) -> Optional[Team]:
         """
         Get team by Telegram group ID.
@@ -296,11 +682,19 @@ class TeamService:
         Returns:
             Optional[Team]: Team instance or None
         """
-        return (
-            db.query(Team)
-            .filter(Team.telegram_group_id == telegram_group_id, Team.is_active == True)
-            .first()
-        )
+        team = _team_by_group_cache.get(db, telegram_group_id)
+        if team is not None:
+            return team
+        if _group_without_team_cache.get(telegram_group_id):
+            return None
+        team = db.execute(
+            _SELECT_TEAM_BY_GROUP_ID, {"telegram_group_id": telegram_group_id}
+        ).scalar_one_or_none()
+        if team is not None:
+            _team_by_group_cache.set(telegram_group_id, team)
+        else:
+            _group_without_team_cache.set(telegram_group_id, True)
+        return team
 
     @staticmethod
     def get_by_project_code(db: Session, redmine_project_code: str) -> List[Team]:
@@ -314,13 +708,11 @@ class TeamService:
         Returns:
             List[Team]: List of team instances
         """
-        return (
-            db.query(Team)
-            .filter(
-                Team.redmine_project_code == redmine_project_code,
-                Team.is_active == True,
-            )
-            .all()
+        return list(
+            db.execute(
+                _SELECT_TEAMS_BY_PROJECT_CODE,
+                {"redmine_project_code": redmine_project_code},
+            ).scalars()
         )
 
     @staticmethod
@@ -335,15 +727,32 @@ class TeamService:
         Returns:
             List[Team]: List of team instances created by the user
         """
-        return (
-            db.query(Team)
-            .filter(
-                Team.created_by_user_id == created_by_user_id,
-                Team.is_active == True,
-            )
-            .all()
+        return list(
+            db.execute(
+                _SELECT_TEAMS_BY_CREATOR, {"created_by_user_id": created_by_user_id}
+            ).scalars()
         )
 
+    @staticmethod
+    def list_for_creator_summary(db: Session, created_by_user_id: int) -> List[Row]:
+        """
+        Get the displayed columns of the teams created by a user.
+
+        Returns plain rows (team_name, redmine_project_id,
+        redmine_project_code, created_at) without building ORM instances.
+
+        Args:
+            db (Session): Database session
+            created_by_user_id (int): Telegram user ID of creator
+
+        Returns:
+            List[Row]: One row per active team created by the user
+        """
+        return db.execute(
+            _SELECT_TEAM_SUMMARIES_BY_CREATOR,
+            {"created_by_user_id": created_by_user_id},
+        ).all()
+
     @staticmethod
     def delete_by_group_and_creator(
         db: Session, telegram_group_id: int, created_by_user_id: int
@@ -360,53 +769,77 @@ class TeamService:
             bool: True if deleted successfully, False otherwise
         """
         try:
-            team = (
-                db.query(Team)
-                .filter(
+            # Hard delete - remove the record completely to avoid unique constraint issues.
+            # RETURNING hands back what the log needs without a prior SELECT.
+            row = db.execute(
+                delete(Team)
+                .where(
                     Team.telegram_group_id == telegram_group_id,
                     Team.created_by_user_id == created_by_user_id,
                     Team.is_active == True,
                 )
-                .first()
-            )
+                .returning(Team.id, Team.team_name)
+            ).first()
+            db.commit()
 
-            if team:
-                # Hard delete - remove the record completely to avoid unique constraint issues
-                team_id = team.id
-                team_name = team.team_name
-                db.delete(team)
-                db.commit()
+            if row:
                 logger.info(
-                    f"Team {team_id} ({team_name}) hard deleted by creator {created_by_user_id}"
+                    "Team %s (%s) hard deleted by creator %s",
+                    row.id,
+                    row.team_name,
+                    created_by_user_id,
                 )
                 return True
             return False
-        except Exception as e:
+        except Exception:
             db.rollback()
-            logger.error(f"Error deleting team for group {telegram_group_id}: {e}")
+            logger.exception("Error deleting team for group %s", telegram_group_id)
             raise
 
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[Team]:
+    def get_all(db: Session, after_id: int = 0, limit: int = 100) -> List[Team]:
         """
-        Get all active teams.
+        Get a page of active teams, ordered by ID.
+
+        Uses keyset pagination: pass the last ID of the previous page as
+        after_id, so each page is an index range scan instead of an OFFSET.
 
         Args:
             db (Session): Database session
-            skip (int): Number of records to skip
+            after_id (int): Return only teams with an ID greater than this
             limit (int): Maximum number of records to return
 
         Returns:
             List[Team]: List of team instances
         """
-        return (
-            db.query(Team)
-            .filter(Team.is_active == True)
-            .offset(skip)
-            .limit(limit)
-            .all()
+        return list(
+            db.execute(
+                select(Team)
+                .where(Team.is_active == True, Team.id > after_id)
+                .order_by(Team.id)
+                .limit(limit)
+            ).scalars()
         )
 
+    @staticmethod
+    def iter_all(db: Session, batch_size: int = 500) -> Iterator[Team]:
+        """
+        Iterate over all active teams without loading them all at once.
+
+        Args:
+            db (Session): Database session
+            batch_size (int): Number of rows fetched per batch
+
+        Yields:
+            Team: Team instances, ordered by ID
+        """
+        yield from db.execute(
+            select(Team)
+            .where(Team.is_active == True)
+            .order_by(Team.id)
+            .execution_options(yield_per=batch_size)
+        ).scalars()
+
     @staticmethod
     def update(
         db: Session,
@@ -427,21 +860,29 @@ class TeamService:
             Optional[Team]: Updated team instance or None
         """
         try:
-            team = TeamService.get_by_id(db, team_id)
+            values = {}
+            if team_name is not None:
+                values[Team.team_name] = team_name
+            if redmine_project_code is not None:
+                values[Team.redmine_project_code] = redmine_project_code
+
+            if not values:
+                return TeamService.get_by_id(db, team_id)
+
+            team = db.execute(
+                update(Team)
+                .where(Team.id == team_id, Team.is_active == True)
+                .values(values)
+                .returning(Team)
+                .execution_options(populate_existing=True)
+            ).scalar_one_or_none()
+            db.commit()
             if team:
-                if team_name is not None:
-                    team.team_name = team_name
-                if redmine_project_code is not None:
-                    team.redmine_project_code = redmine_project_code
-
-                db.commit()
-                db.refresh(team)
-                logger.info(f"Team {team_id} updated")
-                return team
-            return None
-        except Exception as e:
+                logger.info("Team %s updated", team_id)
+            return team
+        except Exception:
             db.rollback()
-            logger.error(f"Error updating team {team_id}: {e}")
+            logger.exception("Error updating team %s", team_id)
             raise
 
     @staticmethod
@@ -457,40 +898,82 @@ class TeamService:
             bool: True if deleted successfully, False otherwise
         """
         try:
-            team = TeamService.get_by_id(db, team_id)
-            if team:
-                team.is_active = False
-                db.commit()
-                logger.info(f"Team {team_id} soft deleted")
-                return True
-            return False
-        except Exception as e:
+            rows = (
+                db.query(Team)
+                .filter(Team.id == team_id, Team.is_active == True)
+                .update({Team.is_active: False})
+            )
+            db.commit()
+            if rows:
+                logger.info("Team %s soft deleted", team_id)
+            return rows > 0
+        except Exception:
             db.rollback()
-            logger.error(f"Error deleting team {team_id}: {e}")
+            logger.exception("Error deleting team %s", team_id)
             raise
 
     @staticmethod
     def get_or_create(
-        db: Session, telegram_group_id: int, redmine_project_code: str, team_name: str
+        db: Session,
+        telegram_group_id: int,
+        redmine_project_code: str,
+        redmine_project_id: int,
+        team_name: str,
+        created_by_user_id: int,
     ) -> Team:
         """
         Get existing team or create new one.
 
+        Runs as a single INSERT ... ON CONFLICT DO UPDATE ... RETURNING. An
+        active team for the group is returned unchanged; a soft-deleted one is
+        reactivated with the given configuration.
+
         Args:
             db (Session): Database session
             telegram_group_id (int): Telegram group ID
             redmine_project_code (str): Redmine project identifier
+            redmine_project_id (int): Redmine project ID
             team_name (str): Team name
+            created_by_user_id (int): Telegram user ID of creator
 
         Returns:
             Team: Team instance
         """
-        team = TeamService.get_by_telegram_group_id(db, telegram_group_id)
-        if not team:
-            team = TeamService.create(
-                db, telegram_group_id, redmine_project_code, team_name
+        try:
+            stmt = insert(Team).values(
+                telegram_group_id=telegram_group_id,
+                redmine_project_code=redmine_project_code,
+                redmine_project_id=redmine_project_id,
+                team_name=team_name,
+                created_by_user_id=created_by_user_id,
+                is_active=True,
             )
-        return team
+            # Keep an active team as is, overwrite a soft-deleted one
+            set_ = {
+                column: case(
+                    (Team.is_active == True, getattr(Team, column)),
+                    else_=stmt.excluded[column],
+                )
+                for column in (
+                    "redmine_project_code",
+                    "redmine_project_id",
+                    "team_name",
+                    "created_by_user_id",
+                )
+            }
+            set_["is_active"] = True
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Team.telegram_group_id], set_=set_
+            )
+            team = db.execute(
+                stmt.returning(Team).execution_options(populate_existing=True)
+            ).scalar_one()
+            db.commit()
+            return team
+        except Exception:
+            db.rollback()
+            logger.exception("Error in get_or_create for group %s", telegram_group_id)
+            raise
 
 
 class DailyService:
@@ -528,12 +1011,39 @@ class DailyService:
             )
             db.add(daily)
             db.commit()
-            db.refresh(daily)
-            logger.info(f"Daily created for team {team_id} at {start_time}")
+            logger.info("Daily created for team %s at %s", team_id, start_time)
             return daily
-        except Exception as e:
+        except Exception:
             db.rollback()
-            logger.error(f"Error creating daily for team {team_id}: {e}")
+            logger.exception("Error creating daily for team %s", team_id)
+            raise
+
+    @staticmethod
+    def create_many(db: Session, dailies: List[dict]) -> int:
+        """
+        Create many dailies in one executemany INSERT.
+
+        Args:
+            db (Session): Database session
+            dailies (List[dict]): Rows with team_id, telegram_group_id, start_time
+                and optionally participants_ids
+
+        Returns:
+            int: Number of dailies created
+        """
+        if not dailies:
+            return 0
+        try:
+            db.execute(
+                insert(Daily),
+                [{"participants_ids": [], **daily} for daily in dailies],
+            )
+            db.commit()
+            logger.info("%s dailies created", len(dailies))
+            return len(dailies)
+        except Exception:
+            db.rollback()
+            logger.exception("Error creating %s dailies", len(dailies))
             raise
 
     @staticmethod
@@ -548,7 +1058,27 @@ class DailyService:
         Returns:
             Optional[Daily]: Daily instance or None
         """
-        return db.query(Daily).filter(Daily.id == daily_id).first()
+        # Primary key lookup: served from the identity map when already loaded
+        return db.get(Daily, daily_id)
+
+    @staticmethod
+    def get_active_group_ids(db: Session) -> List[int]:
+        """
+        Get the Telegram group IDs that have an unfinished daily.
+
+        Args:
+            db (Session): Database session
+
+        Returns:
+            List[int]: Group IDs with an active daily
+        """
+        return list(
+            db.scalars(
+                select(Daily.telegram_group_id)
+                .where(Daily.end_time.is_(None))
+                .distinct()
+            )
+        )
 
     @staticmethod
     def get_active_daily_by_group(
@@ -565,13 +1095,58 @@ class DailyService:
             Optional[Daily]: Active daily instance or None
         """
         return (
-            db.query(Daily)
-            .filter(
-                Daily.telegram_group_id == telegram_group_id, Daily.end_time.is_(None)
+            db.execute(
+                _SELECT_ACTIVE_DAILY_BY_GROUP, {"telegram_group_id": telegram_group_id}
             )
+            .scalars()
             .first()
         )
 
+    @staticmethod
+    def get_active_daily_with_team(
+        db: Session, telegram_group_id: int
+    ) -> Optional[tuple[Daily, Optional[Team]]]:
+        """
+        Get the active daily of a group together with its team, in one query.
+
+        Args:
+            db (Session): Database session
+            telegram_group_id (int): Telegram group ID
+
+        Returns:
+            Optional[tuple[Daily, Optional[Team]]]: Active daily and its team
+            (None if the team is missing or inactive), or None if there is no
+            active daily
+        """
+        row = db.execute(
+            _SELECT_ACTIVE_DAILY_WITH_TEAM_BY_GROUP,
+            {"telegram_group_id": telegram_group_id},
+        ).first()
+        return (row[0], row[1]) if row else None
+
+    @staticmethod
+    def _update_returning(db: Session, daily_id: int, values: dict) -> Optional[Daily]:
+        """
+        Update a daily in a single UPDATE ... RETURNING statement and commit.
+
+        Args:
+            db (Session): Database session
+            daily_id (int): Daily ID
+            values (dict): Column -> new value
+
+        Returns:
+            Optional[Daily]: Updated daily instance or None
+        """
+        daily = db.execute(
+            update(Daily)
+            .where(Daily.id == daily_id)
+            .values(values)
+            .returning(Daily)
+            .execution_options(populate_existing=True)
+        ).scalar_one_or_none()
+        db.commit()
+        return daily
+
     @staticmethod
     def finish_daily(
         db: Session, daily_id: int, end_time: datetime = None
@@ -588,17 +1163,15 @@ class DailyService:
             Optional[Daily]: Updated daily instance or None
         """
         try:
-            daily = DailyService.get_by_id(db, daily_id)
+            daily = DailyService._update_returning(
+                db, daily_id, {Daily.end_time: end_time or datetime.now()}
+            )
             if daily:
-                daily.finish_daily(end_time)
-                db.commit()
-                db.refresh(daily)
-                logger.info(f"Daily {daily_id} finished at {daily.end_time}")
-                return daily
-            return None
-        except Exception as e:
+                logger.info("Daily %s finished at %s", daily_id, daily.end_time)
+            return daily
+        except Exception:
             db.rollback()
-            logger.error(f"Error finishing daily {daily_id}: {e}")
+            logger.exception("Error finishing daily %s", daily_id)
             raise
 
     @staticmethod
@@ -617,19 +1190,58 @@ class DailyService:
             Optional[Daily]: Updated daily instance or None
         """
         try:
-            daily = DailyService.get_by_id(db, daily_id)
+            daily = DailyService._update_returning(
+                db, daily_id, {Daily.participants_ids: participants_ids}
+            )
             if daily:
-                daily.set_participants(participants_ids)
-                db.commit()
-                db.refresh(daily)
                 logger.info(
-                    f"Daily {daily_id} participants updated: {len(participants_ids)} participants"
+                    "Daily %s participants updated: %s participants",
+                    daily_id,
+                    len(participants_ids),
                 )
-                return daily
-            return None
-        except Exception as e:
+            return daily
+        except Exception:
             db.rollback()
-            logger.error(f"Error updating participants for daily {daily_id}: {e}")
+            logger.exception("Error updating participants for daily %s", daily_id)
+            raise
+
+    @staticmethod
+    def update_participants_many(
+        db: Session, participants_by_daily: dict[int, List[int]]
+    ) -> int:
+        """
+        Update participants of many dailies in one executemany UPDATE.
+
+        Args:
+            db (Session): Database session
+            participants_by_daily (dict[int, List[int]]): Daily ID -> participant Telegram IDs
+
+        Returns:
+            int: Number of dailies updated
+        """
+        if not participants_by_daily:
+            return 0
+        try:
+            db.execute(
+                update(Daily),
+                [
+                    {"id": daily_id, "participants_ids": participants_ids}
+                    for daily_id, participants_ids in participants_by_daily.items()
+                ],
+            )
+            db.commit()
+            # Bulk UPDATE by primary key does not touch loaded instances
+            for daily_id in participants_by_daily:
+                daily = db.identity_map.get(identity_key(Daily, daily_id))
+                if daily is not None:
+                    db.expire(daily)
+            logger.info(
+                "Participants updated for %s dailies", len(participants_by_daily)
+            )
+            return len(participants_by_daily)
+        except Exception:
+            db.rollback()
+            logger.exception("Error updating participants for many dailies")
             raise
 
     @staticmethod
@@ -645,17 +1257,15 @@ class DailyService:
             Optional[Daily]: Updated daily instance or None
         """
         try:
-            daily = DailyService.get_by_id(db, daily_id)
+            daily = DailyService._update_returning(
+                db, daily_id, {Daily.registered_in_redmine: True}
+            )
             if daily:
-                daily.mark_registered_in_redmine()
-                db.commit()
-                db.refresh(daily)
-                logger.info(f"Daily {daily_id} marked as registered in Redmine")
-                return daily
-            return None
-        except Exception as e:
+                logger.info("Daily %s marked as registered in Redmine", daily_id)
+            return daily
+        except Exception:
             db.rollback()
-            logger.error(f"Error marking daily {daily_id} as registered: {e}")
+            logger.exception("Error marking daily %s as registered", daily_id)
             raise
 
     @staticmethod
@@ -673,12 +1283,10 @@ class DailyService:
             Optional[Daily]: Latest unregistered daily instance or None
         """
         return (
-            db.query(Daily)
-            .filter(
-                Daily.telegram_group_id == telegram_group_id,
-                Daily.registered_in_redmine == False,
-                Daily.end_time != None,  # Only finished dailies
+            db.execute(
+                _SELECT_LATEST_UNREGISTERED_DAILY_BY_GROUP,
+                {"telegram_group_id": telegram_group_id},
             )
-            .order_by(Daily.end_time.desc())
+            .scalars()
             .first()
         )
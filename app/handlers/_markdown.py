@@ -0,0 +1,43 @@
+"""
+Markdown escaping helpers shared by the command handlers
+"""
+
+
+def _escape_table(special_chars: str) -> dict:
+    """
+    Build a str.translate table that prefixes each character with a backslash
+    """
+    return str.maketrans({char: f"\\{char}" for char in special_chars})
+
+
+# Characters escaped in Markdown replies (e.g. the /daily summary)
+_MD_ESCAPE = _escape_table("_*()~`>#+=|{}.!")
+
+# Full MarkdownV2 set, which also reserves brackets and hyphens
+_MD_V2_ESCAPE = _escape_table("_*[]()~`>#+-=|{}.!")
+
+
+def escape_markdown(text: str) -> str:
+    """
+    Escape special characters for Markdown formatting
+
+    Args:
+        text (str): Text to escape
+
+    Returns:
+        str: Escaped text safe for Markdown
+    """
+    return str(text).translate(_MD_ESCAPE) if text else ""
+
+
+def escape_markdown_v2(text: str) -> str:
+    """
+    Escape special characters for MarkdownV2 formatting
+
+    Args:
+        text (str): Text to escape
+
+    Returns:
+        str: Escaped text safe for MarkdownV2
+    """
+    return str(text).translate(_MD_V2_ESCAPE) if text else ""
@@ -0,0 +1,179 @@
+import logging
+import time
+from typing import Optional
+from telegram import Bot, Update
+from telegram.ext import ContextTypes, ChatMemberHandler
+
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Member statuses allowed to manage team associations
+ADMIN_STATUSES = ("administrator", "creator")
+
+# Last known status per (chat_id, user_id); refreshed on chat_member updates
+_member_status_cache = TTLCache(ttl=300, maxsize=10000)
+
+# Seconds before a chat's cached administrator list is fetched again
+ADMIN_IDS_TTL = 600
+
+
+async def get_member_status(
+    bot: Bot, chat_id: int, user_id: int, cached: bool = True
+) -> str:
+    """
+    Get a user's status in a chat, asking Telegram at most once per 5 minutes
+
+    Args:
+        bot (Bot): Bot used for the get_chat_member call
+        chat_id (int): Telegram chat ID
+        user_id (int): Telegram user ID
+        cached (bool): Whether a cached status may be returned; when False
+            Telegram is always asked and the cache is refreshed
+
+    Returns:
+        str: Member status (e.g. "administrator", "member")
+    """
+    key = (chat_id, user_id)
+    status = _member_status_cache.get(key) if cached else None
+    if status is None:
+        chat_member = await bot.get_chat_member(chat_id, user_id)
+        status = chat_member.status
+        _member_status_cache.set(key, status)
+    return status
+
+
+async def bot_is_admin(bot: Bot, chat_id: int, chat_data: dict) -> bool:
+    """
+    Check whether the bot itself administers a chat, cached in the chat's data
+
+    Telegram only sends chat_member updates to bots that are administrators,
+    so only then can the cached administrator list be kept current. The answer
+    is refreshed by my_chat_member updates and after ADMIN_IDS_TTL seconds.
+
+    Args:
+        bot (Bot): Bot used for the get_chat_member call
+        chat_id (int): Telegram chat ID
+        chat_data (dict): The chat's context.chat_data
+
+    Returns:
+        bool: True if the bot is an administrator or the creator of the chat
+    """
+    is_admin = chat_data.get("bot_is_admin")
+    fetched_at = chat_data.get("bot_admin_ts", 0.0)
+    if is_admin is None or time.monotonic() - fetched_at > ADMIN_IDS_TTL:
+        chat_member = await bot.get_chat_member(chat_id, bot.id)
+        is_admin = chat_member.status in ADMIN_STATUSES
+        chat_data["bot_is_admin"] = is_admin
+        chat_data["bot_admin_ts"] = time.monotonic()
+    return is_admin
+
+
+async def get_admin_ids(bot: Bot, chat_id: int, chat_data: dict) -> frozenset:
+    """
+    Get the user IDs of a chat's administrators, cached in the chat's data
+
+    The list is fetched with one get_chat_administrators call and refreshed
+    after ADMIN_IDS_TTL seconds. Meanwhile chat_member updates keep it current,
+    but Telegram only sends those while the bot is an administrator of the
+    chat; is_group_admin checks that before trusting the list.
+
+    Args:
+        bot (Bot): Bot used for the get_chat_administrators call
+        chat_id (int): Telegram chat ID
+        chat_data (dict): The chat's context.chat_data
+
+    Returns:
+        frozenset: Telegram user IDs of the administrators and the creator
+    """
+    admin_ids = chat_data.get("admin_ids")
+    fetched_at = chat_data.get("admins_ts", 0.0)
+    if admin_ids is None or time.monotonic() - fetched_at > ADMIN_IDS_TTL:
+        admins = await bot.get_chat_administrators(chat_id)
+        admin_ids = frozenset(member.user.id for member in admins)
+        chat_data["admin_ids"] = admin_ids
+        chat_data["admins_ts"] = time.monotonic()
+    return admin_ids
+
+
+async def is_group_admin(
+    bot: Bot, chat_id: int, user_id: int, chat_data: Optional[dict] = None
+) -> bool:
+    """
+    Check whether a user is an administrator or the creator of a chat
+
+    Args:
+        bot (Bot): Bot used for the Telegram calls
+        chat_id (int): Telegram chat ID
+        user_id (int): Telegram user ID
+        chat_data (Optional[dict]): The chat's context.chat_data. When given
+            and the bot administers the chat, the check is a lookup in the
+            cached administrator list. When the bot is not an administrator,
+            no chat_member updates arrive to keep a cache current, so the
+            user's status is asked from Telegram on every check.
+
+    Returns:
+        bool: True if the user can manage the group
+    """
+    if chat_data is None:
+        return await get_member_status(bot, chat_id, user_id) in ADMIN_STATUSES
+    if await bot_is_admin(bot, chat_id, chat_data):
+        return user_id in await get_admin_ids(bot, chat_id, chat_data)
+    status = await get_member_status(bot, chat_id, user_id, cached=False)
+    return status in ADMIN_STATUSES
+
+
+async def chat_member_updated(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    """
+    Handler for chat_member and my_chat_member updates
+    Keeps the cached member status in sync with promotions, demotions and leaves
+    """
+    if update.my_chat_member:
+        _my_chat_member_updated(update.my_chat_member, context.chat_data)
+        return
+
+    member_update = update.chat_member
+    if not member_update:
+        return
+
+    new_member = member_update.new_chat_member
+    _member_status_cache.set(
+        (member_update.chat.id, new_member.user.id), new_member.status
+    )
+
+    admin_ids = context.chat_data.get("admin_ids") if context.chat_data else None
+    if admin_ids is not None:
+        if new_member.status in ADMIN_STATUSES:
+            context.chat_data["admin_ids"] = admin_ids | {new_member.user.id}
+        else:
+            context.chat_data["admin_ids"] = admin_ids - {new_member.user.id}
+    logger.debug(
+        "Member %s in chat %s is now %s",
+        new_member.user.id,
+        member_update.chat.id,
+        new_member.status,
+    )
+
+
+def _my_chat_member_updated(member_update, chat_data: Optional[dict]) -> None:
+    """
+    Record a change of the bot's own status in the chat's data
+
+    While the bot was not an administrator no chat_member updates arrived, so
+    the cached administrator list is dropped either way and fetched again.
+    """
+    if chat_data is None:
+        return
+    chat_data["bot_is_admin"] = member_update.new_chat_member.status in ADMIN_STATUSES
+    chat_data["bot_admin_ts"] = time.monotonic()
+    chat_data.pop("admin_ids", None)
+    chat_data.pop("admins_ts", None)
+
+
+def get_chat_member_handler():
+    """
+    Returns the configured handler for chat_member and my_chat_member updates
+    """
+    return ChatMemberHandler(chat_member_updated, ChatMemberHandler.ANY_CHAT_MEMBER)
@@ -1,53 +1,212 @@
+import io
 import logging
 import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+from enum import Enum
 from telegram import Update
 from telegram.ext import ContextTypes, CommandHandler
 from telegram.constants import ChatType
+from sqlalchemy.orm import Session
 
 from app.database.database import DatabaseSession
 from app.database.services import UserService, TeamService, DailyService
-from app.services.redmine_service import RedmineService
-from app.config import settings
+from app.services.redmine_service import AsyncRedmineService, RedmineAuthError
+from app.handlers._markdown import escape_markdown
+from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# A participant mention: "@" followed by a Telegram username
+_MENTION_RE = re.compile(r"^@(\w+)$")
 
-def escape_markdown(text: str) -> str:
+
+class ParticipantStatus(Enum):
+    """
+    Outcome of logging daily time for one mentioned participant
     """
-    Escape special characters for Markdown formatting
+
+    NOT_FOUND = "not_found"
+    NO_TOKEN = "no_token"
+    LOGGED = "logged"
+    FAILED = "failed"
+
+
+def _require_group_and_args(update: Update, args: Optional[List[str]]) -> Optional[str]:
+    """
+    Validate the chat type and arguments of a /daily command
 
     Args:
-        text (str): Text to escape
+        update (Update): Incoming update
+        args (List[str], optional): Command arguments
 
     Returns:
-        str: Escaped text safe for Markdown
+        Optional[str]: Error message to reply with, or None if valid
     """
-    if not text:
-        return ""
-
-    # Escape special Markdown characters
-    special_chars = [
-        "_",
-        "*",
-        "(",
-        ")",
-        "~",
-        "`",
-        ">",
-        "#",
-        "+",
-        "=",
-        "|",
-        "{",
-        "}",
-        ".",
-        "!",
-    ]
-    escaped_text = str(text)
-    for char in special_chars:
-        escaped_text = escaped_text.replace(char, f"\\{char}")
-    return escaped_text
+    if update.message.chat.type not in [ChatType.GROUP, ChatType.SUPERGROUP]:
+        return "🔒 Este comando solo puede usarse en grupos."
+
+    if not args:
+        return (
+            "❌ Debes mencionar a los usuarios que participaron en la daily.\n\n"
+            "Uso: `/daily @usuario1 @usuario2 @usuario3`\n\n"
+            "Ejemplo: `/daily @juan @maria @carlos`"
+        )
+
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class _Reply:
+    """
+    Error reply for a /daily command rejected by the database checks
+    """
+
+    text: str
+    parse_mode: Optional[str] = None
+
+
+@dataclass(slots=True)
+class _PendingDaily:
+    """
+    Everything the Redmine calls of /daily need, copied out of the session
+    """
+
+    daily_id: int
+    start_time: datetime
+    end_time: datetime
+    project_id: int
+    team_name: str
+    redmine_token: str
+    # Participants already known to be missing or without a token
+    results: Dict[str, ParticipantStatus]
+    # (username, Redmine token) of the participants to log time for
+    users_to_log: List[Tuple[str, str]]
+
+
+def _load_daily(
+    db: Session,
+    group_id: int,
+    user_id: int,
+    mentioned_usernames: List[str],
+    now: datetime,
+) -> Tuple[Optional[_Reply], Optional[_PendingDaily]]:
+    """
+    Run the database checks of a /daily command
+
+    Only plain values leave this function, so the session can be closed before
+    the first Telegram or Redmine request.
+
+    Args:
+        db (Session): Database session
+        group_id (int): Telegram group ID
+        user_id (int): Telegram ID of the user who issued the command
+        mentioned_usernames (List[str]): Participants, without the "@"
+        now (datetime): Time the command was received
+
+    Returns:
+        Tuple[Optional[_Reply], Optional[_PendingDaily]]: The error reply if a
+        check failed, otherwise the daily to register
+    """
+    # Check if the group has a team configuration
+    team = TeamService.get_by_telegram_group_id(db, group_id)
+    if not team:
+        return (
+            _Reply(
+                "❌ Este grupo no está asociado a ningún proyecto de Redmine.\n\n"
+                "Usa `/team PROJECT_ID PROJECT_NAME` para configurar el equipo primero.",
+                "Markdown",
+            ),
+            None,
+        )
+
+    # Check if user who issued the command has a Redmine token
+    command_user = UserService.get_by_telegram_id(db, user_id)
+    if not command_user or not command_user.has_redmine_token():
+        return (
+            _Reply(
+                "❌ Necesitas configurar tu token de Redmine primero.\n\n"
+                "Usa `/token TU_TOKEN_REDMINE` en un chat privado para configurar tu token.",
+                "Markdown",
+            ),
+            None,
+        )
+
+    # Get the latest unregistered daily for this group
+    latest_daily = DailyService.get_latest_unregistered_daily_by_group(db, group_id)
+
+    if not latest_daily:
+        return (
+            _Reply(
+                "❌ No hay ninguna daily pendiente de registrar en Redmine.\n\n"
+                "Todas las dailies de este grupo ya han sido registradas o no se ha iniciado ninguna daily."
+            ),
+            None,
+        )
+
+    # Check if the daily has ended
+    if latest_daily.end_time is None:
+        return (
+            _Reply(
+                "❌ La daily actual aún no ha terminado.\n\n"
+                "Espera a que termine para poder registrarla en Redmine."
+            ),
+            None,
+        )
+
+    # Check if enough time has passed since the daily ended (30 minutes max)
+    time_since_ended = now - latest_daily.end_time
+    if time_since_ended.total_seconds() > 30 * 60:  # 30 minutes in seconds
+        return (
+            _Reply(
+                f"❌ Han pasado más de 30 minutos desde que terminó la última daily ({latest_daily.end_time.strftime('%H:%M:%S')}).\n\n"
+                "No se puede registrar en Redmine."
+            ),
+            None,
+        )
+
+    # Get the command user's Redmine token
+    redmine_token = command_user.get_redmine_token()
+    if not redmine_token:
+        return (
+            _Reply(
+                "❌ Error al obtener tu token de Redmine. Configúralo nuevamente con `/token`.",
+                "Markdown",
+            ),
+            None,
+        )
+
+    # Find users by username and record a status for those that cannot be
+    # logged; the rest keep their decrypted token for the bulk log
+    results: Dict[str, ParticipantStatus] = {}
+    users_to_log = []
+    users_by_name = UserService.get_by_usernames(db, mentioned_usernames)
+
+    for username in mentioned_usernames:
+        db_user = users_by_name.get(username)
+
+        if not db_user:
+            results[username] = ParticipantStatus.NOT_FOUND
+            continue
+
+        user_token = db_user.has_redmine_token() and db_user.get_redmine_token()
+        if not user_token:
+            results[username] = ParticipantStatus.NO_TOKEN
+            continue
+
+        users_to_log.append((username, user_token))
+
+    return None, _PendingDaily(
+        daily_id=latest_daily.id,
+        start_time=latest_daily.start_time,
+        end_time=latest_daily.end_time,
+        project_id=team.redmine_project_id,
+        team_name=team.team_name,
+        redmine_token=redmine_token,
+        results=results,
+        users_to_log=users_to_log,
+    )
 
 
 async def daily_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -60,32 +219,21 @@ async def daily_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     if not update.effective_user or not update.message:
         return
 
-    # Check if the command is being used in a group chat
-    if update.message.chat.type not in [ChatType.GROUP, ChatType.SUPERGROUP]:
-        await update.message.reply_text("🔒 Este comando solo puede usarse en grupos.")
+    # Cheap guards first: no DB session or loading message on these paths
+    error_message = _require_group_and_args(update, context.args)
+    if error_message:
+        await update.message.reply_text(error_message, parse_mode="Markdown")
         return
 
     user = update.effective_user
-    args = context.args or []
+    args = context.args
     loading_message = None
 
-    # Check if any mentions were provided
-    if not args:
-        await update.message.reply_text(
-            "❌ Debes mencionar a los usuarios que participaron en la daily.\n\n"
-            "Uso: `/daily @usuario1 @usuario2 @usuario3`\n\n"
-            "Ejemplo: `/daily @juan @maria @carlos`",
-            parse_mode="Markdown",
-        )
-        return
-
-    # Extract mentions from arguments
-    mentioned_usernames = []
-    for arg in args:
-        if arg.startswith("@"):
-            username = arg[1:]  # Remove @ symbol
-            if username:
-                mentioned_usernames.append(username)
+    # Extract mentions from arguments, keeping the first of any duplicates so a
+    # participant mentioned twice is logged once
+    mentioned_usernames = list(
+        dict.fromkeys(m.group(1) for arg in args if (m := _MENTION_RE.match(arg)))
+    )
 
     if not mentioned_usernames:
         await update.message.reply_text(
@@ -96,212 +244,153 @@ async def daily_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         return
 
     group_id = update.message.chat.id
+    now = datetime.now()
 
     try:
-        loading_message = await update.message.reply_text("🔄 Validando información...")
-
+        # All DB reads happen in one short session, closed before any Telegram
+        # or Redmine round-trip so it never holds a pooled connection
         with DatabaseSession() as db:
-            # Check if the group has a team configuration
-            team = TeamService.get_by_telegram_group_id(db, group_id)
-            if not team:
-                await loading_message.edit_text(
-                    "❌ Este grupo no está asociado a ningún proyecto de Redmine.\n\n"
-                    "Usa `/team PROJECT_ID PROJECT_NAME` para configurar el equipo primero.",
-                    parse_mode="Markdown",
-                )
-                return
-
-            # Check if user who issued the command has a Redmine token
-            command_user = UserService.get_by_telegram_id(db, user.id)
-            if not command_user or not command_user.has_redmine_token():
-                await loading_message.edit_text(
-                    "❌ Necesitas configurar tu token de Redmine primero.\n\n"
-                    "Usa `/token TU_TOKEN_REDMINE` en un chat privado para configurar tu token.",
-                    parse_mode="Markdown",
-                )
-                return
-
-            # Get the latest unregistered daily for this group
-            latest_daily = DailyService.get_latest_unregistered_daily_by_group(
-                db, group_id
-            )
+            error, daily = _load_daily(db, group_id, user.id, mentioned_usernames, now)
 
-            if not latest_daily:
-                await loading_message.edit_text(
-                    "❌ No hay ninguna daily pendiente de registrar en Redmine.\n\n"
-                    "Todas las dailies de este grupo ya han sido registradas o no se ha iniciado ninguna daily."
-                )
-                return
+        if error:
+            await update.message.reply_text(error.text, parse_mode=error.parse_mode)
+            return
 
-            # Check if the daily has ended
-            if latest_daily.end_time is None:
-                await loading_message.edit_text(
-                    "❌ La daily actual aún no ha terminado.\n\n"
-                    "Espera a que termine para poder registrarla en Redmine."
-                )
-                return
+        # All DB-only checks passed; real work starts here
+        loading_message = await update.message.reply_text(
+            "🔄 Creando tarea daily en Redmine..."
+        )
 
-            # Check if enough time has passed since the daily ended (30 minutes max)
-            time_since_ended = datetime.now() - latest_daily.end_time
-            if time_since_ended.total_seconds() > 30 * 60:  # 30 minutes in seconds
-                await loading_message.edit_text(
-                    f"❌ Han pasado más de 30 minutos desde que terminó la última daily ({latest_daily.end_time.strftime('%H:%M:%S')}).\n\n"
-                    "No se puede registrar en Redmine."
-                )
-                return
+        # The async service runs the blocking Redmine calls in worker
+        # threads, keeping the event loop free
+        redmine_service = AsyncRedmineService.for_token(daily.redmine_token)
 
-            # Get the command user's Redmine token
-            redmine_token = command_user.get_redmine_token()
-            if not redmine_token:
-                await loading_message.edit_text(
-                    "❌ Error al obtener tu token de Redmine. Configúralo nuevamente con `/token`.",
-                    parse_mode="Markdown",
-                )
-                return
+        # Calculate daily duration in hours for estimated time
+        duration_delta = daily.end_time - daily.start_time
+        daily_duration_hours = duration_delta.total_seconds() / 3600  # Convert to hours
 
-            # Test Redmine connection
-            redmine_service = RedmineService(redmine_token)
-            if not redmine_service.test_connection():
-                await loading_message.edit_text(
-                    "❌ No se pudo conectar a Redmine. Verifica tu token."
-                )
-                return
-
-            await loading_message.edit_text("🔄 Creando tarea daily en Redmine...")
-
-            # Calculate daily duration in hours for estimated time
-            # At this point we know latest_daily exists and has both start_time and end_time
-            duration_delta = latest_daily.end_time - latest_daily.start_time
-            daily_duration_hours = (
-                duration_delta.total_seconds() / 3600
-            )  # Convert to hours
-
-            # Create daily task in Redmine
-            daily_task = redmine_service.create_daily_task(
-                project_id=team.redmine_project_id,  # type: ignore
-                team_name=team.team_name,  # type: ignore
-                daily_date=datetime.now(),
-                estimated_time=daily_duration_hours * len(mentioned_usernames),
+        # Create daily task in Redmine; a rejected token surfaces here, so
+        # no separate connection test is needed
+        try:
+            daily_task = await redmine_service.create_daily_task(
+                daily.project_id,  # project_id
+                daily.team_name,  # team_name
+                now,  # daily_date
+                daily_duration_hours * len(mentioned_usernames),  # estimated_time
             )
+        except RedmineAuthError:
+            await loading_message.edit_text(
+                "❌ No se pudo conectar a Redmine. Verifica tu token."
+            )
+            return
 
-            if not daily_task:
-                await loading_message.edit_text(
-                    "❌ Error al crear la tarea daily en Redmine."
-                )
-                return
-
+        if not daily_task:
             await loading_message.edit_text(
-                "🔄 Buscando usuarios y registrando tiempo..."
+                "❌ Error al crear la tarea daily en Redmine."
             )
+            return
 
-            # Format duration for display
-            total_minutes = int(duration_delta.total_seconds() / 60)
-            if total_minutes >= 60:
-                hours = total_minutes // 60
-                minutes = total_minutes % 60
-                duration_text = f"{hours}h {minutes}min" if minutes > 0 else f"{hours}h"
-            else:
-                duration_text = f"{total_minutes} min"
+        await loading_message.edit_text("🔄 Buscando usuarios y registrando tiempo...")
+
+        # Format duration for display
+        hours, minutes = divmod(int(duration_delta.total_seconds() // 60), 60)
+        duration_text = (
+            f"{hours}h {minutes}min"
+            if hours and minutes
+            else (f"{hours}h" if hours else f"{minutes} min")
+        )
 
-            # Find users by username and collect results
-            found_users = []
-            not_found_users = []
-            users_without_token = []
-            successful_logs = []
-            failed_logs = []
+        # One status per participant; users missing or without a token were
+        # already sorted out while the session was open
+        results = daily.results
+        users_to_log = daily.users_to_log
+
+        # Log the actual daily duration for every participant concurrently;
+        # the activity is resolved once for all of them, and the entries go
+        # on the same day as the task even if the command runs past midnight
+        time_entries = await redmine_service.log_daily_bulk(
+            daily_task["id"],
+            daily_duration_hours,
+            [user_token for _, user_token in users_to_log],
+            spent_on=now.date(),
+        )
 
-            for username in mentioned_usernames:
-                db_user = UserService.get_by_username(db, username)
+        for (username, _), time_entry in zip(users_to_log, time_entries):
+            if time_entry:
+                results[username] = ParticipantStatus.LOGGED
+            else:
+                results[username] = ParticipantStatus.FAILED
+
+        successful_logs, users_without_token, failed_logs, not_found_users = (
+            [name for name, status in results.items() if status is wanted]
+            for wanted in (
+                ParticipantStatus.LOGGED,
+                ParticipantStatus.NO_TOKEN,
+                ParticipantStatus.FAILED,
+                ParticipantStatus.NOT_FOUND,
+            )
+        )
 
-                if not db_user:
-                    not_found_users.append(username)
-                    continue
+        # Mark the daily as registered in Redmine, in a session of its own
+        with DatabaseSession() as db:
+            DailyService.mark_registered_in_redmine(db, daily.daily_id)
 
-                found_users.append((username, db_user))
+        await redmine_service.update_issue_status(daily_task["id"], "IN PROGRESS")
 
-                if not db_user.has_redmine_token():
-                    users_without_token.append(username)
-                    continue
+        if not (users_without_token or failed_logs or not_found_users):
+            await redmine_service.update_issue_status(daily_task["id"], "DONE")
 
-                # Try to log time for this user
-                user_token = db_user.get_redmine_token()
-                if not user_token:
-                    users_without_token.append(username)
-                    continue
+        # Escape every name once, however many sections it appears in
+        escaped = {name: escape_markdown(name) for name in results}
+        escaped_duration = escape_markdown(duration_text)
+        escaped_registrar = escape_markdown(
+            str(user.first_name or user.username or "Usuario")
+        )
 
-                user_redmine_service = RedmineService(user_token)
+        # Prepare response message, one write per line into a single buffer
+        response = io.StringIO()
+        response.write(
+            "✅ **Daily registrada exitosamente**\n\n"
+            f"🔗 **Enlace:** {get_settings().redmine_url}/issues/{daily_task['id']}\n\n"
+        )
 
-                # Log the actual daily duration for each participant
-                time_entry = user_redmine_service.log_daily(
-                    daily_task["id"], daily_duration_hours
+        if successful_logs:
+            response.write("✅ **Tiempo registrado para:**\n")
+            for username in successful_logs:
+                response.write(f"   • @{escaped[username]} ({escaped_duration})\n")
+            response.write("\n")
+
+        if users_without_token:
+            response.write("⚠️ **Usuarios sin token configurado:**\n")
+            for username in users_without_token:
+                response.write(
+                    f"   • @{escaped[username]} (debe registrar manualmente)\n"
                 )
+            response.write("\n")
 
-                if time_entry:
-                    successful_logs.append(username)
-                else:
-                    failed_logs.append(username)
-
-            # Mark the daily as registered in Redmine
-            DailyService.mark_registered_in_redmine(db, latest_daily.id)  # type: ignore
-
-            # Prepare response message
-            response_parts = [
-                f"✅ **Daily registrada exitosamente**",
-                f"",
-                f"🔗 **Enlace:** {settings.redmine_url}/issues/{daily_task['id']}",
-                f"",
-            ]
-
-            if successful_logs:
-                response_parts.append(f"✅ **Tiempo registrado para:**")
-                for username in successful_logs:
-                    response_parts.append(
-                        f"   • @{escape_markdown(username)} ({escape_markdown(duration_text)})"
-                    )
-                response_parts.append("")
-
-            redmine_service.update_issue_status(
-                issue_id=daily_task["id"], status_name="IN PROGRESS"
-            )
+        if failed_logs:
+            response.write("❌ **Error registrando tiempo para:**\n")
+            for username in failed_logs:
+                response.write(f"   • @{escaped[username]}\n")
+            response.write("\n")
 
-            if users_without_token:
-                response_parts.append(f"⚠️ **Usuarios sin token configurado:**")
-                for username in users_without_token:
-                    response_parts.append(
-                        f"   • @{escape_markdown(username)} (debe registrar manualmente)"
-                    )
-                response_parts.append("")
-
-            if failed_logs:
-                response_parts.append(f"❌ **Error registrando tiempo para:**")
-                for username in failed_logs:
-                    response_parts.append(f"   • @{escape_markdown(username)}")
-                response_parts.append("")
-
-            if not_found_users:
-                response_parts.append(f"❓ **Usuarios no registrados:**")
-                for username in not_found_users:
-                    response_parts.append(f"   • @{escape_markdown(username)}")
-                response_parts.append("")
-
-            if not (users_without_token or failed_logs or not_found_users):
-                redmine_service.update_issue_status(
-                    issue_id=daily_task["id"], status_name="DONE"
-                )
+        if not_found_users:
+            response.write("❓ **Usuarios no registrados:**\n")
+            for username in not_found_users:
+                response.write(f"   • @{escaped[username]}\n")
+            response.write("\n")
 
-            response_parts.append(
-                f"👤 **Registrado por:** {escape_markdown(str(user.first_name or user.username or 'Usuario'))}"
-            )
+        response.write(f"👤 **Registrado por:** {escaped_registrar}")
 
-            response_message = "\n".join(response_parts)
+        response_message = response.getvalue()
 
-            await loading_message.edit_text(response_message, parse_mode="Markdown")
+        await loading_message.edit_text(response_message, parse_mode="Markdown")
 
-            logger.info(
-                f"Daily command executed by user {user.id} ({user.username or 'Unknown'}) "
-                f"for group {group_id} with {len(mentioned_usernames)} participants. "
-                f"Task ID: {daily_task['id']}"
-            )
+        logger.info(
+            f"Daily command executed by user {user.id} ({user.username or 'Unknown'}) "
+            f"for group {group_id} with {len(mentioned_usernames)} participants. "
+            f"Task ID: {daily_task['id']}"
+        )
 
     except Exception as e:
         logger.error(f"Error processing daily command for user {user.id}: {e}")
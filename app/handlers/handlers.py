@@ -1,13 +1,47 @@
+import importlib
+
 from telegram.ext import Application
 
-from .start_handler import get_start_handler
-from .token_handler import get_token_handler
-from .projects_handler import get_projects_handler
-from .team_handler import get_team_handler
-from .teams_handler import get_teams_handler
-from .team_delete_handler import get_team_delete_handler
-from .videochat_handler import get_videochat_handlers
-from .daily_handler import get_daily_handler
+# Handler registrations in dispatch order: (module, factory, returns a list).
+# Modules are imported only when setup_handlers runs, so importing this
+# package (scripts, migrations) does not pull in Redmine or the database.
+_HANDLERS = [
+    # CORE COMMAND HANDLERS
+    # =====================
+    # /start - Welcome and help command (works in all chats)
+    ("start_handler", "get_start_handler", False),
+    # /token - Secure token configuration (private chats only)
+    ("token_handler", "get_token_handler", False),
+    # /projects - List user's Redmine projects (private chats only)
+    ("projects_handler", "get_projects_handler", False),
+    # TEAM MANAGEMENT HANDLERS
+    # ========================
+    # /team - Create team association between group and Redmine project (group admins only)
+    ("team_handler", "get_team_handler", False),
+    # /teams - List teams created by user (private chats only)
+    ("teams_handler", "get_teams_handler", False),
+    # /team_delete - Delete team association (group admins, creator only)
+    ("team_delete_handler", "get_team_delete_handler", False),
+    # DAILY MEETING HANDLERS
+    # ======================
+    # /daily - Register daily meeting and log time for participants (groups only)
+    ("daily_handler", "get_daily_handler", False),
+    # AUTOMATIC EVENT HANDLERS
+    # =========================
+    # Video chat event handlers (automatic tracking)
+    # - Detects when video chats start/end in configured groups
+    # - Creates daily records and tracks duration
+    # - Provides instructions for manual daily registration
+    ("videochat_handler", "get_videochat_handlers", True),
+    # Chat member updates keep the cached admin statuses used by /team current
+    ("chat_member_handler", "get_chat_member_handler", False),
+    # FUTURE HANDLERS (planned features)
+    # ==================================
+    # ("help_handler", "get_help_handler", False),  # Detailed help command
+    # ("tasks_handler", "get_tasks_handler", False),  # List Redmine tasks
+    # ("time_entries_handler", "get_time_entries_handler", False),  # View time entries
+    # ("settings_handler", "get_settings_handler", False),  # User settings management
+]
 
 
 def setup_handlers(app: Application) -> None:
@@ -43,49 +77,8 @@ def setup_handlers(app: Application) -> None:
         app: Telegram application instance
     """
 
-    # CORE COMMAND HANDLERS
-    # =====================
-
-    # /start - Welcome and help command (works in all chats)
-    app.add_handler(get_start_handler())
-
-    # /token - Secure token configuration (private chats only)
-    app.add_handler(get_token_handler())
-
-    # /projects - List user's Redmine projects (private chats only)
-    app.add_handler(get_projects_handler())
-
-    # TEAM MANAGEMENT HANDLERS
-    # ========================
-
-    # /team - Create team association between group and Redmine project (group admins only)
-    app.add_handler(get_team_handler())
-
-    # /teams - List teams created by user (private chats only)
-    app.add_handler(get_teams_handler())
-
-    # /team_delete - Delete team association (group admins, creator only)
-    app.add_handler(get_team_delete_handler())
-
-    # DAILY MEETING HANDLERS
-    # ======================
-
-    # /daily - Register daily meeting and log time for participants (groups only)
-    app.add_handler(get_daily_handler())
-
-    # AUTOMATIC EVENT HANDLERS
-    # =========================
-
-    # Video chat event handlers (automatic tracking)
-    # - Detects when video chats start/end in configured groups
-    # - Creates daily records and tracks duration
-    # - Provides instructions for manual daily registration
-    for handler in get_videochat_handlers():
-        app.add_handler(handler)
-
-    # FUTURE HANDLERS (planned features)
-    # ==================================
-    # app.add_handler(get_help_handler())           # Detailed help command
-    # app.add_handler(get_tasks_handler())          # List Redmine tasks
-    # app.add_handler(get_time_entries_handler())   # View time entries
-    # app.add_handler(get_settings_handler())       # User settings management
+    for module_name, factory_name, is_multi in _HANDLERS:
+        module = importlib.import_module(f"{__package__}.{module_name}")
+        factory = getattr(module, factory_name)
+        for handler in factory() if is_multi else [factory()]:
+            app.add_handler(handler)
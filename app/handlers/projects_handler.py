@@ -5,51 +5,11 @@ from telegram.constants import ChatType
 
 from app.database.database import DatabaseSession
 from app.database.services import UserService
-from app.services.redmine_service import RedmineService
+from app.services.redmine_service import AsyncRedmineService, RedmineAuthError
 
 logger = logging.getLogger(__name__)
 
 
-def escape_markdown(text: str) -> str:
-    """
-    Escape special characters for Markdown formatting
-
-    Args:
-        text (str): Text to escape
-
-    Returns:
-        str: Escaped text safe for Markdown
-    """
-    if not text:
-        return ""
-
-    # Escape special Markdown characters
-    special_chars = [
-        "_",
-        "*",
-        "[",
-        "]",
-        "(",
-        ")",
-        "~",
-        "`",
-        ">",
-        "#",
-        "+",
-        "-",
-        "=",
-        "|",
-        "{",
-        "}",
-        ".",
-        "!",
-    ]
-    escaped_text = text
-    for char in special_chars:
-        escaped_text = escaped_text.replace(char, f"\\{char}")
-    return escaped_text
-
-
 async def projects_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Handler for the /projects command
@@ -94,19 +54,20 @@ async def projects_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         # Send "loading" message
         loading_message = await update.message.reply_text("🔄 Loading your projects...")
 
-        # Connect to Redmine and get projects
-        redmine_service = RedmineService(redmine_token)
+        # Connect to Redmine and get projects; the blocking HTTP calls run in
+        # a worker thread so the event loop stays free
+        redmine_service = AsyncRedmineService.for_token(redmine_token)
 
-        # Test connection first
-        if not redmine_service.test_connection():
+        # Get projects; a rejected token surfaces here, so no separate
+        # connection test is needed
+        try:
+            projects = await redmine_service.get_projects()
+        except RedmineAuthError:
             await loading_message.edit_text(
                 "❌ Failed to connect to Redmine. Please check your token and try again."
             )
             return
 
-        # Get projects
-        projects = redmine_service.get_projects()
-
         if not projects:
             await loading_message.edit_text(
                 "📋 No projects found or you don't have access to any projects."
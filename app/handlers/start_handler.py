@@ -5,23 +5,10 @@ from telegram.ext import ContextTypes, CommandHandler
 
 logger = logging.getLogger(__name__)
 
+# Welcome text built once; only the user's name varies per call
+_WELCOME_TEMPLATE = """🤖 **Redmine Bot - Integración Telegram & Redmine**
 
-async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """
-    Handler for the /start command
-    Sends a welcome message to the user
-    """
-    if not update.effective_user or not update.message:
-        return
-
-    user = update.effective_user
-    logger.info(
-        f"User {user.id} ({user.username or 'Unknown'}) executed /start command"
-    )
-
-    welcome_message = f"""🤖 **Redmine Bot - Integración Telegram & Redmine**
-
-¡Hola {user.first_name or 'there'}! 👋
+¡Hola {name}! 👋
 
 Este bot te ayuda a integrar tus grupos de Telegram con proyectos de Redmine, facilitando la gestión de dailies y el registro automático de tiempo.
 
@@ -55,6 +42,22 @@ Este bot te ayuda a integrar tus grupos de Telegram con proyectos de Redmine, fa
 
 ¿Necesitas ayuda? Usa los comandos para empezar 🚀"""
 
+
+async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Handler for the /start command
+    Sends a welcome message to the user
+    """
+    if not update.effective_user or not update.message:
+        return
+
+    user = update.effective_user
+    logger.info(
+        f"User {user.id} ({user.username or 'Unknown'}) executed /start command"
+    )
+
+    welcome_message = _WELCOME_TEMPLATE.format(name=user.first_name or "there")
+
     await update.message.reply_text(welcome_message, parse_mode="Markdown")
 
 
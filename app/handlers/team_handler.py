@@ -1,14 +1,36 @@
 import logging
+from typing import Final
 from telegram import Update
 from telegram.ext import ContextTypes, CommandHandler
 from telegram.constants import ChatType
 
 from app.database.database import DatabaseSession
 from app.database.services import UserService, TeamService
-from app.services.redmine_service import RedmineService
+from app.handlers.chat_member_handler import is_group_admin
+from app.services.redmine_service import AsyncRedmineService, RedmineAuthError
 
 logger = logging.getLogger(__name__)
 
+# Static replies, built once at import
+_USAGE_TEAM: Final = (
+    "❌ Please provide project ID and project name.\n\n"
+    "Usage: `/team PROJECT_ID PROJECT_NAME`\n\n"
+    "Example: `/team 123 My Project Name`"
+)
+_INVALID_PROJECT_ID: Final = (
+    "❌ Project ID must be a number.\n\nUsage: `/team PROJECT_ID PROJECT_NAME`"
+)
+_EMPTY_PROJECT_NAME: Final = (
+    "❌ Project name cannot be empty.\n\nUsage: `/team PROJECT_ID PROJECT_NAME`"
+)
+_TOKEN_REQUIRED: Final = (
+    "❌ You need to configure your Redmine token first.\n\n"
+    "Use `/token YOUR_REDMINE_TOKEN` in a private chat to set up your token."
+)
+_UNEXPECTED_ERROR: Final = (
+    "❌ An error occurred while creating the team. Please try again later."
+)
+
 
 async def team_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
@@ -33,14 +55,15 @@ async def team_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
     # Check if user is admin of the group
     try:
-        chat_member = await context.bot.get_chat_member(update.message.chat.id, user.id)
-        if chat_member.status not in ["administrator", "creator"]:
+        if not await is_group_admin(
+            context.bot, update.message.chat.id, user.id, context.chat_data
+        ):
             await update.message.reply_text(
                 "❌ Only group administrators can create team associations."
             )
             return
     except Exception as e:
-        logger.error(f"Error checking admin status for user {user.id}: {e}")
+        logger.error("Error checking admin status for user %s: %s", user.id, e)
         await update.message.reply_text(
             "❌ Unable to verify your admin status. Please try again."
         )
@@ -48,94 +71,71 @@ async def team_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
     # Check if required arguments were provided
     if len(args) < 2:
-        await update.message.reply_text(
-            "❌ Please provide project ID and project name.\n\n"
-            "Usage: `/team PROJECT_ID PROJECT_NAME`\n\n"
-            "Example: `/team 123 My Project Name`",
-            parse_mode="Markdown",
-        )
+        await update.message.reply_text(_USAGE_TEAM, parse_mode="Markdown")
         return
 
     try:
         project_id = int(args[0])
     except ValueError:
-        await update.message.reply_text(
-            "❌ Project ID must be a number.\n\n"
-            "Usage: `/team PROJECT_ID PROJECT_NAME`",
-            parse_mode="Markdown",
-        )
+        await update.message.reply_text(_INVALID_PROJECT_ID, parse_mode="Markdown")
         return
 
     # Join remaining arguments as project name
     project_name = " ".join(args[1:])
 
     if not project_name.strip():
-        await update.message.reply_text(
-            "❌ Project name cannot be empty.\n\n"
-            "Usage: `/team PROJECT_ID PROJECT_NAME`",
-            parse_mode="Markdown",
-        )
+        await update.message.reply_text(_EMPTY_PROJECT_NAME, parse_mode="Markdown")
         return
 
     try:
-        # Check if user has a Redmine token
+        # Check if user has a Redmine token; the session is closed before any
+        # Telegram or Redmine round-trip so it never holds a pooled connection
         with DatabaseSession() as db:
             db_user = UserService.get_by_telegram_id(db, user.id)
 
-            if not db_user or not db_user.has_redmine_token():
-                await update.message.reply_text(
-                    "❌ You need to configure your Redmine token first.\n\n"
-                    "Use `/token YOUR_REDMINE_TOKEN` in a private chat to set up your token.",
-                    parse_mode="Markdown",
-                )
-                return
-
-            # Get decrypted token
-            redmine_token = db_user.get_redmine_token()
-            if not redmine_token:
-                await update.message.reply_text(
-                    "❌ Error retrieving your Redmine token. Please set it up again with `/token`.",
-                    parse_mode="Markdown",
-                )
-                return
+        if not db_user or not db_user.has_redmine_token():
+            await update.message.reply_text(_TOKEN_REQUIRED, parse_mode="Markdown")
+            return
+
+        # Get decrypted token
+        redmine_token = db_user.get_redmine_token()
+        if not redmine_token:
+            await update.message.reply_text(
+                "❌ Error retrieving your Redmine token. Please set it up again with `/token`.",
+                parse_mode="Markdown",
+            )
+            return
 
         # Send "loading" message
         loading_message = await update.message.reply_text("🔄 Validating project...")
 
-        # Validate project exists in Redmine
-        redmine_service = RedmineService(redmine_token)
+        # Validate project exists in Redmine. The blocking HTTP call runs in a
+        # worker thread, and a rejected token surfaces from the lookup itself,
+        # so no separate connection test is needed
+        redmine_service = AsyncRedmineService.for_token(redmine_token)
 
-        if not redmine_service.test_connection():
+        try:
+            project_data = await redmine_service.get_project_by_id(project_id)
+        except RedmineAuthError:
             await loading_message.edit_text(
                 "❌ Failed to connect to Redmine. Please check your token."
             )
             return
 
-        # Get project details from Redmine
-        project_data = redmine_service.get_project_by_id(project_id)
         if not project_data:
             await loading_message.edit_text(
                 f"❌ Project with ID {project_id} not found or you don't have access to it."
             )
             return
 
-        # Check if group is already associated with a project
+        # Create the team association unless the group already has one; the
+        # check and the insert are one statement, so concurrent /team calls
+        # cannot both succeed. Report once the session is closed.
         group_id = update.message.chat.id
-        with DatabaseSession() as db:
-            existing_team = TeamService.get_by_telegram_group_id(db, group_id)
-
-            if existing_team:
-                await loading_message.edit_text(
-                    f"⚠️ This group is already associated with project:\n"
-                    f"🏗️ {existing_team.team_name}\n"
-                    f"🆔 Project ID: {existing_team.redmine_project_id}\n"
-                    f"🔗 Project Key: {existing_team.redmine_project_code}"
-                )
-                return
-
-            # Create new team association
-            try:
-                team = TeamService.create(
+        existing_team = None
+        try:
+            with DatabaseSession() as db:
+                team = TeamService.create_if_absent(
                     db=db,
                     telegram_group_id=group_id,
                     redmine_project_code=project_data["identifier"],
@@ -144,39 +144,55 @@ async def team_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
                     created_by_user_id=user.id,
                 )
 
-                await loading_message.edit_text(
-                    f"✅ Team successfully created!\n\n"
-                    f"🏗️ Team: {project_name}\n"
-                    f"🆔 Project ID: {project_id}\n"
-                    f"🔗 Project Key: {project_data['identifier']}\n"
-                    f"👤 Created by: {user.first_name or user.username or 'Unknown'}\n\n"
-                    f"This group is now linked to the Redmine project."
-                )
+                if not team:
+                    existing_team = TeamService.get_by_telegram_group_id(db, group_id)
+        except Exception as e:
+            logger.error("Error creating team: %s", e)
+            await loading_message.edit_text(
+                "❌ Error creating team association. This group might already be linked to a project."
+            )
+            return
 
-                logger.info(
-                    f"Team created by user {user.id} ({user.username or 'Unknown'}) "
-                    f"for group {group_id} with project {project_id}"
+        if not team:
+            if existing_team:
+                await loading_message.edit_text(
+                    f"⚠️ This group is already associated with project:\n"
+                    f"🏗️ {existing_team.team_name}\n"
+                    f"🆔 Project ID: {existing_team.redmine_project_id}\n"
+                    f"🔗 Project Key: {existing_team.redmine_project_code}"
                 )
-
-            except Exception as e:
-                logger.error(f"Error creating team: {e}")
+            else:
                 await loading_message.edit_text(
-                    "❌ Error creating team association. This group might already be linked to a project."
+                    "❌ Error creating team association. Please try again."
                 )
+            return
+
+        await loading_message.edit_text(
+            f"✅ Team successfully created!\n\n"
+            f"🏗️ Team: {project_name}\n"
+            f"🆔 Project ID: {project_id}\n"
+            f"🔗 Project Key: {project_data['identifier']}\n"
+            f"👤 Created by: {user.first_name or user.username or 'Unknown'}\n\n"
+            f"This group is now linked to the Redmine project."
+        )
+
+        logger.info(
+            "Team created by user %s (%s) for group %s with project %s",
+            user.id,
+            user.username or "Unknown",
+            group_id,
+            project_id,
+        )
 
     except Exception as e:
-        logger.error(f"Error processing team command for user {user.id}: {e}")
+        logger.error("Error processing team command for user %s: %s", user.id, e)
         try:
             if loading_message:
-                await loading_message.edit_text(
-                    "❌ An error occurred while creating the team. Please try again later."
-                )
+                await loading_message.edit_text(_UNEXPECTED_ERROR)
             else:
-                await update.message.reply_text(
-                    "❌ An error occurred while creating the team. Please try again later."
-                )
+                await update.message.reply_text(_UNEXPECTED_ERROR)
         except Exception as edit_error:
-            logger.error(f"Error editing message: {edit_error}")
+            logger.error("Error editing message: %s", edit_error)
 
 
 def get_team_handler():
@@ -1,4 +1,5 @@
 import logging
+from typing import Final
 from telegram import Update
 from telegram.ext import ContextTypes, CommandHandler
 from telegram.constants import ChatType
@@ -8,6 +9,15 @@ from app.database.services import TeamService
 
 logger = logging.getLogger(__name__)
 
+# Static replies, built once at import
+_NO_TEAMS: Final = (
+    "📋 You haven't created any teams yet.\n\n"
+    "Create a team by using `/team PROJECT_ID PROJECT_NAME` in a group chat."
+)
+_UNEXPECTED_ERROR: Final = (
+    "❌ An error occurred while retrieving your teams. Please try again later."
+)
+
 
 async def teams_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
@@ -34,51 +44,43 @@ async def teams_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 
         # Get teams created by the user and format the response
         with DatabaseSession() as db:
-            teams = TeamService.get_by_creator(db, user.id)
+            teams = TeamService.list_for_creator_summary(db, user.id)
 
             if not teams:
-                await loading_message.edit_text(
-                    "📋 You haven't created any teams yet.\n\n"
-                    "Create a team by using `/team PROJECT_ID PROJECT_NAME` in a group chat.",
-                    parse_mode="Markdown",
-                )
+                await loading_message.edit_text(_NO_TEAMS, parse_mode="Markdown")
                 return
 
-            # Format teams list within the session context
-            teams_text = "👥 Your Teams:\n\n"
-
-            for team in teams:
-                teams_text += f"🏗️ {team.team_name}\n"
-                teams_text += f"   🆔 Project ID: {team.redmine_project_id}\n"
-                teams_text += f"   🔗 Project Key: {team.redmine_project_code}\n"
-                teams_text += (
-                    f"   📅 Created: {team.created_at.strftime('%Y-%m-%d %H:%M')}\n\n"
-                )
+            # Format teams list within the session context, joined in one pass
+            parts = ["👥 Your Teams:\n\n"]
+            parts.extend(
+                f"🏗️ {team.team_name}\n"
+                f"   🆔 Project ID: {team.redmine_project_id}\n"
+                f"   🔗 Project Key: {team.redmine_project_code}\n"
+                f"   📅 Created: {team.created_at:%Y-%m-%d %H:%M}\n\n"
+                for team in teams
+            )
 
             # Add footer
-            teams_text += f"📊 Total: {len(teams)} teams"
+            parts.append(f"📊 Total: {len(teams)} teams")
+            teams_text = "".join(parts)
 
         # Update the loading message with results (outside session is fine for this)
         await loading_message.edit_text(teams_text)
 
-        logger.info(f"Teams list sent to user {user.id} ({user.username or 'Unknown'})")
+        logger.info(
+            "Teams list sent to user %s (%s)", user.id, user.username or "Unknown"
+        )
 
     except Exception as e:
-        logger.error(f"Error processing teams command for user {user.id}: {e}")
+        logger.error("Error processing teams command for user %s: %s", user.id, e)
         try:
             if loading_message:
-                await loading_message.edit_text(
-                    "❌ An error occurred while retrieving your teams. Please try again later."
-                )
+                await loading_message.edit_text(_UNEXPECTED_ERROR)
             else:
-                await update.message.reply_text(
-                    "❌ An error occurred while retrieving your teams. Please try again later."
-                )
+                await update.message.reply_text(_UNEXPECTED_ERROR)
         except Exception as edit_error:
-            logger.error(f"Error editing message: {edit_error}")
-            await update.message.reply_text(
-                "❌ An error occurred while retrieving your teams. Please try again later."
-            )
+            logger.error("Error editing message: %s", edit_error)
+            await update.message.reply_text(_UNEXPECTED_ERROR)
 
 
 def get_teams_handler():
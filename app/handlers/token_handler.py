@@ -1,7 +1,8 @@
+import asyncio
 import logging
-import os
 from pathlib import Path
-from telegram import Update
+from typing import Final, Optional
+from telegram import Message, Update
 from telegram.ext import ContextTypes, CommandHandler
 from telegram.constants import ChatType
 
@@ -10,6 +11,105 @@ from app.database.services import UserService
 
 logger = logging.getLogger(__name__)
 
+# Guide images live in <project root>/public/token
+_TOKEN_IMAGES_DIR = Path(__file__).resolve().parent.parent.parent / "public" / "token"
+
+# Static replies, built once at import
+_GUIDE_INTRO: Final = (
+    "🔐 *How to get your Redmine API Token*\n\n"
+    "Follow these steps to obtain your API token:"
+)
+_GUIDE_FINAL_STEP: Final = (
+    "📝 *Step 3:* Copy and send your token\n\n"
+    "Once you have your API token, send it using:\n"
+    "`/token YOUR_REDMINE_TOKEN`\n\n"
+    "⚠️ *Important:* Your token will be deleted immediately after processing for security."
+)
+_TOKEN_SAVED: Final = (
+    "✅ Your Redmine token has been saved successfully!\n\n"
+    "🔐 Your token is stored securely and encrypted.\n"
+    "🎉 You can now use all bot features!"
+)
+_TOKEN_UPDATED: Final = (
+    "✅ Your Redmine token has been updated successfully!\n\n"
+    "🔐 Your token is stored securely and encrypted."
+)
+
+# (image file, caption) for each illustrated step of the /token guide
+_GUIDE_STEPS = (
+    (
+        "1.png",
+        "📋 *Step 1:* Go to your Redmine profile\n"
+        "Click on '*My account*' in the top-right menu",
+    ),
+    (
+        "2.png",
+        "🔑 *Step 2:* Get your API access key\n"
+        "In the '*API access key*' section, click on '*show*' to reveal your token",
+    ),
+)
+
+
+def _read_guide_image(image_name: str) -> Optional[bytes]:
+    """
+    Read a guide image from disk, or None if it is missing
+    """
+    try:
+        return (_TOKEN_IMAGES_DIR / image_name).read_bytes()
+    except OSError as e:
+        logger.warning("Could not load guide image %s: %s", image_name, e)
+        return None
+
+
+# Image bytes read once at import, so /token without arguments does no disk I/O
+_GUIDE_IMAGES = {name: _read_guide_image(name) for name, _ in _GUIDE_STEPS}
+
+# Telegram file IDs of images already uploaded; resending by ID skips the upload
+_guide_file_ids: dict[str, str] = {}
+
+# Strong references to pending delete tasks so they are not garbage collected
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def _send_guide_image(update: Update, image_name: str, caption: str) -> None:
+    """
+    Send one guide image, by file ID once Telegram has stored it
+
+    Args:
+        update (Update): Incoming update to reply to
+        image_name (str): Image file name in the guide directory
+        caption (str): Markdown caption for the photo
+    """
+    photo = _guide_file_ids.get(image_name) or _GUIDE_IMAGES.get(image_name)
+    if photo is None:
+        return
+
+    try:
+        message = await update.message.reply_photo(
+            photo=photo, caption=caption, parse_mode="Markdown"
+        )
+        if message.photo:
+            _guide_file_ids[image_name] = message.photo[-1].file_id
+    except Exception as e:
+        # Upload the bytes again next time in case the file ID went stale
+        _guide_file_ids.pop(image_name, None)
+        logger.warning("Could not send guide image %s: %s", image_name, e)
+
+
+async def _safe_delete(message: Message, user_id: int) -> None:
+    """
+    Delete the message containing a token, logging instead of raising on failure
+
+    Args:
+        message (Message): Message to delete
+        user_id (int): Telegram ID of the sender, for logging
+    """
+    try:
+        await message.delete()
+        logger.info("Token message deleted for security (user: %s)", user_id)
+    except Exception as e:
+        logger.warning("Could not delete token message for user %s: %s", user_id, e)
+
 
 async def token_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
@@ -32,53 +132,19 @@ async def token_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 
     # Check if token was provided
     if not args:
-        # Get the project root directory dynamically (works on both Windows and Linux)
-        project_root = Path(__file__).resolve().parent.parent.parent
-        token_images_dir = project_root / "public" / "token"
-
         # Send guide with images on how to get the token
-        await update.message.reply_text(
-            "🔐 *How to get your Redmine API Token*\n\n"
-            "Follow these steps to obtain your API token:",
-            parse_mode="Markdown",
+        await update.message.reply_text(_GUIDE_INTRO, parse_mode="Markdown")
+
+        # The photos are independent uploads, so send them concurrently
+        await asyncio.gather(
+            *(
+                _send_guide_image(update, image_name, caption)
+                for image_name, caption in _GUIDE_STEPS
+            )
         )
 
-        # Send first image with instructions
-        try:
-            image1_path = token_images_dir / "1.png"
-
-            with open(image1_path, "rb") as photo1:
-                await update.message.reply_photo(
-                    photo=photo1,
-                    caption="📋 *Step 1:* Go to your Redmine profile\n"
-                    "Click on '*My account*' in the top-right menu",
-                    parse_mode="Markdown",
-                )
-        except Exception as e:
-            logger.warning(f"Could not send first guide image: {e}")
-
-        # Send second image with instructions
-        try:
-            image2_path = token_images_dir / "2.png"
-
-            with open(image2_path, "rb") as photo2:
-                await update.message.reply_photo(
-                    photo=photo2,
-                    caption="🔑 *Step 2:* Get your API access key\n"
-                    "In the '*API access key*' section, click on '*show*' to reveal your token",
-                    parse_mode="Markdown",
-                )
-        except Exception as e:
-            logger.warning(f"Could not send second guide image: {e}")
-
         # Send final instructions
-        await update.message.reply_text(
-            "📝 *Step 3:* Copy and send your token\n\n"
-            "Once you have your API token, send it using:\n"
-            "`/token YOUR_REDMINE_TOKEN`\n\n"
-            "⚠️ *Important:* Your token will be deleted immediately after processing for security.",
-            parse_mode="Markdown",
-        )
+        await update.message.reply_text(_GUIDE_FINAL_STEP, parse_mode="Markdown")
         return
 
     # Extract token from arguments
@@ -91,57 +157,40 @@ async def token_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         return
 
     try:
-        # Save or update user token in database
+        # Save or update user token and username in one upsert
         with DatabaseSession() as db:
-            # Check if user exists, create if not
-            existing_user = UserService.get_by_telegram_id(db, user.id)
-
-            if existing_user:
-                # Update existing user's token and username
-                updated_user = UserService.update_redmine_token(
-                    db, user.id, redmine_token, user.username
-                )
-                if updated_user:
-                    logger.info(
-                        f"Token updated for user {user.id} ({user.username or 'Unknown'})"
-                    )
-                    await update.message.reply_text(
-                        "✅ Your Redmine token has been updated successfully!\n\n"
-                        "🔐 Your token is stored securely and encrypted."
-                    )
-                else:
-                    await update.message.reply_text(
-                        "❌ Failed to update your token. Please try again."
-                    )
-            else:
-                # Create new user with token and username
-                new_user = UserService.create(db, user.id, user.username, redmine_token)
-                if new_user and new_user.has_redmine_token():
-                    logger.info(
-                        f"New user created with token: {user.id} ({user.username or 'Unknown'})"
-                    )
-                    await update.message.reply_text(
-                        "✅ Your Redmine token has been saved successfully!\n\n"
-                        "🔐 Your token is stored securely and encrypted.\n"
-                        "🎉 You can now use all bot features!"
-                    )
-                else:
-                    await update.message.reply_text(
-                        "❌ Failed to save your token. Please try again."
-                    )
+            saved_user, created = UserService.upsert_token(
+                db, user.id, redmine_token, user.username
+            )
+
+        if not saved_user:
+            await update.message.reply_text(
+                "❌ Failed to save your token. Please try again."
+            )
+        elif created:
+            logger.info(
+                "New user created with token: %s (%s)",
+                user.id,
+                user.username or "Unknown",
+            )
+            await update.message.reply_text(_TOKEN_SAVED)
+        else:
+            logger.info(
+                "Token updated for user %s (%s)", user.id, user.username or "Unknown"
+            )
+            await update.message.reply_text(_TOKEN_UPDATED)
 
     except Exception as e:
-        logger.error(f"Error processing token for user {user.id}: {e}")
+        logger.error("Error processing token for user %s: %s", user.id, e)
         await update.message.reply_text(
             "❌ An error occurred while processing your token. Please try again later."
         )
 
-    # Delete the message containing the token for security
-    try:
-        await update.message.delete()
-        logger.info(f"Token message deleted for security (user: {user.id})")
-    except Exception as e:
-        logger.warning(f"Could not delete token message for user {user.id}: {e}")
+    # Delete the message containing the token for security, without making
+    # the handler wait for Telegram's answer
+    task = asyncio.create_task(_safe_delete(update.message, user.id))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
 
 def get_token_handler():
@@ -2,21 +2,137 @@
 Redmine API service for interacting with Redmine server
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Optional
-from datetime import datetime
+import threading
+import time
+from typing import Callable, List, Dict, Optional, Tuple, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, Timeout
+from urllib3.util.retry import Retry
 from redminelib import Redmine
-from redminelib.exceptions import ResourceNotFoundError, AuthError
-from app.config import settings
+from redminelib.exceptions import ResourceNotFoundError, AuthError, ForbiddenError
+from app.config import get_settings
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+# Seconds to wait for the TCP/TLS connection and for each read from Redmine
+REDMINE_CONNECT_TIMEOUT = 5
+REDMINE_READ_TIMEOUT = 30
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that gives every request a default timeout
+
+    requests has no session-wide timeout and redminelib passes none, so
+    without this a hung Redmine would block the calling thread forever.
+    """
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = (REDMINE_CONNECT_TIMEOUT, REDMINE_READ_TIMEOUT)
+        return super().send(request, **kwargs)
+
+
+# One adapter, and with it one set of urllib3 connection pools, for every
+# RedmineService. redminelib keeps the API key on each session's headers, so
+# the sessions stay per token while their TCP/TLS connections are shared.
+# The adapter only retries gateway errors from a proxy in front of Redmine,
+# and only for idempotent requests, so time entries are never doubled. Timeouts
+# and dropped connections are left to _with_retries, so a lookup is not retried
+# at both layers.
+_HTTP_ADAPTER = _TimeoutHTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=3,
+        connect=0,
+        read=0,
+        other=0,
+        status=3,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+    ),
+)
+
+# Network failures worth another attempt; AuthError and other API errors are
+# final and fail on the first try
+_TRANSIENT_ERRORS = (Timeout, ConnectionError)
+
+# Attempts and base delay (doubled after each failure) for _with_retries
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.3
+
+
+def _with_retries(call: Callable[[], T]) -> T:
+    """
+    Run an idempotent Redmine request, retrying timeouts and dropped connections
+
+    Only used for idempotent calls: a POST that timed out may still have been
+    applied, so issue and time entry creation are never retried here.
+
+    Args:
+        call (Callable[[], T]): Performs the request and materializes the result
+
+    Returns:
+        T: Result of the call
+
+    Raises:
+        Timeout, ConnectionError: If every attempt failed
+    """
+    for attempt in range(RETRY_ATTEMPTS):
+        try:
+            return call()
+        except _TRANSIENT_ERRORS as e:
+            if attempt == RETRY_ATTEMPTS - 1:
+                raise
+            delay = RETRY_BACKOFF * 2**attempt
+            logger.warning(f"Redmine request failed ({e}), retrying in {delay}s")
+            time.sleep(delay)
+
+
+class RedmineAuthError(Exception):
+    """
+    Raised when Redmine rejects the API token (HTTP 401/403)
+    """
+
 
 class RedmineService:
     """
     Service class for Redmine API operations
     """
 
+    # Successful connection tests, keyed by a hash of the token
+    _connection_cache = TTLCache(ttl=60)
+
+    # Projects found by get_project_by_id, keyed by (token hash, project ID)
+    _project_cache = TTLCache(ttl=3600)
+
+    # Near-static enumerations (activities, trackers, statuses), keyed by
+    # (kind, token hash); each entry is (items, ID by lower-cased name)
+    _lookup_cache = TTLCache(ttl=3600)
+
+    # Workers for log_daily_bulk; each entry is created through the service
+    # for its own token, so different tokens never share a redminelib client
+    _log_executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="redmine-log")
+
+    # Default daily activity ("Meeting" or the first one), resolved once per
+    # process; activities are defined per Redmine deployment, not per user
+    _default_activity_id: Optional[int] = None
+
+    # Instances by token hash, kept for 30 minutes so commands across requests
+    # share one HTTP session (and its keep-alive connections) per token
+    _pool = TTLCache(ttl=1800)
+    _pool_lock = threading.Lock()
+
     def __init__(self, api_token: str):
         """
         Initialize Redmine service with API token
@@ -25,21 +141,105 @@ class RedmineService:
             api_token (str): User's Redmine API token
         """
         self.api_token = api_token
-        self.redmine = Redmine(settings.redmine_url, key=api_token)
+        self._token_key = self._hash_token(api_token)
+        # Redmine user the token belongs to, once known
+        self._user_id: Optional[int] = None
+        self.redmine = Redmine(get_settings().redmine_url, key=api_token)
+
+        # Share the process-wide connection pools instead of opening new
+        # connections for every token
+        self.redmine.engine.session.mount("https://", _HTTP_ADAPTER)
+        self.redmine.engine.session.mount("http://", _HTTP_ADAPTER)
+
+    @staticmethod
+    def _hash_token(api_token: str) -> str:
+        return hashlib.blake2b(api_token.encode(), digest_size=16).hexdigest()
+
+    @classmethod
+    def for_token(cls, api_token: str) -> "RedmineService":
+        """
+        Get the service for a token, reusing a recent instance when there is one
+
+        Reusing the instance keeps its requests session, and with it the
+        keep-alive connections to Redmine, instead of paying a new TCP and TLS
+        handshake on every command.
+
+        Args:
+            api_token (str): User's Redmine API token
+
+        Returns:
+            RedmineService: Service bound to the token
+        """
+        key = cls._hash_token(api_token)
+        with cls._pool_lock:
+            service = cls._pool.get(key)
+            if service is None:
+                service = cls(api_token)
+                cls._pool.set(key, service)
+            return service
+
+    @staticmethod
+    def _project_to_dict(project) -> Dict:
+        return {
+            "id": project.id,
+            "name": project.name,
+            "identifier": project.identifier,
+            "description": getattr(project, "description", ""),
+            "status": getattr(project, "status", 1),
+        }
+
+    def _get_lookup(
+        self, kind: str, fetch: Callable[[], List[Dict]]
+    ) -> Tuple[Tuple[Dict, ...], Dict[str, int]]:
+        """
+        Get an enumeration from the cache, fetching it from Redmine on a miss
+
+        Empty results (including failed fetches) are never cached.
+
+        Args:
+            kind (str): Enumeration name, part of the cache key
+            fetch (Callable[[], List[Dict]]): Fetches the items from Redmine
+
+        Returns:
+            Tuple[Tuple[Dict, ...], Dict[str, int]]: Items, and their IDs by
+            lower-cased name (first item wins on duplicate names)
+        """
+        cache_key = (kind, self._token_key)
+        cached = self._lookup_cache.get(cache_key)
+        if cached is None:
+            items = fetch()
+            if not items:
+                return (), {}
+            ids_by_name = {}
+            for item in items:
+                ids_by_name.setdefault(item["name"].lower(), item["id"])
+            cached = (tuple(items), ids_by_name)
+            self._lookup_cache.set(cache_key, cached)
+        return cached
 
     def test_connection(self) -> bool:
         """
         Test connection to Redmine API
 
+        A successful result is reused for 60 seconds per token, so repeated
+        commands skip the extra HTTP round-trip. Failures are never cached.
+
         Returns:
             bool: True if connection is successful, False otherwise
         """
+        if self._connection_cache.get(self._token_key):
+            return True
         try:
             # Try to get current user info to test authentication
-            user = self.redmine.auth()
+            user = _with_retries(self.redmine.auth)
             logger.info(f"Connection test successful for user: {user.login}")
+            self._user_id = user.id
+            self._connection_cache.set(self._token_key, True)
             return True
-        except (AuthError, Exception) as e:
+        except AuthError:
+            logger.error("Connection test failed: Redmine rejected the token")
+            return False
+        except Exception as e:
             logger.error(f"Connection test failed: {e}")
             return False
 
@@ -49,29 +249,59 @@ class RedmineService:
 
         Returns:
             List[Dict]: List of projects with id, name, and identifier
+
+        Raises:
+            RedmineAuthError: If Redmine rejects the token
         """
         try:
-            projects = []
-            redmine_projects = self.redmine.project.all()
-
-            for project in redmine_projects:
-                projects.append(
-                    {
-                        "id": project.id,
-                        "name": project.name,
-                        "identifier": project.identifier,
-                        "description": getattr(project, "description", ""),
-                        "status": getattr(project, "status", 1),
-                    }
-                )
+            redmine_projects = _with_retries(lambda: list(self.redmine.project.all()))
+            projects = [self._project_to_dict(project) for project in redmine_projects]
 
             logger.info(f"Retrieved {len(projects)} projects")
             return projects
 
-        except (AuthError, Exception) as e:
+        except AuthError as e:
+            raise RedmineAuthError(str(e)) from e
+        except Exception as e:
             logger.error(f"Error retrieving projects: {e}")
             return []
 
+    def get_projects_page(self, limit: int, offset: int = 0) -> Tuple[List[Dict], int]:
+        """
+        Get one page of the projects accessible to the user
+
+        Only the requested page is transferred; the total comes from the
+        total_count Redmine reports with it.
+
+        Args:
+            limit (int): Maximum number of projects to return
+            offset (int, optional): Number of projects to skip
+
+        Returns:
+            Tuple[List[Dict], int]: Projects in the page, and how many projects
+            the user can access in total
+
+        Raises:
+            RedmineAuthError: If Redmine rejects the token
+        """
+
+        def fetch():
+            resource_set = self.redmine.project.all(limit=limit, offset=offset)
+            return list(resource_set), resource_set.total_count
+
+        try:
+            redmine_projects, total_count = _with_retries(fetch)
+            projects = [self._project_to_dict(project) for project in redmine_projects]
+
+            logger.info(f"Retrieved {len(projects)} of {total_count} projects")
+            return projects, total_count
+
+        except AuthError as e:
+            raise RedmineAuthError(str(e)) from e
+        except Exception as e:
+            logger.error(f"Error retrieving projects: {e}")
+            return [], 0
+
     def get_project_by_id(self, project_id: int) -> Optional[Dict]:
         """
         Get specific project by ID
@@ -79,19 +309,35 @@ class RedmineService:
         Args:
             project_id (int): Project ID
 
+        Found projects are cached for an hour per token, so repeated lookups
+        skip the HTTP request. Misses and errors are never cached.
+
         Returns:
             Optional[Dict]: Project data or None if not found
+
+        Raises:
+            RedmineAuthError: If Redmine rejects the token
         """
+        cache_key = (self._token_key, project_id)
+        cached = self._project_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
         try:
-            project = self.redmine.project.get(project_id)
-            return {
-                "id": project.id,
-                "name": project.name,
-                "identifier": project.identifier,
-                "description": getattr(project, "description", ""),
-                "status": getattr(project, "status", 1),
-            }
-        except (ResourceNotFoundError, AuthError, Exception) as e:
+            project = _with_retries(lambda: self.redmine.project.get(project_id))
+            project_data = self._project_to_dict(project)
+            self._project_cache.set(cache_key, project_data)
+            return dict(project_data)
+        except ForbiddenError as e:
+            # Valid token without access to this project
+            logger.error(f"Error retrieving project {project_id}: {e}")
+            return None
+        except AuthError as e:
+            raise RedmineAuthError(str(e)) from e
+        except ResourceNotFoundError:
+            logger.error(f"Project {project_id} not found")
+            return None
+        except Exception as e:
             logger.error(f"Error retrieving project {project_id}: {e}")
             return None
 
@@ -106,15 +352,12 @@ class RedmineService:
             Optional[Dict]: Project data or None if not found
         """
         try:
-            project = self.redmine.project.get(identifier)
-            return {
-                "id": project.id,
-                "name": project.name,
-                "identifier": project.identifier,
-                "description": getattr(project, "description", ""),
-                "status": getattr(project, "status", 1),
-            }
-        except (ResourceNotFoundError, AuthError, Exception) as e:
+            project = _with_retries(lambda: self.redmine.project.get(identifier))
+            return self._project_to_dict(project)
+        except ResourceNotFoundError:
+            logger.error(f"Project {identifier} not found")
+            return None
+        except Exception as e:
             logger.error(f"Error retrieving project {identifier}: {e}")
             return None
 
@@ -122,14 +365,22 @@ class RedmineService:
         """
         Get current authenticated user ID
 
+        The ID is fetched once and then kept for the lifetime of the service.
+
         Returns:
             Optional[int]: Current user ID or None if failed
         """
+        if self._user_id is not None:
+            return self._user_id
         try:
-            user = self.redmine.auth()
+            user = _with_retries(self.redmine.auth)
             logger.info(f"Retrieved current user ID: {user.id}")
+            self._user_id = user.id
             return user.id
-        except (AuthError, Exception) as e:
+        except AuthError:
+            logger.error("Error getting current user ID: Redmine rejected the token")
+            return None
+        except Exception as e:
             logger.error(f"Error getting current user ID: {e}")
             return None
 
@@ -151,16 +402,22 @@ class RedmineService:
 
         Returns:
             Optional[Dict]: Created task data or None if failed
+
+        Raises:
+            RedmineAuthError: If Redmine rejects the token, so callers need no
+                separate test_connection round-trip
         """
         try:
             if daily_date is None:
                 daily_date = datetime.now()
 
-            # Get current user ID for assignment
-            current_user_id = self.get_current_user_id()
-            if current_user_id is None:
-                logger.error("Could not get current user ID for task assignment")
-                return None
+            # Get current user ID for assignment; the first call also
+            # authenticates, later ones reuse the ID and let a revoked token
+            # surface from the issue creation instead
+            if self._user_id is None:
+                self._user_id = _with_retries(self.redmine.auth).id
+                self._connection_cache.set(self._token_key, True)
+            current_user_id = self._user_id
 
             # Format date as DD-MM-YYYY
             date_str = daily_date.strftime("%d-%m-%Y")
@@ -198,12 +455,71 @@ class RedmineService:
                 "due_date": str(issue.due_date),
             }
 
-        except (ResourceNotFoundError, AuthError, Exception) as e:
+        except AuthError as e:
+            raise RedmineAuthError(str(e)) from e
+        except ResourceNotFoundError:
+            logger.error(f"Project {project_id} not found for team {team_name}")
+            return None
+        except Exception as e:
             logger.error(f"Error creating daily task for team {team_name}: {e}")
             return None
 
+    def resolve_activity_id(self, activity_name: Optional[str] = None) -> Optional[int]:
+        """
+        Resolve the activity used to log daily time
+
+        Args:
+            activity_name (str, optional): Name of the activity. If None or not
+                found, uses the "Meeting" activity or the first available one
+
+        The default is taken from the REDMINE_DEFAULT_ACTIVITY_ID setting when
+        set, and is otherwise looked up once and shared by every instance.
+
+        Returns:
+            Optional[int]: Activity ID or None if there are no activities
+        """
+        activity_id = None
+        if activity_name:
+            activity_id = self.get_activity_id_by_name(activity_name)
+            if activity_id is not None:
+                return activity_id
+
+        default_activity_id = (
+            get_settings().redmine_default_activity_id
+            or RedmineService._default_activity_id
+        )
+        if default_activity_id is not None:
+            return default_activity_id
+
+        # If no specific activity or not found, try to find "Meeting" or use first available
+        activities, _ = self._get_lookup("activities", self._fetch_activities)
+        if not activities:
+            logger.error("No activities available for time logging")
+            return None
+
+        # Try to find "Meeting" activity first
+        for activity in activities:
+            if "meeting" in activity["name"].lower():
+                activity_id = activity["id"]
+                break
+
+        # If no meeting activity found, use the first one
+        if activity_id is None:
+            activity_id = activities[0]["id"]
+            logger.info(
+                f"Using first available activity: {activities[0]['name']} (ID: {activity_id})"
+            )
+
+        RedmineService._default_activity_id = activity_id
+        return activity_id
+
     def log_daily(
-        self, issue_id: int, hours: float, activity_name: Optional[str] = None
+        self,
+        issue_id: int,
+        hours: float,
+        activity_name: Optional[str] = None,
+        activity_id: Optional[int] = None,
+        spent_on: Optional[date] = None,
     ) -> Optional[Dict]:
         """
         Log time entry for a daily task in Redmine
@@ -212,40 +528,22 @@ class RedmineService:
             issue_id (int): Issue ID to log time to
             hours (float): Hours to log
             activity_name (str, optional): Name of the activity. If None, uses first available activity
+            activity_id (int, optional): Already resolved activity ID; skips the lookup
+            spent_on (date, optional): Day to log the time on. If None, uses today
 
         Returns:
             Optional[Dict]: Created time entry data or None if failed
         """
         try:
-            # Get activity ID
-            activity_id = None
-            if activity_name:
-                activity_id = self.get_activity_id_by_name(activity_name)
-
-            # If no specific activity or not found, try to find "Meeting" or use first available
             if activity_id is None:
-                activities = self.get_activities()
-                if not activities:
-                    logger.error("No activities available for time logging")
-                    return None
-
-                # Try to find "Meeting" activity first
-                for activity in activities:
-                    if "meeting" in activity["name"].lower():
-                        activity_id = activity["id"]
-                        break
-
-                # If no meeting activity found, use the first one
+                activity_id = self.resolve_activity_id(activity_name)
                 if activity_id is None:
-                    activity_id = activities[0]["id"]
-                    logger.info(
-                        f"Using first available activity: {activities[0]['name']} (ID: {activity_id})"
-                    )
+                    return None
 
             # Create time entry
             time_entry = self.redmine.time_entry.create(
                 issue_id=issue_id,
-                spent_on=datetime.now().date(),
+                spent_on=spent_on or datetime.now().date(),
                 hours=hours,
                 comments="Daily",
                 activity_id=activity_id,
@@ -263,20 +561,69 @@ class RedmineService:
                 "activity_name": time_entry.activity.name,
             }
 
-        except (ResourceNotFoundError, AuthError, Exception) as e:
+        except Exception as e:
             logger.error(f"Error logging time for issue {issue_id}: {e}")
             return None
 
+    def log_daily_bulk(
+        self,
+        issue_id: int,
+        hours: float,
+        participant_tokens: List[str],
+        activity_name: Optional[str] = None,
+        spent_on: Optional[date] = None,
+    ) -> List[Optional[Dict]]:
+        """
+        Log the same daily time entry for several participants concurrently
+
+        The activity and the day are resolved once with this service's token,
+        then each participant's entry is created with their own token on the
+        shared worker pool.
+
+        Args:
+            issue_id (int): Issue ID to log time to
+            hours (float): Hours to log for each participant
+            participant_tokens (List[str]): Redmine API token of each participant
+            activity_name (str, optional): Name of the activity. If None, uses first available activity
+            spent_on (date, optional): Day to log the time on. If None, uses today
+
+        Returns:
+            List[Optional[Dict]]: Created time entry data (or None if failed)
+            for each token, in the same order
+        """
+        try:
+            activity_id = self.resolve_activity_id(activity_name)
+        except Exception as e:
+            logger.error(f"Error resolving activity for issue {issue_id}: {e}")
+            activity_id = None
+        if activity_id is None:
+            return [None] * len(participant_tokens)
+
+        if spent_on is None:
+            spent_on = datetime.now().date()
+        return list(
+            self._log_executor.map(
+                lambda token: RedmineService.for_token(token).log_daily(
+                    issue_id, hours, activity_id=activity_id, spent_on=spent_on
+                ),
+                participant_tokens,
+            )
+        )
+
     def get_trackers(self) -> List[Dict]:
         """
-        Get all available trackers
+        Get all available trackers, cached for an hour per token
 
         Returns:
             List[Dict]: List of trackers with id and name
         """
+        items, _ = self._get_lookup("trackers", self._fetch_trackers)
+        return [dict(item) for item in items]
+
+    def _fetch_trackers(self) -> List[Dict]:
         try:
             trackers = []
-            redmine_trackers = self.redmine.tracker.all()
+            redmine_trackers = _with_retries(lambda: list(self.redmine.tracker.all()))
 
             for tracker in redmine_trackers:
                 trackers.append({"id": tracker.id, "name": tracker.name})
@@ -284,7 +631,7 @@ class RedmineService:
             logger.info(f"Retrieved {len(trackers)} trackers")
             return trackers
 
-        except (AuthError, Exception) as e:
+        except Exception as e:
             logger.error(f"Error retrieving trackers: {e}")
             return []
 
@@ -299,10 +646,10 @@ class RedmineService:
             Optional[int]: Tracker ID or None if not found
         """
         try:
-            trackers = self.get_trackers()
-            for tracker in trackers:
-                if tracker["name"].lower() == tracker_name.lower():
-                    return tracker["id"]
+            _, ids_by_name = self._get_lookup("trackers", self._fetch_trackers)
+            tracker_id = ids_by_name.get(tracker_name.lower())
+            if tracker_id is not None:
+                return tracker_id
 
             logger.warning(f"Tracker '{tracker_name}' not found")
             return None
@@ -313,14 +660,20 @@ class RedmineService:
 
     def get_issue_statuses(self) -> List[Dict]:
         """
-        Get all available issue statuses
+        Get all available issue statuses, cached for an hour per token
 
         Returns:
             List[Dict]: List of statuses with id and name
         """
+        items, _ = self._get_lookup("statuses", self._fetch_issue_statuses)
+        return [dict(item) for item in items]
+
+    def _fetch_issue_statuses(self) -> List[Dict]:
         try:
             statuses = []
-            redmine_statuses = self.redmine.issue_status.all()
+            redmine_statuses = _with_retries(
+                lambda: list(self.redmine.issue_status.all())
+            )
 
             for status in redmine_statuses:
                 statuses.append({"id": status.id, "name": status.name})
@@ -328,7 +681,7 @@ class RedmineService:
             logger.info(f"Retrieved {len(statuses)} issue statuses")
             return statuses
 
-        except (AuthError, Exception) as e:
+        except Exception as e:
             logger.error(f"Error retrieving issue statuses: {e}")
             return []
 
@@ -343,10 +696,10 @@ class RedmineService:
             Optional[int]: Status ID or None if not found
         """
         try:
-            statuses = self.get_issue_statuses()
-            for status in statuses:
-                if status["name"].lower() == status_name.lower():
-                    return status["id"]
+            _, ids_by_name = self._get_lookup("statuses", self._fetch_issue_statuses)
+            status_id = ids_by_name.get(status_name.lower())
+            if status_id is not None:
+                return status_id
 
             logger.warning(f"Status '{status_name}' not found")
             return None
@@ -357,15 +710,21 @@ class RedmineService:
 
     def get_activities(self) -> List[Dict]:
         """
-        Get all available time entry activities
+        Get all available time entry activities, cached for an hour per token
 
         Returns:
             List[Dict]: List of activities with id and name
         """
+        items, _ = self._get_lookup("activities", self._fetch_activities)
+        return [dict(item) for item in items]
+
+    def _fetch_activities(self) -> List[Dict]:
         try:
             activities = []
-            redmine_activities = self.redmine.enumeration.filter(
-                resource="time_entry_activities"
+            redmine_activities = _with_retries(
+                lambda: list(
+                    self.redmine.enumeration.filter(resource="time_entry_activities")
+                )
             )
 
             for activity in redmine_activities:
@@ -374,7 +733,7 @@ class RedmineService:
             logger.info(f"Retrieved {len(activities)} time entry activities")
             return activities
 
-        except (AuthError, Exception) as e:
+        except Exception as e:
             logger.error(f"Error retrieving time entry activities: {e}")
             return []
 
@@ -389,10 +748,10 @@ class RedmineService:
             Optional[int]: Activity ID or None if not found
         """
         try:
-            activities = self.get_activities()
-            for activity in activities:
-                if activity["name"].lower() == activity_name.lower():
-                    return activity["id"]
+            _, ids_by_name = self._get_lookup("activities", self._fetch_activities)
+            activity_id = ids_by_name.get(activity_name.lower())
+            if activity_id is not None:
+                return activity_id
 
             logger.warning(f"Activity '{activity_name}' not found")
             return None
@@ -409,8 +768,13 @@ class RedmineService:
             issue_id (int): Issue ID to update
             status_name (str): Name of the status to set (e.g., 'IN PROGRESS', 'Closed', etc.)
 
+        The status is changed with a single PUT; Redmine answers it without a
+        body, so no GET is made before or after and the returned data only
+        holds what the update itself determines.
+
         Returns:
-            Optional[Dict]: Updated issue data or None if failed
+            Optional[Dict]: Issue ID, new status and local update time, or None
+            if failed
         """
         try:
             # Get the status ID by name
@@ -419,42 +783,185 @@ class RedmineService:
                 logger.error(f"Status '{status_name}' not found")
                 return None
 
-            # Get the current issue to verify it exists
+            # Update the issue status; a missing issue raises ResourceNotFoundError
             try:
-                issue = self.redmine.issue.get(issue_id)
+                # A PUT sets the same status again, so it is safe to retry
+                _with_retries(
+                    lambda: self.redmine.issue.update(issue_id, status_id=status_id)
+                )
             except ResourceNotFoundError:
                 logger.error(f"Issue with ID {issue_id} not found")
                 return None
 
-            # Update the issue status
-            issue.status_id = status_id
-            issue.save()
-
             logger.info(
                 f"Issue {issue_id} status updated to '{status_name}' (ID: {status_id})"
             )
 
-            # Return updated issue data
-            updated_issue = self.redmine.issue.get(issue_id)
             return {
-                "id": updated_issue.id,
-                "subject": updated_issue.subject,
-                "project_id": updated_issue.project.id,
-                "tracker_id": updated_issue.tracker.id,
-                "status_id": updated_issue.status.id,
-                "status_name": updated_issue.status.name,
-                "assigned_to_id": (
-                    updated_issue.assigned_to.id
-                    if hasattr(updated_issue, "assigned_to")
-                    else None
-                ),
-                "start_date": str(getattr(updated_issue, "start_date", "")),
-                "due_date": str(getattr(updated_issue, "due_date", "")),
-                "updated_on": str(updated_issue.updated_on),
+                "id": issue_id,
+                "status_id": status_id,
+                "status_name": status_name,
+                "updated_on": str(datetime.now()),
             }
 
-        except (ResourceNotFoundError, AuthError, Exception) as e:
+        except Exception as e:
             logger.error(
                 f"Error updating status for issue {issue_id} to '{status_name}': {e}"
             )
             return None
+
+
+class AsyncRedmineService:
+    """
+    Awaitable facade over RedmineService for the async handlers
+
+    redminelib is built on blocking requests calls, so every method runs the
+    synchronous call in a worker thread. The event loop stays free for other
+    chats while Redmine answers, and callers no longer need executor shims.
+    """
+
+    def __init__(self, service: RedmineService):
+        """
+        Wrap a synchronous Redmine service
+
+        Args:
+            service (RedmineService): Service whose calls are run off the loop
+        """
+        self.service = service
+
+    @classmethod
+    def for_token(cls, api_token: str) -> "AsyncRedmineService":
+        """
+        Get an async service for a token, sharing the pooled RedmineService
+
+        Args:
+            api_token (str): User's Redmine API token
+
+        Returns:
+            AsyncRedmineService: Service bound to the token
+        """
+        return cls(RedmineService.for_token(api_token))
+
+    async def test_connection(self) -> bool:
+        """
+        Test connection to Redmine API
+        """
+        return await asyncio.to_thread(self.service.test_connection)
+
+    async def get_projects(self) -> List[Dict]:
+        """
+        Get all projects accessible to the user
+
+        Raises:
+            RedmineAuthError: If Redmine rejects the token
+        """
+        return await asyncio.to_thread(self.service.get_projects)
+
+    async def get_projects_page(
+        self, limit: int, offset: int = 0
+    ) -> Tuple[List[Dict], int]:
+        """
+        Get one page of the projects accessible to the user, and their total
+
+        Raises:
+            RedmineAuthError: If Redmine rejects the token
+        """
+        return await asyncio.to_thread(self.service.get_projects_page, limit, offset)
+
+    async def get_project_by_id(self, project_id: int) -> Optional[Dict]:
+        """
+        Get specific project by ID
+
+        Raises:
+            RedmineAuthError: If Redmine rejects the token
+        """
+        return await asyncio.to_thread(self.service.get_project_by_id, project_id)
+
+    async def create_daily_task(
+        self,
+        project_id: int,
+        team_name: str,
+        daily_date: Optional[datetime] = None,
+        estimated_time: Optional[float] = None,
+    ) -> Optional[Dict]:
+        """
+        Create a daily task in Redmine
+
+        Raises:
+            RedmineAuthError: If Redmine rejects the token
+        """
+        return await asyncio.to_thread(
+            self.service.create_daily_task,
+            project_id,
+            team_name,
+            daily_date,
+            estimated_time,
+        )
+
+    async def log_daily(
+        self,
+        issue_id: int,
+        hours: float,
+        activity_name: Optional[str] = None,
+        activity_id: Optional[int] = None,
+        spent_on: Optional[date] = None,
+    ) -> Optional[Dict]:
+        """
+        Log time entry for a daily task in Redmine
+        """
+        return await asyncio.to_thread(
+            self.service.log_daily,
+            issue_id,
+            hours,
+            activity_name,
+            activity_id,
+            spent_on,
+        )
+
+    async def log_daily_bulk(
+        self,
+        issue_id: int,
+        hours: float,
+        participant_tokens: List[str],
+        activity_name: Optional[str] = None,
+        spent_on: Optional[date] = None,
+    ) -> List[Optional[Dict]]:
+        """
+        Log the same daily time entry for several participants concurrently
+        """
+        return await asyncio.to_thread(
+            self.service.log_daily_bulk,
+            issue_id,
+            hours,
+            participant_tokens,
+            activity_name,
+            spent_on,
+        )
+
+    async def get_trackers(self) -> List[Dict]:
+        """
+        Get all available trackers
+        """
+        return await asyncio.to_thread(self.service.get_trackers)
+
+    async def get_issue_statuses(self) -> List[Dict]:
+        """
+        Get all available issue statuses
+        """
+        return await asyncio.to_thread(self.service.get_issue_statuses)
+
+    async def get_activities(self) -> List[Dict]:
+        """
+        Get all available time entry activities
+        """
+        return await asyncio.to_thread(self.service.get_activities)
+
+    async def update_issue_status(
+        self, issue_id: int, status_name: str
+    ) -> Optional[Dict]:
+        """
+        Update the status of an issue in Redmine
+        """
+        return await asyncio.to_thread(
+            self.service.update_issue_status, issue_id, status_name
+        )
@@ -0,0 +1,48 @@
+import threading
+import time
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """
+    Small in-process cache whose entries expire after a fixed time.
+
+    The oldest entry is evicted once maxsize is reached. Safe to share between
+    the event loop and worker threads.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key, self._MISSING)
+        if entry is self._MISSING:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self.pop(key)
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
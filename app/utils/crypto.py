@@ -1,19 +1,84 @@
 import os
+import base64
+import hashlib
+from functools import lru_cache
 from dotenv import load_dotenv
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 
-load_dotenv()
+# Ciphertext layout: VERSION (1 byte) | nonce (12 bytes) | AES-GCM ciphertext + tag.
+# Legacy Fernet tokens always start with b"g" (base64 of the 0x80 version byte).
+AESGCM_VERSION = b"\x01"
+NONCE_SIZE = 12
+FINGERPRINT_SIZE = 16
 
 
 class CryptoManager:
     def __init__(self):
+        # The .env file is only parsed when the key is not already exported
+        if "ENCRYPTION_KEY" not in os.environ:
+            load_dotenv()
         key = os.getenv("ENCRYPTION_KEY")
         if not key:
             raise RuntimeError("⚠️ ENCRYPTION_KEY not found in .env")
+        # Kept to decrypt tokens stored before the switch to AES-GCM
         self.fernet = Fernet(key)
+        master_key = base64.urlsafe_b64decode(key)
+        # AES-256-GCM runs on AES-NI through OpenSSL; build it once so the
+        # key schedule is reused by every encrypt/decrypt call
+        self.aesgcm = AESGCM(self._derive_key(master_key, b"mine-bot redmine token"))
+        # Separate key for token fingerprints, so they reveal nothing about
+        # the encryption key and cannot be brute-forced without it
+        self._fingerprint_key = self._derive_key(
+            master_key, b"mine-bot token fingerprint"
+        )
+
+    @staticmethod
+    def _derive_key(master_key: bytes, info: bytes) -> bytes:
+        hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=info)
+        return hkdf.derive(master_key)
 
     def encrypt(self, data: str) -> bytes:
-        return self.fernet.encrypt(data.encode())
+        nonce = os.urandom(NONCE_SIZE)
+        return AESGCM_VERSION + nonce + self.aesgcm.encrypt(nonce, data.encode(), None)
+
+    def fingerprint(self, data: str) -> bytes:
+        # Keyed BLAKE2b digest: equal tokens give equal fingerprints, so a
+        # resubmitted token can be recognized without decrypting anything
+        return hashlib.blake2b(
+            data.encode(), digest_size=FINGERPRINT_SIZE, key=self._fingerprint_key
+        ).digest()
 
     def decrypt(self, token: bytes) -> str:
-        return self.fernet.decrypt(token).decode()
+        if token[:1] != AESGCM_VERSION:
+            return self.fernet.decrypt(token).decode()
+        nonce = token[1 : 1 + NONCE_SIZE]
+        return self.aesgcm.decrypt(nonce, token[1 + NONCE_SIZE :], None).decode()
+
+    def decrypt_many(self, tokens: list[bytes]) -> list[str]:
+        # Single pass reusing the same AESGCM context for every token
+        aead_decrypt = self.aesgcm.decrypt
+        plain = []
+        for token in tokens:
+            if token[:1] != AESGCM_VERSION:
+                plain.append(self.fernet.decrypt(token).decode())
+                continue
+            nonce = token[1 : 1 + NONCE_SIZE]
+            plain.append(aead_decrypt(nonce, token[1 + NONCE_SIZE :], None).decode())
+        return plain
+
+
+@lru_cache(maxsize=1)
+def get_crypto_manager() -> CryptoManager:
+    """
+    Returns the process-wide CryptoManager, built on first use.
+
+    The key is read and both ciphers are set up once; construct CryptoManager
+    directly only where a separate key is really needed.
+
+    Returns:
+        CryptoManager: Shared crypto manager instance
+    """
+    return CryptoManager()
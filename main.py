@@ -1,17 +1,30 @@
 import logging
+from telegram import Update
 from telegram.ext import ApplicationBuilder
-from app.config import settings
+from app.config import get_settings
 from app.handlers.handlers import setup_handlers
-from app.database.database import init_database, check_database_connection
+from app.database.database import (
+    DatabaseSession,
+    init_database,
+    check_database_connection,
+)
+from app.database.services import DailyService, UserService
+from app.handlers.videochat_handler import prime_active_dailies
 
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO
 )
 
+# Only the update types some handler consumes: commands and video chat status
+# updates arrive as messages, member changes as chat_member and changes of the
+# bot's own status as my_chat_member. Edited messages, channel posts, callback
+# queries, etc. are never sent by getUpdates.
+ALLOWED_UPDATES = [Update.MESSAGE, Update.CHAT_MEMBER, Update.MY_CHAT_MEMBER]
+
 
 def main():
-    settings.validate()
+    settings = get_settings()
 
     # Initialize database
     if not init_database():
@@ -22,8 +35,20 @@ def main():
         logging.error("Database connection failed. Exiting.")
         return
 
-    # Build the application
-    app = ApplicationBuilder().token(settings.bot_token).build()
+    # Decrypt stored Redmine tokens up front so first commands skip it, and
+    # remember which groups still have a daily running
+    with DatabaseSession() as db:
+        UserService.warm_token_cache(db)
+        prime_active_dailies(DailyService.get_active_group_ids(db))
+
+    # Build the application, talking to a local Bot API server when one is
+    # configured (lower getUpdates latency than api.telegram.org)
+    builder = ApplicationBuilder().token(settings.bot_token)
+    if settings.telegram_api_url:
+        builder = builder.base_url(f"{settings.telegram_api_url}/bot").base_file_url(
+            f"{settings.telegram_api_url}/file/bot"
+        )
+    app = builder.build()
 
     # Set up all handlers
     setup_handlers(app)
@@ -32,7 +57,7 @@ def main():
 
     # Run the bot with proper initialization
     try:
-        app.run_polling(allowed_updates=["message", "chat_member"])
+        app.run_polling(allowed_updates=ALLOWED_UPDATES)
     except Exception as e:
         logging.error(f"Error running bot: {e}")
 
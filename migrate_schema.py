@@ -0,0 +1,261 @@
+"""
+Migration script to bring an existing database up to the current schema.
+Run this script once after upgrading; every step is idempotent.
+"""
+
+import json
+import sqlite3
+from itertools import islice
+from typing import Iterable
+import struct
+import logging
+from pathlib import Path
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _table_exists(cursor: sqlite3.Cursor, table: str) -> bool:
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    )
+    return cursor.fetchone() is not None
+
+
+def _column_exists(cursor: sqlite3.Cursor, table: str, column: str) -> bool:
+    cursor.execute(
+        "SELECT 1 FROM pragma_table_xinfo(?) WHERE name = ? LIMIT 1", (table, column)
+    )
+    return cursor.fetchone() is not None
+
+
+# Rows per executemany call in backfills; small batches keep each call's
+# parameter set bounded however large the table is
+BACKFILL_CHUNK_SIZE = 100
+
+
+def _chunked_executemany(
+    cursor: sqlite3.Cursor,
+    sql: str,
+    rows: Iterable[tuple],
+    chunk_size: int = BACKFILL_CHUNK_SIZE,
+) -> int:
+    """
+    Run a parameterized statement for every row, chunk_size rows per call.
+    Rows may be a generator; they are consumed one chunk at a time. Every
+    chunk runs in the caller's transaction, committed once at the end.
+    """
+    rows = iter(rows)
+    total = 0
+    while chunk := list(islice(rows, chunk_size)):
+        cursor.executemany(sql, chunk)
+        total += len(chunk)
+    return total
+
+
+def migrate_token_blob(cursor: sqlite3.Cursor) -> None:
+    """
+    Convert encrypted Redmine tokens stored as TEXT into raw BLOB values.
+    """
+    if not _table_exists(cursor, "users"):
+        return
+    cursor.execute(
+        """
+        UPDATE users
+        SET encrypted_redmine_token = CAST(encrypted_redmine_token AS BLOB)
+        WHERE typeof(encrypted_redmine_token) = 'text'
+    """
+    )
+    logger.info(f"Converted {cursor.rowcount} encrypted token(s) to BLOB.")
+
+
+def migrate_token_fingerprint(cursor: sqlite3.Cursor) -> None:
+    """
+    Add the token fingerprint column used to detect resubmitted tokens.
+    Existing users get their fingerprint the next time they save a token.
+    """
+    if not _table_exists(cursor, "users"):
+        return
+    if _column_exists(cursor, "users", "token_fingerprint"):
+        return
+    cursor.execute("ALTER TABLE users ADD COLUMN token_fingerprint BLOB")
+    logger.info("Added users.token_fingerprint column.")
+
+
+def migrate_token_aesgcm(cursor: sqlite3.Cursor) -> None:
+    """
+    Re-encrypt Redmine tokens still stored as legacy Fernet tokens with AES-GCM.
+    Their fingerprints are filled in at the same time.
+    """
+    if not _table_exists(cursor, "users"):
+        return
+    from app.utils.crypto import AESGCM_VERSION, get_crypto_manager
+
+    cursor.execute(
+        "SELECT id, encrypted_redmine_token FROM users "
+        "WHERE encrypted_redmine_token IS NOT NULL"
+    )
+    legacy = [
+        (user_id, token)
+        for user_id, token in cursor.fetchall()
+        if token[:1] != AESGCM_VERSION
+    ]
+    if not legacy:
+        return
+
+    crypto = get_crypto_manager()
+
+    def reencrypted():
+        for user_id, token in legacy:
+            plain = crypto.fernet.decrypt(token).decode()
+            yield crypto.encrypt(plain), crypto.fingerprint(plain), user_id
+
+    _chunked_executemany(
+        cursor,
+        "UPDATE users SET encrypted_redmine_token = ?, token_fingerprint = ? "
+        "WHERE id = ?",
+        reencrypted(),
+    )
+    logger.info(f"Re-encrypted {len(legacy)} legacy Fernet token(s) with AES-GCM.")
+
+
+def migrate_covering_indexes(cursor: sqlite3.Cursor) -> None:
+    """
+    Drop indexes that were replaced by the current lookup indexes.
+    """
+    for index in (
+        "ix_users_id",
+        "ix_teams_id",
+        "ix_dailys_id",
+        "ix_dailys_group_unregistered",
+    ):
+        cursor.execute(f"DROP INDEX IF EXISTS {index}")
+
+
+def migrate_daily_duration(cursor: sqlite3.Cursor) -> None:
+    """
+    Add the generated dailys.duration_seconds column.
+    SQLite only adds VIRTUAL generated columns to existing tables; the value is
+    computed on read, so existing rows need no backfill.
+    """
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.schema import CreateColumn
+    from app.database.models import Daily
+
+    if not _table_exists(cursor, "dailys"):
+        return
+    if _column_exists(cursor, "dailys", "duration_seconds"):
+        return
+    column = CreateColumn(Daily.__table__.c.duration_seconds).compile(
+        dialect=sqlite.dialect()
+    )
+    cursor.execute(f"ALTER TABLE dailys ADD COLUMN {column}")
+    logger.info("Added dailys.duration_seconds column.")
+
+
+def migrate_model_indexes(cursor: sqlite3.Cursor) -> None:
+    """
+    Create every index declared on the models that is missing in the database.
+    """
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.schema import CreateIndex
+    from app.database.database import Base
+    import app.database.models  # noqa: F401 - registers the tables
+
+    dialect = sqlite.dialect()
+    for table in Base.metadata.sorted_tables:
+        if not _table_exists(cursor, table.name):
+            continue
+        for index in table.indexes:
+            ddl = CreateIndex(index, if_not_exists=True).compile(dialect=dialect)
+            cursor.execute(str(ddl))
+    logger.info("Model indexes are in place.")
+
+
+def migrate_participants_blob(cursor: sqlite3.Cursor) -> None:
+    """
+    Convert daily participants stored as JSON text into packed int64 BLOBs.
+    """
+    if not _table_exists(cursor, "dailys"):
+        return
+    cursor.execute(
+        "SELECT id, participants_ids FROM dailys WHERE typeof(participants_ids) = 'text'"
+    )
+    rows = cursor.fetchall()
+
+    def packed():
+        for daily_id, participants_json in rows:
+            ids = json.loads(participants_json) or []
+            yield struct.pack(f"<{len(ids)}q", *ids), daily_id
+
+    _chunked_executemany(
+        cursor, "UPDATE dailys SET participants_ids = ? WHERE id = ?", packed()
+    )
+    logger.info(f"Converted {len(rows)} daily participant list(s) to BLOB.")
+
+
+MIGRATIONS = [
+    migrate_token_blob,
+    migrate_token_fingerprint,
+    migrate_token_aesgcm,
+    migrate_covering_indexes,
+    migrate_participants_blob,
+    migrate_daily_duration,
+    migrate_model_indexes,
+]
+
+
+def migrate_database():
+    """
+    Apply every schema migration step to the database.
+    """
+    # Database path
+    db_path = Path(__file__).parent / "mine_bot.db"
+
+    if not db_path.exists():
+        logger.warning(
+            f"Database file {db_path} doesn't exist. The current schema will be created on first start."
+        )
+        return
+
+    conn = None
+    try:
+        # Connect to database
+        conn = sqlite3.connect(db_path)
+        # Same journal settings as the bot's engine: WAL is persistent and
+        # NORMAL syncs only at checkpoints, so the migration commits cheaply
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        cursor = conn.cursor()
+
+        for migration in MIGRATIONS:
+            logger.info(f"Applying {migration.__name__}...")
+            migration(cursor)
+
+        conn.commit()
+        logger.info("✅ Database schema is up to date.")
+
+        conn.close()
+
+    except sqlite3.Error as e:
+        logger.error(f"Database error during migration: {e}")
+        if conn:
+            try:
+                conn.rollback()
+                conn.close()
+            except:
+                pass
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error during migration: {e}")
+        if conn:
+            try:
+                conn.close()
+            except:
+                pass
+        raise
+
+
+if __name__ == "__main__":
+    migrate_database()
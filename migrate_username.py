@@ -29,36 +29,46 @@ def migrate_database():
     try:
         # Connect to database
         conn = sqlite3.connect(db_path)
+        # Same journal settings as the bot's engine: WAL is persistent and
+        # NORMAL syncs only at checkpoints, so the migration commits cheaply
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
         cursor = conn.cursor()
 
-        # Check if username column already exists
-        cursor.execute("PRAGMA table_info(users)")
-        columns = [column[1] for column in cursor.fetchall()]
+        # Check if username column already exists; SQLite stops at the first match
+        cursor.execute(
+            "SELECT 1 FROM pragma_table_info('users') WHERE name = ? LIMIT 1",
+            ("username",),
+        )
 
-        if "username" in columns:
+        if cursor.fetchone() is not None:
             logger.info(
                 "Username column already exists in users table. Migration not needed."
             )
         else:
             logger.info("Adding username column to users table...")
 
-            # Add username column
-            cursor.execute(
+            # Add the column and its index in one transaction, so a failure
+            # leaves neither behind
+            with conn:
+                cursor.execute("BEGIN")
+
+                # Add username column
+                cursor.execute(
+                    """
+                    ALTER TABLE users 
+                    ADD COLUMN username VARCHAR(255) DEFAULT NULL
                 """
-                ALTER TABLE users 
-                ADD COLUMN username VARCHAR(255) DEFAULT NULL
-            """
-            )
+                )
 
-            # Create index on username for performance
-            cursor.execute(
+                # Create index on username for performance
+                cursor.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_users_username 
+                    ON users(username)
                 """
-                CREATE INDEX IF NOT EXISTS idx_users_username 
-                ON users(username)
-            """
-            )
+                )
 
-            conn.commit()
             logger.info(
                 "✅ Successfully added username column and index to users table."
             )
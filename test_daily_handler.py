@@ -30,11 +30,23 @@ try:
 except ImportError as e:
     print(f"❌ Error al importar DailyService: {e}")
 
+try:
+    from app.services.redmine_service import AsyncRedmineService
+
+    # El tiempo de todos los participantes se loguea en paralelo
+    if hasattr(AsyncRedmineService, "log_daily_bulk"):
+        print("✅ Método AsyncRedmineService.log_daily_bulk existe")
+    else:
+        print("❌ Método AsyncRedmineService.log_daily_bulk no existe")
+
+except ImportError as e:
+    print(f"❌ Error al importar AsyncRedmineService: {e}")
+
 print("\n📋 Resumen del handler /daily:")
 print("1. ✅ Solo funciona en grupos")
 print("2. ✅ Busca la última daily no registrada en Redmine")
 print("3. ✅ Verifica que no hayan pasado más de 30 minutos")
 print("4. ✅ Crea la tarea en Redmine con el usuario que ejecuta el comando")
-print("5. ✅ Loguea tiempo para usuarios mencionados que tengan token")
+print("5. ✅ Loguea tiempo en paralelo para usuarios mencionados que tengan token")
 print("6. ✅ Marca la daily como registrada en Redmine")
 print("7. ✅ Envía reporte detallado del proceso")
@@ -6,7 +6,10 @@ Shows all daily information including participants and related data.
 
 import sys
 import os
+from collections import Counter
+from contextlib import nullcontext
 from datetime import datetime, timedelta
+from sqlalchemy import bindparam, case, func, select
 
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -14,27 +17,46 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from app.database.database import DatabaseSession
 from app.database.models import Daily, Team, User
 
+# Statements built once and reused on every run, so SQLAlchemy's compiled
+# cache is hit instead of building the query again
+_SELECT_TEAM_LABELS = select(Team.id, Team.team_name, Team.redmine_project_code)
+_SELECT_DAILY_STATISTICS = select(
+    func.count(Daily.id),
+    func.coalesce(func.sum(case((Daily.end_time.isnot(None), 1))), 0),
+    func.coalesce(func.sum(case((Daily.registered_in_redmine == True, 1))), 0),
+    func.coalesce(func.sum(Daily.participants_count), 0),
+    func.coalesce(func.sum(case((Daily.start_time >= bindparam("week_ago"), 1))), 0),
+)
+_SELECT_DAILYS_PER_TEAM = select(Daily.team_id, func.count(Daily.id)).group_by(
+    Daily.team_id
+)
+
+
+# Display text for False and True, indexed by the value
+_BOOL = ("❌ No", "✅ Yes")
+
 
 def format_datetime(dt):
     """Format datetime for display."""
-    if dt:
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
-    return "N/A"
+    # SQLite hands back naive datetimes, so no offset is appended
+    return dt.isoformat(sep=" ", timespec="seconds") if dt else "N/A"
 
 
 def format_boolean(value):
     """Format boolean for display."""
-    return "✅ Yes" if value else "❌ No"
+    return _BOOL[bool(value)]
+
+
+def _session_scope(session=None):
+    """Reuse the caller's session, or open a new one."""
+    return nullcontext(session) if session is not None else DatabaseSession()
 
 
-def calculate_duration(start_time, end_time):
-    """Calculate duration between start and end time."""
-    if start_time and end_time:
-        duration = end_time - start_time
-        total_seconds = int(duration.total_seconds())
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        seconds = total_seconds % 60
+def calculate_duration(duration_seconds, start_time):
+    """Format a daily's duration, as computed by SQLite in duration_seconds."""
+    if duration_seconds is not None:
+        hours, remainder = divmod(duration_seconds, 3600)
+        minutes, seconds = divmod(remainder, 60)
 
         if hours > 0:
             return f"{hours}h {minutes}m {seconds}s"
@@ -42,85 +64,116 @@ def calculate_duration(start_time, end_time):
             return f"{minutes}m {seconds}s"
         else:
             return f"{seconds}s"
-    return "Ongoing" if start_time and not end_time else "N/A"
+    return "Ongoing" if start_time else "N/A"
 
 
-def get_team_info(session, team_id):
+def get_team_labels(session):
+    """Build the display label of every team in one query, keyed by ID."""
+    return {
+        team_id: f"{team_name} ({project_code})"
+        for team_id, team_name, project_code in session.execute(_SELECT_TEAM_LABELS)
+    }
+
+
+def get_team_info(team_labels, team_id):
     """Get team information."""
-    try:
-        team = session.query(Team).filter(Team.id == team_id).first()
-        if team:
-            return f"{team.team_name} ({team.redmine_project_code})"
-        else:
-            return f"Team not found (ID: {team_id})"
-    except Exception as e:
-        return f"Error getting team info: {e}"
+    return team_labels.get(team_id) or f"Team not found (ID: {team_id})"
+
+
+def get_users_by_telegram_id(session, telegram_ids):
+    """Load the given users with IN queries, keyed by Telegram ID."""
+    telegram_ids = list(set(telegram_ids))
+    users_by_id = {}
+    # Stay below SQLite's limit of 999 bound parameters per statement
+    for start in range(0, len(telegram_ids), 900):
+        chunk = telegram_ids[start : start + 900]
+        for user in session.query(User).filter(User.telegram_id.in_(chunk)):
+            users_by_id[user.telegram_id] = user
+    return users_by_id
+
+
+def get_user_labels(users_by_id):
+    """Build the display label of every loaded user, keyed by Telegram ID."""
+    return {
+        telegram_id: f"{user.username or 'Unknown'} ({telegram_id})"
+        for telegram_id, user in users_by_id.items()
+    }
 
 
-def get_participants_info(session, participants_ids):
+def get_participants_info(user_labels, participants_ids):
     """Get participant information."""
     if not participants_ids:
         return "No participants"
 
-    try:
-        participants = []
-        for participant_id in participants_ids:
-            user = (
-                session.query(User).filter(User.telegram_id == participant_id).first()
-            )
-            if user:
-                participants.append(f"{user.username or 'Unknown'} ({participant_id})")
-            else:
-                participants.append(f"Unknown ({participant_id})")
+    return [
+        user_labels.get(participant_id) or f"Unknown ({participant_id})"
+        for participant_id in participants_ids
+    ]
 
-        return participants
-    except Exception as e:
-        return [f"Error getting participants: {e}"]
 
+def view_all_dailys(session=None, limit=None, offset=0):
+    """View daily meetings registered in the database, newest first.
 
-def view_all_dailys():
-    """View all daily meetings registered in the database."""
+    Pass limit (and offset) to show one page instead of every daily.
+    """
     print("=" * 80)
     print("🔍 VIEWING ALL DAILY MEETINGS")
     print("=" * 80)
 
     try:
-        with DatabaseSession() as session:
-            dailys = session.query(Daily).order_by(Daily.start_time.desc()).all()
+        with _session_scope(session) as session:
+            query = session.query(Daily).order_by(Daily.start_time.desc())
+            dailys = query.offset(offset).limit(limit).all()
 
             if not dailys:
                 print("❌ No daily meetings found in the database.")
                 return
 
-            print(f"📊 Total daily meetings found: {len(dailys)}")
+            total_dailys = (
+                len(dailys) if limit is None and not offset else query.count()
+            )
+            print(f"📊 Total daily meetings found: {total_dailys}")
+            if len(dailys) < total_dailys:
+                print(f"📄 Showing {offset + 1}-{offset + len(dailys)}")
             print("-" * 80)
 
-            for i, daily in enumerate(dailys, 1):
-                print(f"\n📅 DAILY #{i}")
-                print(f"   Database ID: {daily.id}")
-                print(f"   Team: {get_team_info(session, daily.team_id)}")
-                print(f"   Telegram Group ID: {daily.telegram_group_id}")
-                print(f"   Start Time: {format_datetime(daily.start_time)}")
-                print(f"   End Time: {format_datetime(daily.end_time)}")
-                print(
-                    f"   Duration: {calculate_duration(daily.start_time, daily.end_time)}"
-                )
-                print(
-                    f"   Registered in Redmine: {format_boolean(daily.registered_in_redmine)}"
+            # Every team and participant label is built once per run, however
+            # many dailys share it
+            team_labels = get_team_labels(session)
+            user_labels = get_user_labels(
+                get_users_by_telegram_id(
+                    session,
+                    (pid for daily in dailys for pid in daily.get_participants()),
                 )
+            )
 
-                # Show participants
-                participants = get_participants_info(session, daily.get_participants())
-                print(f"   Participants ({len(daily.get_participants())} total):")
+            # Each daily's report is built as lines and written in one call
+            for i, daily in enumerate(dailys, 1):
+                participants_ids = daily.get_participants()
+                participants = get_participants_info(user_labels, participants_ids)
+                lines = [
+                    f"\n📅 DAILY #{offset + i}",
+                    f"   Database ID: {daily.id}",
+                    f"   Team: {get_team_info(team_labels, daily.team_id)}",
+                    f"   Telegram Group ID: {daily.telegram_group_id}",
+                    f"   Start Time: {format_datetime(daily.start_time)}",
+                    f"   End Time: {format_datetime(daily.end_time)}",
+                    f"   Duration: {calculate_duration(daily.duration_seconds, daily.start_time)}",
+                    f"   Registered in Redmine: {format_boolean(daily.registered_in_redmine)}",
+                    # Show participants
+                    f"   Participants ({len(participants_ids)} total):",
+                ]
                 if isinstance(participants, list):
-                    for participant in participants:
-                        print(f"     - {participant}")
+                    lines.extend(
+                        f"     - {participant}" for participant in participants
+                    )
                 else:
-                    print(f"     {participants}")
+                    lines.append(f"     {participants}")
 
-                print(f"   Created At: {format_datetime(daily.created_at)}")
-                print(f"   Updated At: {format_datetime(daily.updated_at)}")
-                print("-" * 50)
+                lines.append(f"   Created At: {format_datetime(daily.created_at)}")
+                lines.append(f"   Updated At: {format_datetime(daily.updated_at)}")
+                lines.append("-" * 50)
+                print("\n".join(lines))
 
     except Exception as e:
         print(f"❌ Error accessing database: {e}")
@@ -129,23 +182,23 @@ def view_all_dailys():
     return True
 
 
-def show_daily_statistics():
+def show_daily_statistics(session=None):
     """Show basic statistics about daily meetings."""
     print("\n📈 DAILY MEETING STATISTICS")
     print("=" * 40)
 
     try:
-        with DatabaseSession() as session:
-            total_dailys = session.query(Daily).count()
-            finished_dailys = (
-                session.query(Daily).filter(Daily.end_time.isnot(None)).count()
-            )
-            ongoing_dailys = (
-                session.query(Daily).filter(Daily.end_time.is_(None)).count()
-            )
-            registered_in_redmine = (
-                session.query(Daily).filter(Daily.registered_in_redmine == True).count()
-            )
+        with _session_scope(session) as session:
+            # Every counter in one aggregate query, without loading any row
+            week_ago = datetime.now() - timedelta(days=7)
+            (
+                total_dailys,
+                finished_dailys,
+                registered_in_redmine,
+                total_participants,
+                recent_dailys,
+            ) = session.execute(_SELECT_DAILY_STATISTICS, {"week_ago": week_ago}).one()
+            ongoing_dailys = total_dailys - finished_dailys
 
             print(f"📊 Total Daily Meetings: {total_dailys}")
             print(f"✅ Finished Meetings: {finished_dailys}")
@@ -159,37 +212,31 @@ def show_daily_statistics():
                 )
 
             # Calculate average participants
-            dailys = session.query(Daily).all()
-            total_participants = sum(len(daily.get_participants()) for daily in dailys)
             avg_participants = (
                 total_participants / total_dailys if total_dailys > 0 else 0
             )
             print(f"👥 Average Participants per Daily: {avg_participants:.1f}")
 
             # Show recent activity (last 7 days)
-            week_ago = datetime.now() - timedelta(days=7)
-            recent_dailys = (
-                session.query(Daily).filter(Daily.start_time >= week_ago).count()
-            )
             print(f"📅 Daily Meetings (Last 7 days): {recent_dailys}")
 
     except Exception as e:
         print(f"❌ Error calculating statistics: {e}")
 
 
-def show_team_daily_activity():
+def show_team_daily_activity(session=None):
     """Show daily activity by team."""
     print("\n🏢 DAILY ACTIVITY BY TEAM")
     print("=" * 40)
 
     try:
-        with DatabaseSession() as session:
+        with _session_scope(session) as session:
+            # Count in SQL and resolve every team from one prefetch
+            team_labels = get_team_labels(session)
             team_counts = {}
-            dailys = session.query(Daily).all()
-
-            for daily in dailys:
-                team_info = get_team_info(session, daily.team_id)
-                team_counts[team_info] = team_counts.get(team_info, 0) + 1
+            for team_id, count in session.execute(_SELECT_DAILYS_PER_TEAM):
+                team_info = get_team_info(team_labels, team_id)
+                team_counts[team_info] = team_counts.get(team_info, 0) + count
 
             print("📋 Daily meetings by team:")
             for team, count in sorted(
@@ -201,31 +248,28 @@ def show_team_daily_activity():
         print(f"❌ Error getting team activity: {e}")
 
 
-def show_most_active_participants():
+def show_most_active_participants(session=None):
     """Show users who participate most in dailys."""
     print("\n👥 MOST ACTIVE PARTICIPANTS")
     print("=" * 40)
 
     try:
-        with DatabaseSession() as session:
-            participant_counts = {}
-            dailys = session.query(Daily).all()
-
-            for daily in dailys:
-                for participant_id in daily.get_participants():
-                    participant_counts[participant_id] = (
-                        participant_counts.get(participant_id, 0) + 1
-                    )
+        with _session_scope(session) as session:
+            # Stream only the participant lists, 500 rows at a time, and let
+            # Counter tally them in C; most_common keeps just the top ten
+            participant_counts = Counter()
+            rows = session.query(Daily.participants_ids).yield_per(500)
+            for (participants_ids,) in rows:
+                participant_counts.update(participants_ids or ())
+
+            most_active = participant_counts.most_common(10)
+            users_by_id = get_users_by_telegram_id(
+                session, (participant_id for participant_id, _ in most_active)
+            )
 
             print("📋 Daily participation by user:")
-            for participant_id, count in sorted(
-                participant_counts.items(), key=lambda x: x[1], reverse=True
-            )[:10]:
-                user = (
-                    session.query(User)
-                    .filter(User.telegram_id == participant_id)
-                    .first()
-                )
+            for participant_id, count in most_active:
+                user = users_by_id.get(participant_id)
                 username = user.username if user else "Unknown"
                 print(f"   {username} ({participant_id}): {count} meeting(s)")
 
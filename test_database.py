@@ -6,13 +6,56 @@ Combines users, teams, and daily meetings in one convenient script.
 
 import sys
 import os
+from contextlib import nullcontext
 from datetime import datetime
+from sqlalchemy import case, func, select
 
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app.database.database import DatabaseSession, check_database_connection
+from app.database.database import (
+    DatabaseSession,
+    check_database_connection,
+    get_database_path,
+)
 from app.database.models import User, Team, Daily
+import test_users
+import test_teams
+import test_dailys
+
+# Statements built once and reused on every menu choice, so SQLAlchemy's
+# compiled cache is hit instead of building the query again
+_SELECT_USER_COUNTS = select(
+    func.count(User.id),
+    func.coalesce(func.sum(case((User.is_active == True, 1))), 0),
+    func.coalesce(func.sum(case((User.has_redmine_token(), 1))), 0),
+)
+_SELECT_RECENT_USERS = (
+    select(User.username, User.telegram_id, User.created_at)
+    .order_by(User.created_at.desc(), User.id)
+    .limit(5)
+)
+_SELECT_TEAM_COUNTS = select(
+    func.count(Team.id),
+    func.coalesce(func.sum(case((Team.is_active == True, 1))), 0),
+    func.count(Team.redmine_project_code.distinct()),
+)
+_SELECT_RECENT_TEAMS = (
+    select(Team.team_name, Team.redmine_project_code, Team.created_at)
+    .order_by(Team.created_at.desc(), Team.id)
+    .limit(5)
+)
+_SELECT_DAILY_COUNTS = select(
+    func.count(Daily.id),
+    func.coalesce(func.sum(case((Daily.end_time.isnot(None), 1))), 0),
+    func.coalesce(func.sum(case((Daily.registered_in_redmine == True, 1))), 0),
+    func.coalesce(func.sum(Daily.participants_count), 0),
+)
+_SELECT_RECENT_DAILYS = (
+    select(Daily.team_id, Daily.start_time, Daily.participants_count)
+    .order_by(Daily.start_time.desc(), Daily.id)
+    .limit(5)
+)
 
 
 def show_menu():
@@ -29,115 +72,121 @@ def show_menu():
     print("=" * 60)
 
 
+# Display text for False and True, indexed by the value
+_BOOL = ("❌ No", "✅ Yes")
+
+
 def format_datetime(dt):
     """Format datetime for display."""
-    if dt:
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
-    return "N/A"
+    # SQLite hands back naive datetimes, so no offset is appended
+    return dt.isoformat(sep=" ", timespec="seconds") if dt else "N/A"
 
 
 def format_boolean(value):
     """Format boolean for display."""
-    return "✅ Yes" if value else "❌ No"
+    return _BOOL[bool(value)]
+
 
+def _session_scope(session=None):
+    """Reuse the caller's session, or open a new one."""
+    return nullcontext(session) if session is not None else DatabaseSession()
 
-def view_users_summary():
+
+def view_users_summary(session=None):
     """Show users summary."""
     print("\n👤 USERS SUMMARY")
     print("-" * 40)
 
     try:
-        with DatabaseSession() as session:
-            users = session.query(User).all()
+        with _session_scope(session) as session:
+            # Counters as one aggregate query; only the recent rows are read
+            total_users, active_users, users_with_tokens = session.execute(
+                _SELECT_USER_COUNTS
+            ).one()
 
-            if not users:
+            if not total_users:
                 print("❌ No users found.")
                 return
 
-            print(f"📊 Total Users: {len(users)}")
-            active_users = sum(1 for user in users if user.is_active)
-            users_with_tokens = sum(1 for user in users if user.has_redmine_token())
-
+            print(f"📊 Total Users: {total_users}")
             print(f"✅ Active Users: {active_users}")
             print(f"🔑 Users with Tokens: {users_with_tokens}")
 
             print("\n📋 Recent Users:")
-            recent_users = sorted(users, key=lambda x: x.created_at, reverse=True)[:5]
-            for user in recent_users:
-                username = user.username or "No username"
+            recent_users = session.execute(_SELECT_RECENT_USERS)
+            for username, telegram_id, created_at in recent_users:
+                username = username or "No username"
                 print(
-                    f"   - {username} (ID: {user.telegram_id}) - {format_datetime(user.created_at)}"
+                    f"   - {username} (ID: {telegram_id}) - {format_datetime(created_at)}"
                 )
 
     except Exception as e:
         print(f"❌ Error: {e}")
 
 
-def view_teams_summary():
+def view_teams_summary(session=None):
     """Show teams summary."""
     print("\n🏢 TEAMS SUMMARY")
     print("-" * 40)
 
     try:
-        with DatabaseSession() as session:
-            teams = session.query(Team).all()
+        with _session_scope(session) as session:
+            # Counters as one aggregate query; only the recent rows are read
+            total_teams, active_teams, unique_projects = session.execute(
+                _SELECT_TEAM_COUNTS
+            ).one()
 
-            if not teams:
+            if not total_teams:
                 print("❌ No teams found.")
                 return
 
-            print(f"📊 Total Teams: {len(teams)}")
-            active_teams = sum(1 for team in teams if team.is_active)
+            print(f"📊 Total Teams: {total_teams}")
             print(f"✅ Active Teams: {active_teams}")
 
             # Show unique projects
-            unique_projects = set(team.redmine_project_code for team in teams)
-            print(f"🎯 Unique Projects: {len(unique_projects)}")
+            print(f"🎯 Unique Projects: {unique_projects}")
 
             print("\n📋 Recent Teams:")
-            recent_teams = sorted(teams, key=lambda x: x.created_at, reverse=True)[:5]
-            for team in recent_teams:
+            recent_teams = session.execute(_SELECT_RECENT_TEAMS)
+            for team_name, project_code, created_at in recent_teams:
                 print(
-                    f"   - {team.team_name} ({team.redmine_project_code}) - {format_datetime(team.created_at)}"
+                    f"   - {team_name} ({project_code}) - {format_datetime(created_at)}"
                 )
 
     except Exception as e:
         print(f"❌ Error: {e}")
 
 
-def view_dailys_summary():
+def view_dailys_summary(session=None):
     """Show dailys summary."""
     print("\n📅 DAILY MEETINGS SUMMARY")
     print("-" * 40)
 
     try:
-        with DatabaseSession() as session:
-            dailys = session.query(Daily).all()
+        with _session_scope(session) as session:
+            # Counters as one aggregate query; only the recent rows are read
+            total_dailys, finished_dailys, registered_dailys, total_participants = (
+                session.execute(_SELECT_DAILY_COUNTS).one()
+            )
 
-            if not dailys:
+            if not total_dailys:
                 print("❌ No daily meetings found.")
                 return
 
-            print(f"📊 Total Daily Meetings: {len(dailys)}")
-            finished_dailys = sum(1 for daily in dailys if daily.end_time)
-            registered_dailys = sum(
-                1 for daily in dailys if daily.registered_in_redmine
-            )
+            print(f"📊 Total Daily Meetings: {total_dailys}")
 
             print(f"✅ Finished Meetings: {finished_dailys}")
             print(f"🎯 Registered in Redmine: {registered_dailys}")
 
             # Calculate total participants
-            total_participants = sum(len(daily.get_participants()) for daily in dailys)
-            avg_participants = total_participants / len(dailys) if dailys else 0
+            avg_participants = total_participants / total_dailys
             print(f"👥 Average Participants: {avg_participants:.1f}")
 
             print("\n📋 Recent Meetings:")
-            recent_dailys = sorted(dailys, key=lambda x: x.start_time, reverse=True)[:5]
-            for daily in recent_dailys:
-                participants_count = len(daily.get_participants())
+            recent_dailys = session.execute(_SELECT_RECENT_DAILYS)
+            for team_id, start_time, participants_count in recent_dailys:
                 print(
-                    f"   - Team ID {daily.team_id} - {format_datetime(daily.start_time)} ({participants_count} participants)"
+                    f"   - Team ID {team_id} - {format_datetime(start_time)} ({participants_count} participants)"
                 )
 
     except Exception as e:
@@ -149,29 +198,31 @@ def view_database_summary():
     print("\n📊 DATABASE SUMMARY")
     print("=" * 60)
 
-    view_users_summary()
-    view_teams_summary()
-    view_dailys_summary()
+    with DatabaseSession() as session:
+        view_users_summary(session)
+        view_teams_summary(session)
+        view_dailys_summary(session)
 
     # Show database file info
     print("\n💾 DATABASE FILE INFO")
     print("-" * 40)
 
     try:
-        from app.database.database import get_database_path
-
         db_path = get_database_path()
 
-        if os.path.exists(db_path):
-            file_size = os.path.getsize(db_path)
+        # One stat call gives both the size and the modification time
+        try:
+            db_stat = os.stat(db_path)
+        except FileNotFoundError:
+            print("❌ Database file not found!")
+        else:
+            file_size = db_stat.st_size
             file_size_mb = file_size / (1024 * 1024)
-            file_modified = datetime.fromtimestamp(os.path.getmtime(db_path))
+            file_modified = datetime.fromtimestamp(db_stat.st_mtime)
 
             print(f"📁 Database Path: {db_path}")
             print(f"📏 File Size: {file_size_mb:.2f} MB ({file_size} bytes)")
             print(f"📅 Last Modified: {format_datetime(file_modified)}")
-        else:
-            print("❌ Database file not found!")
 
     except Exception as e:
         print(f"❌ Error getting database info: {e}")
@@ -182,25 +233,20 @@ def view_all():
     print("\n🔄 VIEWING ALL DATABASE DATA")
     print("=" * 60)
 
-    # Import and run individual scripts
+    # Run the individual scripts, sharing one session
     try:
-        print("\n" + "🔄" * 20 + " USERS " + "🔄" * 20)
-        import test_users
-
-        test_users.view_all_users()
-        test_users.show_user_statistics()
-
-        print("\n" + "🔄" * 20 + " TEAMS " + "🔄" * 20)
-        import test_teams
-
-        test_teams.view_all_teams()
-        test_teams.show_team_statistics()
+        with DatabaseSession() as session:
+            print("\n" + "🔄" * 20 + " USERS " + "🔄" * 20)
+            test_users.view_all_users(session)
+            test_users.show_user_statistics(session)
 
-        print("\n" + "🔄" * 20 + " DAILYS " + "🔄" * 20)
-        import test_dailys
+            print("\n" + "🔄" * 20 + " TEAMS " + "🔄" * 20)
+            test_teams.view_all_teams(session)
+            test_teams.show_team_statistics(session)
 
-        test_dailys.view_all_dailys()
-        test_dailys.show_daily_statistics()
+            print("\n" + "🔄" * 20 + " DAILYS " + "🔄" * 20)
+            test_dailys.view_all_dailys(session)
+            test_dailys.show_daily_statistics(session)
 
     except Exception as e:
         print(f"❌ Error running comprehensive view: {e}")
@@ -227,22 +273,19 @@ def main():
             choice = input("\nSelect an option (1-6): ").strip()
 
             if choice == "1":
-                import test_users
-
-                test_users.view_all_users()
-                test_users.show_user_statistics()
+                with DatabaseSession() as session:
+                    test_users.view_all_users(session)
+                    test_users.show_user_statistics(session)
 
             elif choice == "2":
-                import test_teams
-
-                test_teams.view_all_teams()
-                test_teams.show_team_statistics()
+                with DatabaseSession() as session:
+                    test_teams.view_all_teams(session)
+                    test_teams.show_team_statistics(session)
 
             elif choice == "3":
-                import test_dailys
-
-                test_dailys.view_all_dailys()
-                test_dailys.show_daily_statistics()
+                with DatabaseSession() as session:
+                    test_dailys.view_all_dailys(session)
+                    test_dailys.show_daily_statistics(session)
 
             elif choice == "4":
                 view_database_summary()
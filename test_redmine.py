@@ -3,25 +3,166 @@
 Test script for Redmine daily task creation functionality
 """
 
+import argparse
+import asyncio
+import hashlib
+import json
 import os
 import sys
+import time
 from datetime import datetime
 
 # Add the project root to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from app.services.redmine_service import RedmineService
+from app.config import get_settings
+from app.services.redmine_service import AsyncRedmineService, RedmineService
 
+# Projects listed in the picker
+PROJECTS_SHOWN = 10
 
-def test_create_daily():
+# Values used when the script runs without prompts
+DEFAULT_TEAM_NAME = "TestTeam"
+DEFAULT_HOURS = 1.5
+DEFAULT_STATUS_NAME = "IN PROGRESS"
+
+# Trackers, statuses, activities and projects saved between runs
+METADATA_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".redmine_cache.json"
+)
+METADATA_CACHE_TTL = 3600
+
+
+def _metadata_cache_key(token):
+    """
+    Key the cache on the Redmine URL and the token without storing the token
+    """
+    key = f"{get_settings().redmine_url}\n{token}".encode()
+    return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+
+def load_cached_metadata(token):
+    """
+    Return the metadata saved for this token if it is still fresh, else None
+    """
+    try:
+        with open(METADATA_CACHE_PATH, encoding="utf-8") as cache_file:
+            entry = json.load(cache_file).get(_metadata_cache_key(token))
+    except (OSError, ValueError):
+        return None
+    if not entry or time.time() - entry["saved_at"] > METADATA_CACHE_TTL:
+        return None
+    return (
+        entry["trackers"],
+        entry["statuses"],
+        entry["activities"],
+        (entry["projects"], entry["total_projects"]),
+    )
+
+
+def save_cached_metadata(token, trackers, statuses, activities, projects_page):
+    """
+    Save the metadata for this token, keeping other tokens' entries
+    """
+    try:
+        with open(METADATA_CACHE_PATH, encoding="utf-8") as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        cache = {}
+    projects, total_projects = projects_page
+    cache[_metadata_cache_key(token)] = {
+        "saved_at": time.time(),
+        "trackers": trackers,
+        "statuses": statuses,
+        "activities": activities,
+        "projects": projects,
+        "total_projects": total_projects,
+    }
+    try:
+        with open(METADATA_CACHE_PATH, "w", encoding="utf-8") as cache_file:
+            json.dump(cache, cache_file)
+    except OSError as e:
+        print(f"⚠️  No se pudo guardar la caché: {e}")
+
+
+async def fetch_metadata(redmine_service, cached=None):
+    """
+    Run the connection test and the metadata lookups concurrently
+
+    They are independent requests, so together they take about one round-trip
+    instead of five. With cached metadata only the connection is tested.
+    """
+    service = AsyncRedmineService(redmine_service)
+    if cached is not None:
+        return (await service.test_connection(), *cached)
+    return await asyncio.gather(
+        service.test_connection(),
+        service.get_trackers(),
+        service.get_issue_statuses(),
+        service.get_activities(),
+        service.get_projects_page(limit=PROJECTS_SHOWN),
+    )
+
+
+async def log_and_update(redmine_service, issue_id, hours, status_name):
+    """
+    Log the time and change the status of a new daily concurrently
+
+    Both writes only need the issue ID, so neither waits for the other.
+    """
+    service = AsyncRedmineService(redmine_service)
+    return await asyncio.gather(
+        service.log_daily(issue_id=issue_id, hours=hours),
+        service.update_issue_status(issue_id=issue_id, status_name=status_name),
+    )
+
+
+def print_time_entry(time_entry):
+    """Print the result of logging time."""
+    if time_entry:
+        print("✅ Tiempo logueado exitosamente!")
+        print(f"   ID entrada tiempo: {time_entry['id']}")
+        print(f"   Horas: {time_entry['hours']}")
+        print(f"   Fecha: {time_entry['spent_on']}")
+        print(f"   Comentarios: {time_entry['comments']}")
+        print(
+            f"   Actividad: {time_entry.get('activity_name', 'N/A')} (ID: {time_entry['activity_id']})"
+        )
+    else:
+        print("❌ Error al loguear tiempo")
+
+
+def print_status_update(task_data, updated_task):
+    """Print the result of changing the status."""
+    if updated_task:
+        print("✅ Estado actualizado exitosamente!")
+        print(f"   Estado anterior: {task_data.get('status_name', 'Unknown')}")
+        print(
+            f"   Estado nuevo: {updated_task['status_name']} (ID: {updated_task['status_id']})"
+        )
+        print(f"   Fecha actualización: {updated_task['updated_on']}")
+    else:
+        print("❌ Error al cambiar el estado")
+
+
+def test_create_daily(refresh=False, non_interactive=False):
     """
     Test the create_daily_task functionality
+
+    Args:
+        refresh (bool): Ignore the saved metadata and fetch it again
+        non_interactive (bool): Take the token from REDMINE_TOKEN, use the
+            defaults instead of prompting, and run the time log and the
+            status change concurrently
     """
     print("🧪 Test de creación de Daily en Redmine")
     print("=" * 50)
 
     # Get token from user input
-    token = input("Introduce tu token de Redmine: ").strip()
+    if non_interactive:
+        token = os.getenv("REDMINE_TOKEN", "").strip()
+    else:
+        token = input("Introduce tu token de Redmine: ").strip()
 
     if not token:
         print("❌ Token no proporcionado")
@@ -30,17 +171,26 @@ def test_create_daily():
     # Initialize Redmine service
     redmine_service = RedmineService(token)
 
-    # Test connection first
+    # Test connection and load trackers, statuses, activities and projects at once
     print("\n🔗 Probando conexión...")
-    if not redmine_service.test_connection():
+    cached = None if refresh else load_cached_metadata(token)
+    connected, trackers, statuses, activities, (projects, total_projects) = asyncio.run(
+        fetch_metadata(redmine_service, cached)
+    )
+    if not connected:
         print("❌ Error en la conexión. Verifica tu token.")
         return
+    if cached is not None:
+        print("💾 Usando metadatos en caché (--refresh para recargarlos)")
+    elif trackers and statuses and activities and projects:
+        save_cached_metadata(
+            token, trackers, statuses, activities, (projects, total_projects)
+        )
 
     print("✅ Conexión exitosa")
 
     # Get available trackers
     print("\n🏷️  Obteniendo trackers disponibles...")
-    trackers = redmine_service.get_trackers()
 
     if trackers:
         print(f"✅ Encontrados {len(trackers)} trackers:")
@@ -51,7 +201,6 @@ def test_create_daily():
 
     # Get available issue statuses
     print("\n📊 Obteniendo estados disponibles...")
-    statuses = redmine_service.get_issue_statuses()
 
     if statuses:
         print(f"✅ Encontrados {len(statuses)} estados:")
@@ -62,7 +211,6 @@ def test_create_daily():
 
     # Get available activities
     print("\n⚡ Obteniendo actividades disponibles...")
-    activities = redmine_service.get_activities()
 
     if activities:
         print(f"✅ Encontradas {len(activities)} actividades:")
@@ -73,36 +221,47 @@ def test_create_daily():
 
     # Get available projects
     print("\n📋 Obteniendo proyectos disponibles...")
-    projects = redmine_service.get_projects()
+    # Only the first PROJECTS_SHOWN projects are shown, so only those are fetched
 
     if not projects:
         print("❌ No se encontraron proyectos")
         return
 
-    print(f"✅ Encontrados {len(projects)} proyectos:")
-    for i, project in enumerate(projects[:10]):  # Show first 10 projects
+    print(f"✅ Encontrados {total_projects} proyectos:")
+    for i, project in enumerate(projects):
         print(
             f"  {i+1}. {project['name']} (ID: {project['id']}, Code: {project['identifier']})"
         )
 
-    if len(projects) > 10:
-        print(f"  ... y {len(projects) - 10} más")
+    if total_projects > len(projects):
+        print(f"  ... y {total_projects - len(projects)} más")
 
     # Let user select a project
     try:
-        project_choice = input(
-            "\nSelecciona el número del proyecto (o presiona Enter para usar el primero): "
-        ).strip()
+        project_choice = (
+            ""
+            if non_interactive
+            else input(
+                "\nSelecciona el número del proyecto (o presiona Enter para usar el primero): "
+            ).strip()
+        )
 
+        selected_project = projects[0]
         if project_choice:
             project_index = int(project_choice) - 1
-            if project_index < 0 or project_index >= len(projects):
+            if 0 <= project_index < len(projects):
+                selected_project = projects[project_index]
+            elif len(projects) <= project_index < total_projects:
+                # Past the listed page: fetch only the chosen project
+                page, _ = redmine_service.get_projects_page(
+                    limit=1, offset=project_index
+                )
+                if page:
+                    selected_project = page[0]
+                else:
+                    print("❌ Selección inválida, usando el primer proyecto")
+            else:
                 print("❌ Selección inválida, usando el primer proyecto")
-                project_index = 0
-        else:
-            project_index = 0
-
-        selected_project = projects[project_index]
         print(
             f"\n🎯 Proyecto seleccionado: {selected_project['name']} (ID: {selected_project['id']})"
         )
@@ -112,11 +271,15 @@ def test_create_daily():
         selected_project = projects[0]
 
     # Get team name
-    team_name = input(
-        "\nIntroduce el nombre del equipo (o presiona Enter para 'TestTeam'): "
-    ).strip()
+    team_name = (
+        ""
+        if non_interactive
+        else input(
+            "\nIntroduce el nombre del equipo (o presiona Enter para 'TestTeam'): "
+        ).strip()
+    )
     if not team_name:
-        team_name = "TestTeam"
+        team_name = DEFAULT_TEAM_NAME
 
     # Create the daily task
     print(f"\n🚀 Creando daily para el equipo '{team_name}'...")
@@ -134,6 +297,26 @@ def test_create_daily():
         print(f"   Proyecto: {selected_project['name']}")
         print(f"   Fecha inicio: {task_data['start_date']}")
         print(f"   Fecha fin: {task_data['due_date']}")
+        task_url = f"{get_settings().redmine_url}/issues/{task_data['id']}"
+
+        if non_interactive:
+            # No answers to wait for, so both writes go out together
+            print(
+                f"\n⏱️  Logueando {DEFAULT_HOURS} horas y cambiando el estado a "
+                f"'{DEFAULT_STATUS_NAME}'..."
+            )
+            time_entry, updated_task = asyncio.run(
+                log_and_update(
+                    redmine_service,
+                    task_data["id"],
+                    DEFAULT_HOURS,
+                    DEFAULT_STATUS_NAME,
+                )
+            )
+            print_time_entry(time_entry)
+            print_status_update(task_data, updated_task)
+            print(f"\n🔗 URL de la tarea: {task_url}")
+            return
 
         # Test time logging
         print(f"\n⏱️  Probando logueo de tiempo...")
@@ -142,9 +325,9 @@ def test_create_daily():
             "Introduce las horas a loguear (o presiona Enter para 1.5): "
         ).strip()
         try:
-            hours = float(hours) if hours else 1.5
+            hours = float(hours) if hours else DEFAULT_HOURS
         except ValueError:
-            hours = 1.5
+            hours = DEFAULT_HOURS
 
         # Show available activities and let user choose
         if activities:
@@ -178,17 +361,7 @@ def test_create_daily():
                 issue_id=task_data["id"], hours=hours
             )
 
-        if time_entry:
-            print("✅ Tiempo logueado exitosamente!")
-            print(f"   ID entrada tiempo: {time_entry['id']}")
-            print(f"   Horas: {time_entry['hours']}")
-            print(f"   Fecha: {time_entry['spent_on']}")
-            print(f"   Comentarios: {time_entry['comments']}")
-            print(
-                f"   Actividad: {time_entry.get('activity_name', 'N/A')} (ID: {time_entry['activity_id']})"
-            )
-        else:
-            print("❌ Error al loguear tiempo")
+        print_time_entry(time_entry)
 
         # Test status update
         print(f"\n🔄 Probando cambio de estado...")
@@ -218,34 +391,23 @@ def test_create_daily():
                         status_name = statuses[status_index]["name"]
                     else:
                         print("❌ Número de estado inválido, usando 'IN PROGRESS'")
-                        status_name = "IN PROGRESS"
+                        status_name = DEFAULT_STATUS_NAME
                 else:
                     # Use the provided text as status name
-                    status_name = status_choice if status_choice else "IN PROGRESS"
+                    status_name = (
+                        status_choice if status_choice else DEFAULT_STATUS_NAME
+                    )
 
                 updated_task = redmine_service.update_issue_status(
                     issue_id=task_data["id"], status_name=status_name
                 )
 
-                if updated_task:
-                    print("✅ Estado actualizado exitosamente!")
-                    print(
-                        f"   Estado anterior: {task_data.get('status_name', 'Unknown')}"
-                    )
-                    print(
-                        f"   Estado nuevo: {updated_task['status_name']} (ID: {updated_task['status_id']})"
-                    )
-                    print(f"   Fecha actualización: {updated_task['updated_on']}")
-                else:
-                    print("❌ Error al cambiar el estado")
+                print_status_update(task_data, updated_task)
 
             except Exception as e:
                 print(f"❌ Error al cambiar el estado: {e}")
 
         # Show final URL
-        from app.config import settings
-
-        task_url = f"{settings.redmine_url}/issues/{task_data['id']}"
         print(f"\n🔗 URL de la tarea: {task_url}")
 
     else:
@@ -253,8 +415,20 @@ def test_create_daily():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="fetch trackers, statuses, activities and projects again",
+    )
+    parser.add_argument(
+        "--non-interactive",
+        action="store_true",
+        help="read the token from REDMINE_TOKEN and use the defaults without prompting",
+    )
+    args = parser.parse_args()
     try:
-        test_create_daily()
+        test_create_daily(refresh=args.refresh, non_interactive=args.non_interactive)
     except KeyboardInterrupt:
         print("\n\n👋 Test cancelado por el usuario")
     except Exception as e:
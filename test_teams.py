@@ -6,7 +6,9 @@ Shows all team information including related data.
 
 import sys
 import os
+from contextlib import nullcontext
 from datetime import datetime
+from sqlalchemy import case, func, select
 
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -14,62 +16,114 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from app.database.database import DatabaseSession
 from app.database.models import Team, User
 
+# Rows loaded per batch while streaming the listing
+STREAM_BATCH_SIZE = 500
+
+# Statements built once and reused on every run, so SQLAlchemy's compiled
+# cache is hit instead of building the query again
+_SELECT_TEAM_STATISTICS = select(
+    func.count(Team.id),
+    func.coalesce(func.sum(case((Team.is_active == True, 1))), 0),
+    func.count(Team.redmine_project_code.distinct()),
+    func.count(Team.telegram_group_id.distinct()),
+)
+# Teams per project code, most used first; ties keep the order of the first team
+_SELECT_TEAMS_PER_PROJECT = (
+    select(Team.redmine_project_code, func.count(Team.id))
+    .group_by(Team.redmine_project_code)
+    .order_by(func.count(Team.id).desc(), func.min(Team.id))
+)
+_SELECT_CREATOR_IDS = select(Team.created_by_user_id).distinct()
+# Teams per creator, most active first; ties keep the order of the first team
+_SELECT_TEAMS_PER_CREATOR = (
+    select(Team.created_by_user_id, func.count(Team.id))
+    .group_by(Team.created_by_user_id)
+    .order_by(func.count(Team.id).desc(), func.min(Team.id))
+)
+
+
+# Display text for False and True, indexed by the value
+_BOOL = ("❌ No", "✅ Yes")
+
 
 def format_datetime(dt):
     """Format datetime for display."""
-    if dt:
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
-    return "N/A"
+    # SQLite hands back naive datetimes, so no offset is appended
+    return dt.isoformat(sep=" ", timespec="seconds") if dt else "N/A"
 
 
 def format_boolean(value):
     """Format boolean for display."""
-    return "✅ Yes" if value else "❌ No"
+    return _BOOL[bool(value)]
+
 
+def _session_scope(session=None):
+    """Reuse the caller's session, or open a new one."""
+    return nullcontext(session) if session is not None else DatabaseSession()
 
-def get_creator_info(session, creator_id):
+
+def get_creator_info(creator_labels, creator_id):
     """Get creator user information."""
-    try:
-        user = session.query(User).filter(User.telegram_id == creator_id).first()
-        if user:
-            return f"{user.username or 'Unknown'} (ID: {creator_id})"
-        else:
-            return f"User not found (ID: {creator_id})"
-    except Exception as e:
-        return f"Error getting user info: {e}"
+    return creator_labels.get(creator_id) or f"User not found (ID: {creator_id})"
+
+
+def get_creator_labels(session, creator_ids):
+    """Get the display label of every creator with IN queries, keyed by ID."""
+    creator_ids = list(set(creator_ids))
+    labels = {}
+    # Stay below SQLite's limit of 999 bound parameters per statement
+    for start in range(0, len(creator_ids), 900):
+        chunk = creator_ids[start : start + 900]
+        rows = session.execute(
+            select(User.telegram_id, User.username).where(User.telegram_id.in_(chunk))
+        )
+        for telegram_id, username in rows:
+            labels[telegram_id] = f"{username or 'Unknown'} (ID: {telegram_id})"
+    return labels
 
 
-def view_all_teams():
+def view_all_teams(session=None):
     """View all teams registered in the database."""
     print("=" * 80)
     print("🔍 VIEWING ALL REGISTERED TEAMS")
     print("=" * 80)
 
     try:
-        with DatabaseSession() as session:
-            teams = session.query(Team).all()
+        with _session_scope(session) as session:
+            # Count first so the header prints before the rows are streamed
+            total_teams = session.scalar(select(func.count(Team.id)))
 
-            if not teams:
+            if not total_teams:
                 print("❌ No teams found in the database.")
                 return
 
-            print(f"📊 Total teams found: {len(teams)}")
+            print(f"📊 Total teams found: {total_teams}")
             print("-" * 80)
 
+            # One lookup per distinct creator instead of one per team
+            creator_labels = get_creator_labels(
+                session, session.scalars(_SELECT_CREATOR_IDS)
+            )
+
+            teams = session.scalars(
+                select(Team).execution_options(yield_per=STREAM_BATCH_SIZE)
+            )
+            # Each team's report is built as lines and written in one call
             for i, team in enumerate(teams, 1):
-                print(f"\n🏢 TEAM #{i}")
-                print(f"   Database ID: {team.id}")
-                print(f"   Team Name: {team.team_name}")
-                print(f"   Telegram Group ID: {team.telegram_group_id}")
-                print(f"   Redmine Project Code: {team.redmine_project_code}")
-                print(f"   Redmine Project ID: {team.redmine_project_id}")
-                print(
-                    f"   Created By: {get_creator_info(session, team.created_by_user_id)}"
-                )
-                print(f"   Is Active: {format_boolean(team.is_active)}")
-                print(f"   Created At: {format_datetime(team.created_at)}")
-                print(f"   Updated At: {format_datetime(team.updated_at)}")
-                print("-" * 50)
+                lines = [
+                    f"\n🏢 TEAM #{i}",
+                    f"   Database ID: {team.id}",
+                    f"   Team Name: {team.team_name}",
+                    f"   Telegram Group ID: {team.telegram_group_id}",
+                    f"   Redmine Project Code: {team.redmine_project_code}",
+                    f"   Redmine Project ID: {team.redmine_project_id}",
+                    f"   Created By: {get_creator_info(creator_labels, team.created_by_user_id)}",
+                    f"   Is Active: {format_boolean(team.is_active)}",
+                    f"   Created At: {format_datetime(team.created_at)}",
+                    f"   Updated At: {format_datetime(team.updated_at)}",
+                    "-" * 50,
+                ]
+                print("\n".join(lines))
 
     except Exception as e:
         print(f"❌ Error accessing database: {e}")
@@ -78,21 +132,17 @@ def view_all_teams():
     return True
 
 
-def show_team_statistics():
+def show_team_statistics(session=None):
     """Show basic statistics about teams."""
     print("\n📈 TEAM STATISTICS")
     print("=" * 40)
 
     try:
-        with DatabaseSession() as session:
-            total_teams = session.query(Team).count()
-            active_teams = session.query(Team).filter(Team.is_active == True).count()
-
-            # Get unique project codes and group IDs
-            unique_projects = (
-                session.query(Team.redmine_project_code).distinct().count()
-            )
-            unique_groups = session.query(Team.telegram_group_id).distinct().count()
+        with _session_scope(session) as session:
+            # Counts, unique project codes and group IDs in one query
+            total_teams, active_teams, unique_projects, unique_groups = session.execute(
+                _SELECT_TEAM_STATISTICS
+            ).one()
 
             print(f"📊 Total Teams: {total_teams}")
             print(f"✅ Active Teams: {active_teams}")
@@ -104,42 +154,28 @@ def show_team_statistics():
 
             # Show most popular project codes
             print(f"\n📋 PROJECT DISTRIBUTION:")
-            project_counts = {}
-            teams = session.query(Team).all()
-            for team in teams:
-                project_counts[team.redmine_project_code] = (
-                    project_counts.get(team.redmine_project_code, 0) + 1
-                )
-
-            for project, count in sorted(
-                project_counts.items(), key=lambda x: x[1], reverse=True
-            ):
+            for project, count in session.execute(_SELECT_TEAMS_PER_PROJECT):
                 print(f"   {project}: {count} team(s)")
 
     except Exception as e:
         print(f"❌ Error calculating statistics: {e}")
 
 
-def show_team_creators():
+def show_team_creators(session=None):
     """Show who created the most teams."""
     print("\n👥 TEAM CREATORS")
     print("=" * 40)
 
     try:
-        with DatabaseSession() as session:
-            creator_counts = {}
-            teams = session.query(Team).all()
-
-            for team in teams:
-                creator_counts[team.created_by_user_id] = (
-                    creator_counts.get(team.created_by_user_id, 0) + 1
-                )
+        with _session_scope(session) as session:
+            creator_counts = session.execute(_SELECT_TEAMS_PER_CREATOR).all()
+            creator_labels = get_creator_labels(
+                session, [creator_id for creator_id, _ in creator_counts]
+            )
 
             print("📋 Teams created by user:")
-            for creator_id, count in sorted(
-                creator_counts.items(), key=lambda x: x[1], reverse=True
-            ):
-                creator_info = get_creator_info(session, creator_id)
+            for creator_id, count in creator_counts:
+                creator_info = get_creator_info(creator_labels, creator_id)
                 print(f"   {creator_info}: {count} team(s)")
 
     except Exception as e:
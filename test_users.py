@@ -4,9 +4,13 @@ Test script to view all registered users in the database.
 Shows all user information including decrypted tokens.
 """
 
+import argparse
 import sys
 import os
+from contextlib import nullcontext
 from datetime import datetime
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import load_only
 
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -14,47 +18,93 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from app.database.database import DatabaseSession
 from app.database.models import User
 
+# Rows loaded per batch while streaming the listing
+STREAM_BATCH_SIZE = 500
+
+# Statements built once and reused on every run, so SQLAlchemy's compiled
+# cache is hit instead of building the query again
+_SELECT_USER_STATISTICS = select(
+    func.count(User.id),
+    func.coalesce(func.sum(case((User.is_active == True, 1))), 0),
+    func.coalesce(func.sum(case((User.encrypted_redmine_token.isnot(None), 1))), 0),
+    func.coalesce(func.sum(case((User.username.isnot(None), 1))), 0),
+)
+# Only the columns the listing prints; the token fingerprint is left out
+_SELECT_USERS = select(User).options(
+    load_only(
+        User.id,
+        User.telegram_id,
+        User.username,
+        User.encrypted_redmine_token,
+        User.is_active,
+        User.created_at,
+        User.updated_at,
+    )
+)
+
+
+# Display text for False and True, indexed by the value
+_BOOL = ("❌ No", "✅ Yes")
+
 
 def format_datetime(dt):
     """Format datetime for display."""
-    if dt:
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
-    return "N/A"
+    # SQLite hands back naive datetimes, so no offset is appended
+    return dt.isoformat(sep=" ", timespec="seconds") if dt else "N/A"
 
 
 def format_boolean(value):
     """Format boolean for display."""
-    return "✅ Yes" if value else "❌ No"
+    return _BOOL[bool(value)]
+
+
+def _session_scope(session=None):
+    """Reuse the caller's session, or open a new one."""
+    return nullcontext(session) if session is not None else DatabaseSession()
 
 
-def view_all_users():
-    """View all users registered in the database."""
+def view_all_users(session=None, tokens_only=False):
+    """View all users registered in the database.
+
+    With tokens_only, users without a Redmine token are filtered out in SQL.
+    """
     print("=" * 80)
     print("🔍 VIEWING ALL REGISTERED USERS")
     print("=" * 80)
 
     try:
-        with DatabaseSession() as session:
-            users = session.query(User).all()
-
-            if not users:
+        with _session_scope(session) as session:
+            # Count first so the header prints before the rows are streamed
+            count_users = select(func.count(User.id))
+            select_users = _SELECT_USERS
+            if tokens_only:
+                count_users = count_users.where(User.has_redmine_token())
+                select_users = select_users.where(User.has_redmine_token())
+            total_users = session.scalar(count_users)
+
+            if not total_users:
                 print("❌ No users found in the database.")
                 return
 
-            print(f"📊 Total users found: {len(users)}")
+            print(f"📊 Total users found: {total_users}")
             print("-" * 80)
 
+            users = session.scalars(
+                select_users.execution_options(yield_per=STREAM_BATCH_SIZE)
+            )
+            # Each user's report is built as lines and written in one call
             for i, user in enumerate(users, 1):
-                print(f"\n👤 USER #{i}")
-                print(f"   Database ID: {user.id}")
-                print(f"   Telegram ID: {user.telegram_id}")
-                print(f"   Username: {user.username or 'Not set'}")
-                print(
-                    f"   Has Redmine Token: {format_boolean(user.has_redmine_token())}"
-                )
+                has_token = user.has_redmine_token()
+                lines = [
+                    f"\n👤 USER #{i}",
+                    f"   Database ID: {user.id}",
+                    f"   Telegram ID: {user.telegram_id}",
+                    f"   Username: {user.username or 'Not set'}",
+                    f"   Has Redmine Token: {format_boolean(has_token)}",
+                ]
 
                 # Show token if available (be careful with this in production!)
-                if user.has_redmine_token():
+                if has_token:
                     try:
                         token = user.get_redmine_token()
                         if token:
@@ -64,16 +114,17 @@ def view_all_users():
                                 if len(token) > 8
                                 else "****"
                             )
-                            print(f"   Redmine Token: {masked_token}")
+                            lines.append(f"   Redmine Token: {masked_token}")
                         else:
-                            print(f"   Redmine Token: ❌ Error decrypting")
+                            lines.append("   Redmine Token: ❌ Error decrypting")
                     except Exception as e:
-                        print(f"   Redmine Token: ❌ Error: {e}")
+                        lines.append(f"   Redmine Token: ❌ Error: {e}")
 
-                print(f"   Is Active: {format_boolean(user.is_active)}")
-                print(f"   Created At: {format_datetime(user.created_at)}")
-                print(f"   Updated At: {format_datetime(user.updated_at)}")
-                print("-" * 50)
+                lines.append(f"   Is Active: {format_boolean(user.is_active)}")
+                lines.append(f"   Created At: {format_datetime(user.created_at)}")
+                lines.append(f"   Updated At: {format_datetime(user.updated_at)}")
+                lines.append("-" * 50)
+                print("\n".join(lines))
 
     except Exception as e:
         print(f"❌ Error accessing database: {e}")
@@ -82,22 +133,16 @@ def view_all_users():
     return True
 
 
-def show_user_statistics():
+def show_user_statistics(session=None):
     """Show basic statistics about users."""
     print("\n📈 USER STATISTICS")
     print("=" * 40)
 
     try:
-        with DatabaseSession() as session:
-            total_users = session.query(User).count()
-            active_users = session.query(User).filter(User.is_active == True).count()
-            users_with_tokens = (
-                session.query(User)
-                .filter(User.encrypted_redmine_token.isnot(None))
-                .count()
-            )
-            users_with_usernames = (
-                session.query(User).filter(User.username.isnot(None)).count()
+        with _session_scope(session) as session:
+            # All four counts in one pass over the table
+            total_users, active_users, users_with_tokens, users_with_usernames = (
+                session.execute(_SELECT_USER_STATISTICS).one()
             )
 
             print(f"📊 Total Users: {total_users}")
@@ -116,13 +161,13 @@ def show_user_statistics():
         print(f"❌ Error calculating statistics: {e}")
 
 
-def main():
+def main(tokens_only=False):
     """Main function."""
     print("🤖 MINE-BOT DATABASE VIEWER - USERS")
     print(f"📅 Run Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
     # View all users
-    if view_all_users():
+    if view_all_users(tokens_only=tokens_only):
         # Show statistics
         show_user_statistics()
 
@@ -131,4 +176,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--with-tokens",
+        action="store_true",
+        help="only list users that have a Redmine token",
+    )
+    main(tokens_only=parser.parse_args().with_tokens)